@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Effect of field selection (redmine_request's fields/exclude) on serialisation time and output size.
+
+For each payload, times project() followed by the serializer against serializing the full body, for a typical
+triage selection and for dropping the bulky free-text fields. Size is reported in bytes and as a rough token
+estimate of bytes / 4.
+
+Usage:
+    uv run python benchmarks/bench_projection.py --repeat 20
+"""
+import argparse
+import pathlib
+import sys
+import timeit
+
+# Import the package from this checkout even when it is not installed.
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+
+from payloads import payloads
+from mcp_redmine import formats
+from mcp_redmine.projection import project
+
+SELECTIONS = {
+    "full body": {},
+    "fields: triage": {"fields": ["id", "subject", "status.name", "assigned_to.name", "updated_on"]},
+    "exclude: text": {"exclude": ["description", "journals.details"]},
+}
+
+SERIALIZERS = {
+    "yaml": formats.dump_yaml,
+    "lean": formats.dump_lean,
+}
+
+
+def run(result, selection, serializer):
+    return serializer({**result, "body": project(result["body"], **selection)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark field selection before serialisation")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per selection, serializer and payload")
+    args = parser.parse_args()
+
+    print(f"{'payload':<30} {'selection':<16} {'format':<6} {'ms/call':>9} {'bytes':>9} {'~tokens':>8}")
+    for name, payload in payloads().items():
+        for selection_name, selection in SELECTIONS.items():
+            for serializer_name, serializer in SERIALIZERS.items():
+                seconds = min(timeit.repeat(lambda: run(payload, selection, serializer),
+                                            number=args.repeat, repeat=3)) / args.repeat
+                size = len(run(payload, selection, serializer).encode('utf-8'))
+                print(f"{name:<30} {selection_name:<16} {serializer_name:<6} {seconds * 1000:>9.2f} "
+                      f"{size:>9} {size // 4:>8}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
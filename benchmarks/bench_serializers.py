@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Cost and size of the tool output serializers on representative Redmine payloads.
+
+Compares the pure-Python YAML dumper yd() used to use, the libyaml dumper it uses now, compact JSON (stdlib
+and orjson when installed) and the lean format. Size is reported in bytes and as a rough token estimate of
+bytes / 4.
+
+Usage:
+    uv run python benchmarks/bench_serializers.py --repeat 20
+"""
+import argparse
+import json
+import pathlib
+import sys
+import timeit
+
+import yaml
+
+# Import the package from this checkout even when it is not installed.
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+
+from payloads import payloads
+from mcp_redmine import formats
+
+
+def pure_yaml(obj):
+    return yaml.safe_dump(obj, allow_unicode=True, sort_keys=False, width=4096)
+
+
+def stdlib_json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+SERIALIZERS = {
+    "yaml (pure python)": pure_yaml,
+    "yaml (libyaml)": formats.dump_yaml,
+    "json (stdlib)": stdlib_json,
+    "lean": formats.dump_lean,
+}
+if formats.orjson is not None:
+    SERIALIZERS["json (orjson)"] = formats.dump_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tool output serializers")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per serializer and payload")
+    args = parser.parse_args()
+
+    print(f"{'payload':<30} {'serializer':<20} {'ms/call':>9} {'bytes':>9} {'~tokens':>8}")
+    for name, payload in payloads().items():
+        for serializer_name, serializer in SERIALIZERS.items():
+            seconds = min(timeit.repeat(lambda: serializer(payload), number=args.repeat, repeat=3)) / args.repeat
+            size = len(serializer(payload).encode('utf-8'))
+            print(f"{name:<30} {serializer_name:<20} {seconds * 1000:>9.2f} {size:>9} {size // 4:>8}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Throughput of redmine_request with N concurrent SSE clients on one server process.
+
+Starts the fake Redmine from fake_redmine.py with a fixed upstream delay, starts the MCP server in SSE mode
+(PORT set) pointed at it, then opens N SSE sessions that each issue a number of redmine_request calls at the
+same time. With blocking tools the calls serialize on the event loop and throughput stays at roughly
+1 / delay; with async tools it scales with N. The response cache is switched off and every call carries a
+distinct parameter, which Redmine ignores, so that each one reaches Redmine instead of being answered from the
+cache or joining an identical request in flight.
+
+Usage:
+    uv run python benchmarks/bench_sse_concurrency.py --clients 1 4 16 32 --calls 5 --delay 0.1 --path /projects.json
+"""
+import argparse
+import asyncio
+import os
+import pathlib
+import socket
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
+
+async def run_client(url, client, calls, path):
+    async with sse_client(url) as streams:
+        async with ClientSession(*streams) as session:
+            await session.initialize()
+            for call in range(calls):
+                result = await session.call_tool("redmine_request",
+                                                 {"path": path, "params": {"limit": 25, "bench": f"{client}-{call}"}})
+                assert not result.isError, result
+
+
+async def measure(url, clients, calls, path):
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(url, client, calls, path) for client in range(clients)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SSE clients")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--calls", type=int, default=5, help="redmine_request calls per client")
+    parser.add_argument("--delay", type=float, default=0.1, help="Upstream Redmine latency in seconds")
+    parser.add_argument("--path", default="/projects.json", help="Redmine path passed to redmine_request")
+    args = parser.parse_args()
+
+    redmine_port, mcp_port = free_port(), free_port()
+    env = dict(os.environ, REDMINE_URL=f"http://127.0.0.1:{redmine_port}/", REDMINE_API_KEY="bench",
+               PORT=str(mcp_port), REDMINE_CACHE="0")
+    procs = [
+        subprocess.Popen([sys.executable, str(ROOT / "benchmarks" / "fake_redmine.py"), "--port",
+                          str(redmine_port), "--delay", str(args.delay)]),
+        subprocess.Popen([sys.executable, "-m", "mcp_redmine.server"], cwd=ROOT, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+    ]
+    try:
+        wait_for_port(redmine_port)
+        wait_for_port(mcp_port)
+        url = f"http://127.0.0.1:{mcp_port}/sse"
+
+        print(f"path: {args.path}, upstream delay: {args.delay * 1000:.0f} ms, calls per client: {args.calls}")
+        print(f"{'clients':>8} {'calls':>6} {'seconds':>8} {'calls/s':>8}")
+        for clients in args.clients:
+            elapsed = asyncio.run(measure(url, clients, args.calls, args.path))
+            total = clients * args.calls
+            print(f"{clients:>8} {total:>6} {elapsed:>8.2f} {total / elapsed:>8.1f}")
+    finally:
+        for proc in procs:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                # uvicorn waits for open SSE streams during graceful shutdown
+                proc.kill()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Startup cost of the server in stdio mode.
+
+Reports a `python -X importtime` breakdown of `import mcp_redmine.server` and the wall time from process start
+to the first `initialize` response over stdio, which is what Claude Desktop waits for on every launch.
+
+Exits non-zero when a module that only SSE mode needs is imported in stdio mode, or when the median time to
+the initialize response exceeds --max-initialize-ms, so it can be used as a regression check.
+
+Usage:
+    uv run python benchmarks/bench_startup.py --runs 5 --top 15 --max-initialize-ms 2000
+"""
+import argparse
+import json
+import os
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).parent.parent
+ENV = dict(os.environ, REDMINE_URL=os.environ.get("REDMINE_URL", "http://127.0.0.1:3999/"),
+           REDMINE_API_KEY=os.environ.get("REDMINE_API_KEY", "bench"))
+ENV.pop("PORT", None)
+
+# Modules only the SSE transport needs; stdio mode must not import them.
+SSE_ONLY_MODULES = ["mcp_redmine.sse", "http.server"]
+
+INITIALIZE = {"jsonrpc": "2.0", "id": 1, "method": "initialize",
+              "params": {"protocolVersion": "2024-11-05", "capabilities": {},
+                         "clientInfo": {"name": "bench_startup", "version": "0"}}}
+
+
+def importtime():
+    """Return [(self_us, cumulative_us, depth, module)] for `import mcp_redmine.server`."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import mcp_redmine.server"], cwd=ROOT,
+                            env=ENV, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            rows.append((int(match[1]), int(match[2]), len(match[3]) // 2, match[4]))
+    return rows
+
+
+def time_to_initialize():
+    """Seconds from spawning the stdio server until its initialize response arrives."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "mcp_redmine.server"], cwd=ROOT, env=ENV,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        proc.stdin.write(json.dumps(INITIALIZE) + "\n")
+        proc.stdin.flush()
+        response = json.loads(proc.stdout.readline())
+        elapsed = time.perf_counter() - start
+        assert response.get("id") == 1 and "result" in response, response
+        return elapsed
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stdio startup")
+    parser.add_argument("--runs", type=int, default=5, help="Server launches to time")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--max-initialize-ms", type=float, default=None,
+                        help="Fail when the median time to the initialize response is above this")
+    args = parser.parse_args()
+
+    rows = importtime()
+    total = next(cum for _, cum, depth, name in rows if name == "mcp_redmine.server")
+    print(f"import mcp_redmine.server: {total / 1000:.1f} ms cumulative")
+    print(f"{'self ms':>9} {'cum ms':>9}  module")
+    for self_us, cum_us, depth, name in sorted(rows, key=lambda row: row[0], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>9.1f} {cum_us / 1000:>9.1f}  {name}")
+
+    failed = False
+    imported = {name for _, _, _, name in rows}
+    leaked = [name for name in SSE_ONLY_MODULES if name in imported]
+    if leaked:
+        print(f"FAIL: stdio mode imports SSE-only modules: {', '.join(leaked)}")
+        failed = True
+
+    timings = [time_to_initialize() for _ in range(args.runs)]
+    median = statistics.median(timings) * 1000
+    print(f"time to initialize response over stdio: median {median:.0f} ms, "
+          f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms ({args.runs} runs)")
+    if args.max_initialize_ms is not None and median > args.max_initialize_ms:
+        print(f"FAIL: median {median:.0f} ms is above --max-initialize-ms {args.max_initialize_ms:.0f}")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Minimal fake Redmine API used by the benchmarks.
+
+Serves generated /issues.json, /projects.json, /users.json and /issues/{id}.json payloads after a configurable
+delay, so the MCP server can be measured without a real Redmine instance.
+
+Usage:
+    python benchmarks/fake_redmine.py --port 3999 --delay 0.1 --issues 2500
+"""
+import argparse
+import asyncio
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et "
+         "dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris. ")
+
+
+def make_issue(issue_id, journals=0):
+    """Return an issue shaped like Redmine's /issues.json entries."""
+    issue = {
+        "id": issue_id,
+        "project": {"id": 1 + issue_id % 5, "name": f"Project {1 + issue_id % 5}"},
+        "tracker": {"id": 1 + issue_id % 3, "name": ["Bug", "Feature", "Support"][issue_id % 3]},
+        "status": {"id": 1 + issue_id % 4, "name": ["New", "In Progress", "Resolved", "Closed"][issue_id % 4],
+                   "is_closed": issue_id % 4 == 3},
+        "priority": {"id": 2, "name": "Normal"},
+        "author": {"id": 1 + issue_id % 7, "name": f"User {1 + issue_id % 7}"},
+        "assigned_to": {"id": 1 + issue_id % 11, "name": f"User {1 + issue_id % 11}"},
+        "fixed_version": {"id": 1 + issue_id % 2, "name": f"v{1 + issue_id % 2}.0"},
+        "subject": f"Issue {issue_id}: crash when exporting report number {issue_id % 97}",
+        "description": LOREM * (1 + issue_id % 4),
+        "start_date": "2025-01-01",
+        "due_date": None,
+        "done_ratio": (issue_id * 10) % 100,
+        "is_private": False,
+        "estimated_hours": float(issue_id % 9),
+        "spent_hours": float(issue_id % 5),
+        "custom_fields": [{"id": 1, "name": "Customer", "value": f"ACME {issue_id % 13}"},
+                          {"id": 2, "name": "Severity", "value": "High" if issue_id % 2 else "Low"}],
+        "created_on": "2025-01-01T10:00:00Z",
+        "updated_on": f"2025-06-{1 + issue_id % 28:02d}T12:00:00Z",
+        "closed_on": None,
+    }
+    if journals:
+        issue["journals"] = [
+            {"id": issue_id * 100 + n, "user": {"id": 1 + n % 7, "name": f"User {1 + n % 7}"},
+             "notes": LOREM * 2, "created_on": "2025-02-01T09:00:00Z", "private_notes": False,
+             "details": [{"property": "attr", "name": "status_id", "old_value": "1", "new_value": "2"}]}
+            for n in range(journals)
+        ]
+    return issue
+
+
+def make_app(delay=0.0, total_issues=2500, journals=0):
+    async def pause():
+        if delay:
+            await asyncio.sleep(delay)
+
+    def page(request, total):
+        offset = int(request.query_params.get("offset", 0))
+        limit = min(int(request.query_params.get("limit", 25)), 100)
+        return offset, limit, range(offset + 1, min(offset + limit, total) + 1)
+
+    async def issues(request):
+        await pause()
+        offset, limit, ids = page(request, total_issues)
+        return JSONResponse({"issues": [make_issue(i, journals) for i in ids], "total_count": total_issues,
+                             "offset": offset, "limit": limit})
+
+    async def issue(request):
+        await pause()
+        issue_id = int(request.path_params["issue_id"])
+        return JSONResponse({"issue": make_issue(issue_id, journals or 3)})
+
+    async def projects(request):
+        await pause()
+        offset, limit, ids = page(request, 5)
+        return JSONResponse({"projects": [{"id": i, "name": f"Project {i}", "identifier": f"project-{i}"}
+                                          for i in ids], "total_count": 5, "offset": offset, "limit": limit})
+
+    async def users(request):
+        await pause()
+        offset, limit, ids = page(request, 11)
+        return JSONResponse({"users": [{"id": i, "login": f"user{i}", "firstname": "User", "lastname": str(i)}
+                                       for i in ids], "total_count": 11, "offset": offset, "limit": limit})
+
+    return Starlette(routes=[
+        Route("/issues.json", issues),
+        Route("/issues/{issue_id:int}.json", issue),
+        Route("/projects.json", projects),
+        Route("/users.json", users),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=3999)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before every response")
+    parser.add_argument("--issues", type=int, default=2500, help="Total number of issues to serve")
+    parser.add_argument("--journals", type=int, default=0, help="Journals to include per listed issue")
+    args = parser.parse_args()
+    uvicorn.run(make_app(args.delay, args.issues, args.journals), host="127.0.0.1", port=args.port,
+                log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
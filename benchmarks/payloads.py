@@ -0,0 +1,25 @@
+"""
+Representative Redmine payloads shared by the micro-benchmarks, built from fake_redmine's generators.
+"""
+from fake_redmine import make_issue
+
+
+def tool_result(body):
+    """Wrap a body the way request() does."""
+    return {"status_code": 200, "body": body, "error": ""}
+
+
+def payloads():
+    """Return {name: tool result} for the shapes agents read most."""
+    return {
+        "projects (5)": tool_result({"projects": [{"id": i, "name": f"Project {i}", "identifier": f"project-{i}",
+                                                   "description": "", "status": 1, "is_public": True}
+                                                  for i in range(1, 6)], "total_count": 5, "offset": 0, "limit": 25}),
+        "issue with journals": tool_result({"issue": make_issue(42, journals=20)}),
+        "issues page (25)": tool_result({"issues": [make_issue(i) for i in range(1, 26)], "total_count": 2500,
+                                         "offset": 0, "limit": 25}),
+        "issues page (100)": tool_result({"issues": [make_issue(i) for i in range(1, 101)], "total_count": 2500,
+                                          "offset": 0, "limit": 100}),
+        "issues page (100) + journals": tool_result({"issues": [make_issue(i, journals=5) for i in range(1, 101)],
+                                                     "total_count": 2500, "offset": 0, "limit": 100}),
+    }
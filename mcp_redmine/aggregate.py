@@ -0,0 +1,99 @@
+AGGREGATE_FUNCTIONS = ("count", "sum", "avg", "min", "max")
+
+
+def field_value(item: dict, field: str):
+    """Value of a field of an API object for grouping or aggregation.
+
+    References such as status or assigned_to resolve to their name, dotted paths (assigned_to.id) reach into
+    nested objects and cf_<id> reads a custom field. Missing values are None.
+    """
+    if field.startswith("cf_") and field[3:].isdigit():
+        for custom_field in item.get("custom_fields", ()):
+            if custom_field.get("id") == int(field[3:]):
+                value = custom_field.get("value")
+                return ", ".join(map(str, value)) if isinstance(value, list) else (value if value != "" else None)
+        return None
+    value = item
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    if isinstance(value, dict):
+        return value.get("name", value.get("id"))
+    return value
+
+def parse_aggregate(spec: str) -> tuple:
+    """'count' -> ('count', None), 'sum:estimated_hours' -> ('sum', 'estimated_hours')."""
+    function, _, field = spec.partition(":")
+    function = function.strip().lower()
+    if function not in AGGREGATE_FUNCTIONS:
+        raise ValueError(f"Unknown aggregate function '{function}', use one of {', '.join(AGGREGATE_FUNCTIONS)}")
+    if function != "count" and not field:
+        raise ValueError(f"Aggregate '{spec}' needs a field, e.g. '{function}:estimated_hours'")
+    return function, field.strip() or None
+
+
+class Aggregator:
+    """Grouped count/sum/avg/min/max over a stream of items, in memory proportional to the number of groups."""
+
+    def __init__(self, group_by: list, aggregates: list):
+        self.group_by = list(group_by)
+        self.specs = list(dict.fromkeys(aggregates))
+        self.aggregates = [parse_aggregate(spec) for spec in self.specs]
+        self.groups = {}
+        self.items = 0
+
+    def add(self, items: list):
+        for item in items:
+            key = tuple(field_value(item, field) for field in self.group_by)
+            state = self.groups.get(key)
+            if state is None:
+                state = self.groups[key] = [[0, None] for _ in self.aggregates]  # [values seen, accumulator]
+            for (function, field), slot in zip(self.aggregates, state):
+                if function == "count":
+                    slot[0] += 1
+                    continue
+                value = field_value(item, field)
+                if value is None or value == "":
+                    continue
+                if function in ("sum", "avg"):
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        continue
+                    slot[1] = value if slot[1] is None else slot[1] + value
+                elif function == "min":
+                    slot[1] = value if slot[1] is None or value < slot[1] else slot[1]
+                else:
+                    slot[1] = value if slot[1] is None or value > slot[1] else slot[1]
+                slot[0] += 1
+            self.items += 1
+
+    def rows(self) -> list:
+        """One dict per group, largest first when the first aggregate is a count, sum or average, otherwise
+        ordered by the group values."""
+        rows = []
+        for key, state in self.groups.items():
+            row = dict(zip(self.group_by, key))
+            for spec, (function, _), (seen, accumulator) in zip(self.specs, self.aggregates, state):
+                if function == "count":
+                    row[spec] = seen
+                elif function == "avg":
+                    row[spec] = round(accumulator / seen, 4) if seen else None
+                elif function == "sum":
+                    row[spec] = round(accumulator, 4) if accumulator is not None else 0
+                else:
+                    row[spec] = accumulator
+            rows.append(row)
+        if self.aggregates and self.aggregates[0][0] in ("count", "sum", "avg"):
+            first = self.specs[0]
+            rows.sort(key=lambda row: row[first] or 0, reverse=True)
+        else:
+            rows.sort(key=lambda row: [_sort_key(row[field]) for field in self.group_by])
+        return rows
+
+
+def _sort_key(value):
+    if value is None:
+        return (2, "")
+    return (0, value) if isinstance(value, (int, float)) else (1, str(value))
@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+from mcp_redmine.retry import IDEMPOTENT_METHODS
+
+BATCH_METHODS = ("get", "post", "put", "patch", "delete")
+
+
+def normalize_operations(operations: list) -> list:
+    """Check the shape of batch operations and fill in defaults. Raises ValueError on the first problem.
+
+    Each operation is a dict with path and method, optional data, params, an id (defaults to its position),
+    depends_on (ids that must succeed first) and retries (None for the server's default). Retries are refused
+    for POST and PATCH, as a request that timed out or got a 5xx may have been applied already.
+    """
+    normalized, seen = [], set()
+    for position, operation in enumerate(operations):
+        if not isinstance(operation, dict) or not operation.get("path"):
+            raise ValueError(f"Operation {position} must be an object with at least a path")
+        method = str(operation.get("method", "get")).lower()
+        if method not in BATCH_METHODS:
+            raise ValueError(f"Operation {position} has unsupported method '{method}'")
+        op_id = str(operation.get("id", position))
+        if op_id in seen:
+            raise ValueError(f"Operation id '{op_id}' is used more than once")
+        seen.add(op_id)
+        depends_on = operation.get("depends_on")
+        if depends_on is None:
+            depends_on = []
+        retries = operation.get("retries")
+        if retries is not None:
+            retries = max(0, int(retries))
+            if retries and method not in IDEMPOTENT_METHODS:
+                raise ValueError(f"Operation '{op_id}' can't be retried: a {method.upper()} that failed may have "
+                                 f"been applied, so sending it again could apply it twice")
+        normalized.append({
+            "id": op_id,
+            "method": method,
+            "path": operation["path"],
+            "data": operation.get("data"),
+            "params": operation.get("params"),
+            "depends_on": [str(dep) for dep in (depends_on if isinstance(depends_on, list) else [depends_on])],
+            "retries": retries,
+        })
+    check_order(normalized)
+    return normalized
+
+def check_order(operations: list):
+    """Raise ValueError for dependencies on unknown operations or dependency cycles."""
+    graph = {operation["id"]: operation["depends_on"] for operation in operations}
+    for op_id, deps in graph.items():
+        unknown = [dep for dep in deps if dep not in graph]
+        if unknown:
+            raise ValueError(f"Operation '{op_id}' depends on unknown operation(s): {', '.join(unknown)}")
+
+    done, visiting = set(), []
+
+    def visit(op_id):
+        if op_id in done:
+            return
+        if op_id in visiting:
+            cycle = visiting[visiting.index(op_id):] + [op_id]
+            raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+        visiting.append(op_id)
+        for dep in graph[op_id]:
+            visit(dep)
+        visiting.pop()
+        done.add(op_id)
+
+    for op_id in graph:
+        visit(op_id)
+
+async def run_batch(operations: list, send, concurrency: int, on_done=None) -> list:
+    """Run normalized operations through send(operation) -> result dict, at most concurrency at a time.
+
+    An operation starts once everything it depends on has succeeded, and is skipped if any of them failed.
+    Retrying is left to send(), which reports the retries it made in the result's meta.retries. on_done, if
+    given, is awaited with the number of finished operations after each one. Returns one row per operation,
+    in the order given.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    finished = {operation["id"]: asyncio.Event() for operation in operations}
+    rows = {}
+
+    async def run(operation):
+        for dep in operation["depends_on"]:
+            await finished[dep].wait()
+        row = {"id": operation["id"], "method": operation["method"], "path": operation["path"]}
+        failed = [dep for dep in operation["depends_on"] if rows[dep]["status"] != "ok"]
+        if failed:
+            row.update(status="skipped", status_code=None, attempts=0, seconds=0.0, body=None,
+                       error=f"Skipped because {', '.join(failed)} did not succeed")
+        else:
+            start = time.perf_counter()
+            async with semaphore:
+                result = await send(operation)
+            row.update(status="failed" if result["error"] else "ok", status_code=result["status_code"],
+                       attempts=1 + (result.get("meta") or {}).get("retries", 0),
+                       seconds=round(time.perf_counter() - start, 3),
+                       body=result["body"], error=result["error"])
+        rows[operation["id"]] = row
+        finished[operation["id"]].set()
+        if on_done is not None:
+            await on_done(len(rows))
+
+    await asyncio.gather(*(run(operation) for operation in operations))
+    return [rows[operation["id"]] for operation in operations]
@@ -0,0 +1,217 @@
+"""
+Output budget: keep tool results within a size the client's context can afford.
+
+A result over the budget is cut down instead of being returned whole. Long strings are shortened, nested lists
+collapsed with an "N more" marker and the result's main list, e.g. the issues of /issues.json or the journals of
+an issue, is cut to the items that fit. The full result is kept in a ResultStore and meta.budget carries a
+continuation handle from which redmine_continue serves the following items without asking Redmine again.
+"""
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+# Rough number of bytes of YAML or JSON per token, for budgets given in tokens.
+BYTES_PER_TOKEN = 4
+
+# How hard to shorten the items, from not at all to one line of text and a handful of list items:
+# (characters kept of a string, items kept of a nested list).
+LEVELS = ((None, None), (2000, 50), (500, 20), (200, 5))
+
+
+def parse_budget(value: str) -> int:
+    """Budget in bytes from '60000' (bytes), '15000t' or '15000 tokens'. Empty or 0 means no budget."""
+    match = re.fullmatch(r'\s*(\d+)\s*(t|tokens?)?\s*', value or '0', re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"REDMINE_OUTPUT_BUDGET must be a number of bytes or of tokens like '15000 tokens', "
+                         f"got: {value}")
+    return int(match.group(1)) * (BYTES_PER_TOKEN if match.group(2) else 1)
+
+def shorten(node, max_chars: int = None, max_items: int = None):
+    """Copy of node with strings cut to max_chars and lists to max_items, each marked with what was left out."""
+    if isinstance(node, str):
+        if max_chars is not None and len(node) > max_chars:
+            return f"{node[:max_chars]}… [{len(node) - max_chars} more characters]"
+        return node
+    if isinstance(node, list):
+        kept = [shorten(item, max_chars, max_items) for item in node[:max_items]]
+        if max_items is not None and len(node) > max_items:
+            kept.append(f"… {len(node) - max_items} more items")
+        return kept
+    if isinstance(node, dict):
+        return {key: shorten(value, max_chars, max_items) for key, value in node.items()}
+    return node
+
+def main_list(body) -> tuple:
+    """Keys leading to the longest list in the top two levels of body, () for a list body, or None."""
+    if isinstance(body, list):
+        return ()
+    best, longest = None, 1
+    for key, value in (body.items() if isinstance(body, dict) else ()):
+        children = value.items() if isinstance(value, dict) else ()
+        for path, candidate in [((key,), value), *(((key, child), item) for child, item in children)]:
+            if isinstance(candidate, list) and len(candidate) > longest:
+                best, longest = path, len(candidate)
+    return best
+
+def get_path(body, path: tuple):
+    for key in path:
+        body = body[key]
+    return body
+
+def with_path(body, path: tuple, value):
+    """Copy of body with the node at path replaced by value."""
+    if not path:
+        return value
+    return {**body, path[0]: with_path(body[path[0]], path[1:], value)}
+
+def slice_result(result: dict, path: tuple, offset: int, limit: int) -> dict:
+    """Copy of result with only items offset to offset + limit of the list at path in its body."""
+    body = result["body"]
+    return {**result, "body": with_path(body, path, get_path(body, path)[offset:offset + limit])}
+
+
+class ResultStore:
+    """Full results kept for continuation and cursors, least recently used first out, bounded in bytes and age."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # id -> (expires, size, value)
+        self.size = 0
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(("stores", "hits", "misses", "evictions", "expired"), 0)
+
+    def put(self, value, size: int) -> str:
+        """Keep value, which takes about size bytes, and return the id to get it back with, or None when it is
+        larger than the whole store."""
+        if size > self.max_bytes:
+            return None
+        entry_id = secrets.token_urlsafe(9)
+        with self.lock:
+            self.counters["stores"] += 1
+            self.entries[entry_id] = (time.monotonic() + self.ttl, size, value)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted, _) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.counters["evictions"] += 1
+        return entry_id
+
+    def get(self, entry_id: str):
+        """The value kept under entry_id, or None when it is unknown, expired or was evicted."""
+        with self.lock:
+            entry = self.entries.get(entry_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self.entries[entry_id]
+                self.size -= entry[1]
+                self.counters["expired"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self.entries.move_to_end(entry_id)
+            self.counters["hits"] += 1
+            return entry[2]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"entries": len(self.entries), "size": self.size, "max_bytes": self.max_bytes, "ttl": self.ttl,
+                    **self.counters}
+
+
+class OutputBudget:
+    """Cuts tool results ({status_code, body, error, meta}) serialised to more than limit bytes down to size."""
+
+    def __init__(self, limit: int, store: ResultStore):
+        self.limit = limit
+        self.store = store
+
+    def fits(self, text: str) -> bool:
+        return not self.limit or len(text.encode()) <= self.limit
+
+    def render(self, result: dict, dump, size: int = None, start: int = 0, entry_id: str = None) -> str:
+        """dump() of result made to fit the budget, starting at item start of its main list.
+
+        size is the length of the full serialised result, if known. entry_id names the result in the store when
+        it is kept there already, as for a continuation.
+
+        The number of items is chosen from their serialised sizes, each measured once in place in an otherwise
+        empty result, and the result is dumped in full only once that number is known. Measuring stops at the
+        first item that no longer fits, so the work done is bounded by the budget rather than the result's size.
+        """
+        body = result.get("body")
+        path = main_list(body)
+        if path is None:
+            return self._render_whole(result, body, dump)
+
+        items = get_path(body, path)[start:]
+        stored = entry_id is not None
+        # Until the result is stored, a placeholder as long as a real id stands in for it in what is measured.
+        entry_id = entry_id or "_" * 12
+        for level, (max_chars, max_items) in enumerate(LEVELS):
+            outer = shorten(with_path(body, path, []), max_chars, max_items)
+
+            def attempt(count, part):
+                meta = {"list": ".".join(map(str, path)), "offset": start, "returned": count,
+                        "remaining": len(items) - count}
+                if max_chars is not None:
+                    meta.update(text_limit=max_chars, list_limit=max_items)
+                if count < len(items) and entry_id is not None:
+                    meta["continuation"] = f"{entry_id}:{start + count}"
+                truncated = {**result, "body": with_path(outer, path, part),
+                             "meta": {**(result.get("meta") or {}), "budget": meta}}
+                return dump(truncated)
+
+            if level == 0 and start == 0 and size is not None and size > self.limit:
+                continue  # the whole result, untouched, is known not to fit
+            # Items are shortened as they are measured, so those past the budget are never touched.
+            fitting = self._items_that_fit(attempt, (shorten(item, max_chars, max_items) for item in items))
+            if level == 0:
+                # Untouched items are only worth keeping when all of them fit.
+                if len(fitting) == len(items):
+                    text = attempt(len(items), fitting)
+                    if self.fits(text):
+                        return text
+                continue
+            if not fitting and level < len(LEVELS) - 1:
+                continue
+            fitting = fitting or [shorten(items[0], max_chars, max_items)]
+            if len(fitting) < len(items) and not stored:
+                entry_id = self.store.put(result, size or len(dump(result)))
+            text = attempt(len(fitting), fitting)
+            # Sizes measured one item at a time are close, not exact; give up items until the whole fits.
+            while len(fitting) > 1 and not self.fits(text):
+                fitting.pop()
+                text = attempt(len(fitting), fitting)
+            return text
+
+    def _items_that_fit(self, attempt, items) -> list:
+        """The leading items that fit the budget, from the size each adds to a result that holds none of them."""
+        base = len(attempt(0, []).encode())
+        total, fitting = base, []
+        for item in items:
+            total += len(attempt(0, [item]).encode()) - base
+            if total > self.limit:
+                break
+            fitting.append(item)
+        return fitting
+
+    def _render_whole(self, result: dict, body, dump) -> str:
+        for max_chars, max_items in LEVELS[1:]:
+            meta = {"text_limit": max_chars, "list_limit": max_items}
+            text = dump({**result, "body": shorten(body, max_chars, max_items),
+                         "meta": {**(result.get("meta") or {}), "budget": meta}})
+            if self.fits(text):
+                return text
+        return text
+
+    def resume(self, handle: str, dump) -> str:
+        """The items following a continuation handle, again within the budget. None when the handle is unknown
+        or its result is no longer kept."""
+        entry_id, _, offset = handle.rpartition(":")
+        result = self.store.get(entry_id) if offset.isdigit() else None
+        if result is None:
+            return None
+        return self.render(result, dump, start=int(offset), entry_id=entry_id)
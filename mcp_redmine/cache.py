@@ -0,0 +1,208 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Reference data that rarely changes and that agents re-read in every conversation.
+DEFAULT_CACHE_TTLS = (
+    "/trackers.json=3600,"
+    "/issue_statuses.json=3600,"
+    "/enumerations/{enumeration}.json=3600,"
+    "/custom_fields.json=3600,"
+    "/roles.json=3600,"
+    "/my/account.json=300,"
+    "/users/current.json=300,"
+    "/projects.json=300,"
+    "/projects/{projectId}.json=300"
+)
+
+
+def parse_ttls(spec: str) -> list:
+    """Parse '/path/{param}.json=seconds,...' into [(template, seconds)]."""
+    ttls = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        template, sep, seconds = item.rpartition('=')
+        if not sep or not template:
+            raise ValueError(f"Cache TTL entries must look like '/path.json=seconds', got: {item}")
+        ttls.append(('/' + template.strip().lstrip('/'), float(seconds)))
+    return ttls
+
+def compile_template(template: str):
+    """Regex matching concrete paths of an OpenAPI-style path template."""
+    parts = re.split(r'(\{[^}/]+\})', template)
+    return re.compile(''.join('[^/]+' if part.startswith('{') else re.escape(part) for part in parts) + '$')
+
+def resource_families(path: str) -> frozenset:
+    """Resource names in a path, e.g. '/projects/foo/issues.json' -> {'projects', 'issues'}.
+
+    Redmine paths alternate resource names and identifiers, so the names are the even segments.
+    """
+    segments = [segment for segment in path.split('?', 1)[0].strip('/').split('/') if segment]
+    return frozenset(segment.split('.', 1)[0] for segment in segments[::2])
+
+
+class CacheEntry:
+    __slots__ = ("status_code", "content", "etag", "last_modified", "stored", "expires", "families", "size")
+
+    def __init__(self, status_code, content, etag, last_modified, ttl, families):
+        self.status_code = status_code
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored = time.monotonic()
+        self.expires = self.stored + ttl
+        self.families = families
+        self.size = len(content) + 256  # rough per-entry overhead
+
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """In-process cache for GET responses with per path template TTLs.
+
+    Entries are keyed on path, query parameters and API key, evicted least recently used first once their total
+    size passes max_bytes, revalidated with If-None-Match/If-Modified-Since when expired, and dropped when a
+    write goes to the same resource family. Paths without a configured TTL are never cached.
+
+    match(path), e.g. spec.Router.match, maps a concrete path to (path template, params) or None. With it, TTLs
+    are looked up by the path's template in the spec in a dict; configured templates name their parameters as
+    they like and are matched to the spec's on first use. Only configured templates the spec does not describe
+    are matched with a regex.
+    """
+
+    def __init__(self, ttls: list, max_bytes: int, enabled: bool = True, match=None):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.match = match
+        self._lookup = None  # (ttl by concrete path, ttl by spec template, [(regex, ttl)]), built on first use
+        self.entries = OrderedDict()
+        self.size = 0
+        self.generation = 0  # bumped by every invalidation
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(("hits", "misses", "revalidated", "stores", "evictions", "invalidations"), 0)
+
+    def ttl_for(self, path: str) -> float:
+        path = '/' + path.lstrip('/')
+        exact, by_template, patterns = self._lookup or self._build_lookup()
+        seconds = exact.get(path)
+        if seconds is not None:
+            return seconds
+        found = self.match(path) if by_template else None
+        if found is not None and found[0] in by_template:
+            return by_template[found[0]]
+        for pattern, seconds in patterns:
+            if pattern.match(path):
+                return seconds
+        return 0
+
+    def _build_lookup(self) -> tuple:
+        exact, by_template, patterns = {}, {}, []
+        for template, seconds in self.ttls:
+            placeholders = re.findall(r'\{[^}/]+\}', template)
+            found = self.match(template) if self.match is not None and placeholders else None
+            if not placeholders:
+                exact.setdefault(template, seconds)
+            elif (found is not None and len(found[1]) == len(placeholders)
+                  and all(value in placeholders for value in found[1].values())):
+                # Every placeholder of the configured template landed on a parameter of the spec's.
+                by_template.setdefault(found[0], seconds)
+            else:
+                patterns.append((compile_template(template), seconds))
+        self._lookup = exact, by_template, patterns
+        return self._lookup
+
+    @staticmethod
+    def key(path: str, params: dict, api_key: str) -> tuple:
+        return ('/' + path.lstrip('/'), json.dumps(params or {}, sort_keys=True, default=str),
+                hashlib.sha256(api_key.encode()).hexdigest()[:16])
+
+    def lookup(self, key: tuple):
+        """Return the entry for key, fresh or not, marking it most recently used."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def count(self, counter: str):
+        with self.lock:
+            self.counters[counter] += 1
+
+    def store(self, key: tuple, status_code: int, content: bytes, headers, ttl: float,
+              generation: int = None) -> CacheEntry:
+        """Cache a response. Pass the generation read before the request was sent so that a response which may
+        predate a concurrent write is not stored."""
+        entry = CacheEntry(status_code, content, headers.get('etag'), headers.get('last-modified'), ttl,
+                           resource_families(key[0]))
+        if entry.size > self.max_bytes:
+            return entry
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return entry
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            self.entries[key] = entry
+            self.size += entry.size
+            self.counters["stores"] += 1
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.size
+                self.counters["evictions"] += 1
+        return entry
+
+    def refresh(self, entry: CacheEntry, ttl: float):
+        """Extend an entry after a 304 Not Modified."""
+        with self.lock:
+            entry.stored = time.monotonic()
+            entry.expires = entry.stored + ttl
+            self.counters["revalidated"] += 1
+
+    def invalidate(self, path: str) -> int:
+        """Drop every entry sharing a resource family with path. Returns the number dropped."""
+        families = resource_families(path)
+        with self.lock:
+            stale = [key for key, entry in self.entries.items() if entry.families & families]
+            for key in stale:
+                self.size -= self.entries.pop(key).size
+            self.counters["invalidations"] += len(stale)
+            self.generation += 1
+        return len(stale)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            # A revalidation is a miss that was answered with 304, so the body still came from the cache.
+            lookups = self.counters["hits"] + self.counters["misses"]
+            served = self.counters["hits"] + self.counters["revalidated"]
+            return {
+                "enabled": self.enabled,
+                **self.counters,
+                "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+            }
@@ -1,9 +1,21 @@
 
 import json
+import sys
 import yaml
 import pathlib
 
+from mcp_redmine.spec import SPEC_COMPILED, SPEC_SOURCE, compile_spec
+
+def write_compiled_spec():
+    print(f"Compiling {SPEC_SOURCE} to {SPEC_COMPILED}", flush=True)
+    compile_spec(SPEC_SOURCE, SPEC_COMPILED)
+    print("Compilation complete.", flush=True)
+
 def main():
+    if "--compile" in sys.argv[1:]:
+        write_compiled_spec()
+        return
+
     root_dir = pathlib.Path(__file__).parent.parent
     input_file = root_dir / 'sensai_projects_schema.json'
     output_file = root_dir / 'mcp_redmine' / 'redmine_openapi.yml'
@@ -26,6 +38,9 @@ def main():
         print("Conversion complete.", flush=True)
     except Exception as e:
         print(f"Error writing file: {e}", flush=True)
+        return
+
+    write_compiled_spec()
 
 if __name__ == "__main__":
     main()
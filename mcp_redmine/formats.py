@@ -0,0 +1,164 @@
+import json
+import re
+
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# libyaml's C emitter produces the same output as the pure-Python SafeDumper, several times faster.
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+OUTPUT_FORMATS = ("yaml", "json", "lean")
+
+# An escaped character outside the Basic Multilingual Plane in a double-quoted YAML scalar: \U and eight hex digits
+# after an even number of backslashes, so that a literal backslash-U as in C:\Users doesn't count.
+_ESCAPED_NON_BMP = re.compile(r'(?<!\\)(?:\\\\)*\\U[0-9A-F]{8}')
+
+
+def _json_default(obj):
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', errors='replace')
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+def dump_yaml(obj) -> str:
+    # Allow direct Unicode output, prevent line wrapping for long lines, and avoid automatic key sorting.
+    text = yaml.dump(obj, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False, width=4096)
+    # libyaml escapes characters outside the Basic Multilingual Plane (emoji) as \UXXXXXXXX where the pure-Python
+    # emitter writes them as-is, so the rare payload containing one is re-emitted by the latter.
+    if YAML_DUMPER is not yaml.SafeDumper and _ESCAPED_NON_BMP.search(text):
+        text = yaml.dump(obj, Dumper=yaml.SafeDumper, allow_unicode=True, sort_keys=False, width=4096)
+    return text
+
+def dump_json(obj) -> str:
+    """Compact JSON, through orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+# Lean format
+#
+# An indentation-based layout like YAML, minus the quoting and repeated keys that cost tokens: lists of objects
+# (the bulk of any Redmine collection) become a header naming the columns followed by one comma-separated row
+# per item. Nested {id, name} references are flattened to dotted columns, keys an item lacks are left empty and
+# any other nested value is written inline as compact JSON.
+#
+#   issues[2]{id,subject,status.id,status.name,assigned_to.id,custom_fields}:
+#     1,Fix login page,1,New,5,[{"id":1,"value":"ACME"}]
+#     2,"Crash, on export",2,In Progress,,[]
+#   total_count: 2
+
+_NUMBER = re.compile(r'-?\d+(\.\d+)?([eE][-+]?\d+)?$')
+
+def _is_scalar(value):
+    return value is None or isinstance(value, (str, int, float, bool, bytes))
+
+def _scalar(value, delimiter=None) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+    if (value == "" or value != value.strip() or value in ("null", "true", "false") or _NUMBER.match(value)
+            or '\n' in value or '\r' in value or value.startswith(('"', '[', '{'))
+            or (delimiter and delimiter in value)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+def _cell(row: dict, column: str) -> str:
+    if column not in row:
+        return ""
+    value = row[column]
+    if _is_scalar(value):
+        return _scalar(value, ",")
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+def _flatten(item: dict) -> dict:
+    flat = {}
+    for key, value in item.items():
+        if isinstance(value, dict) and value and all(_is_scalar(v) for v in value.values()):
+            for sub_key, sub_value in value.items():
+                flat[f"{key}.{sub_key}"] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+def _table(items: list):
+    """Columns and flattened rows for a list of objects, or None when a table would not be shorter."""
+    if not items or not all(isinstance(item, dict) and item for item in items):
+        return None
+    rows = [_flatten(item) for item in items]
+    columns = list(dict.fromkeys(column for row in rows for column in row))
+    # Objects with little shape in common would mostly produce empty cells.
+    if len(columns) * len(rows) > 2 * sum(map(len, rows)):
+        return None
+    return columns, rows
+
+def _emit(key: str, value, indent: int, out: list):
+    pad = "  " * indent
+    if isinstance(value, dict):
+        if not value:
+            out.append(f"{pad}{key}: {{}}")
+            return
+        out.append(f"{pad}{key}:")
+        for sub_key, sub_value in value.items():
+            _emit(sub_key, sub_value, indent + 1, out)
+    elif isinstance(value, list):
+        table = _table(value)
+        if table:
+            columns, rows = table
+            out.append(f"{pad}{key}[{len(value)}]{{{','.join(columns)}}}:")
+            out.extend(f"{pad}  " + ",".join(_cell(row, c) for c in columns) for row in rows)
+        elif all(_is_scalar(item) for item in value):
+            out.append(f"{pad}{key}[{len(value)}]: " + ",".join(_scalar(item, ",") for item in value))
+        else:
+            out.append(f"{pad}{key}[{len(value)}]:")
+            for item in value:
+                if isinstance(item, dict):
+                    out.append(f"{pad}  -")
+                    for sub_key, sub_value in item.items():
+                        _emit(sub_key, sub_value, indent + 2, out)
+                elif isinstance(item, list):
+                    _emit("-", item, indent + 1, out)
+                else:
+                    out.append(f"{pad}  - {_scalar(item)}")
+    else:
+        out.append(f"{pad}{key}: {_scalar(value)}")
+
+def dump_lean(obj) -> str:
+    """Token-lean text rendering of a JSON-like object. Meant for reading by an LLM, not for parsing back."""
+    out = []
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            _emit(key, value, 0, out)
+    elif isinstance(obj, list):
+        _emit("", obj, 0, out)
+    else:
+        out.append(_scalar(obj))
+    return "\n".join(out) + "\n"
+
+
+SERIALIZERS = {
+    "yaml": dump_yaml,
+    "json": dump_json,
+    "lean": dump_lean,
+}
+
+
+def join_mappings(output_format: str, fragments: list) -> str:
+    """Join serialised single-key dicts into the serialisation of one dict holding all their keys.
+
+    YAML and lean write each top-level key on lines of its own, so their fragments just follow each other. JSON
+    fragments lose their braces and are joined with commas.
+    """
+    if not fragments:
+        return SERIALIZERS[output_format]({})
+    if output_format == "json":
+        return "{" + ",".join(fragment[1:-1] for fragment in fragments) + "}"
+    return "".join(fragments)
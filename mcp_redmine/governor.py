@@ -0,0 +1,166 @@
+import asyncio
+import contextlib
+import hashlib
+import threading
+import time
+import weakref
+
+
+class TokenBucket:
+    """At most rate requests per second, in bursts of up to burst, granted in arrival order.
+
+    reserve() books the next token, letting the balance go negative, and returns how long the caller has to
+    wait for it. Concurrent callers therefore queue behind each other at an even pace instead of racing for
+    tokens as they trickle in.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class Governor:
+    """Rate limit and cap on requests in flight for one stream of outbound traffic.
+
+    Callers wait for a token and then for a free slot; slot() and sync_slot() yield the seconds they waited.
+    A limit of 0 disables it. Async callers share a semaphore per event loop and threads share another, so
+    the in-flight cap holds for each of them separately.
+    """
+
+    def __init__(self, rate: float = 0, burst: int = 1, max_in_flight: int = 0):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_in_flight = max_in_flight
+        self._loop_semaphores = weakref.WeakKeyDictionary()
+        self._thread_semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.queued = 0
+        self.counters = {"requests": 0, "delayed": 0, "max_queued": 0, "queued_seconds": 0.0}
+
+    def _semaphore(self):
+        if self.max_in_flight <= 0:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._loop_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._loop_semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return semaphore
+
+    def _enter_queue(self):
+        with self.lock:
+            self.queued += 1
+            self.counters["max_queued"] = max(self.counters["max_queued"], self.queued)
+
+    def _leave_queue(self, waited: float):
+        with self.lock:
+            self.queued -= 1
+            self.in_flight += 1
+            self.counters["requests"] += 1
+            if waited >= 0.001:
+                self.counters["delayed"] += 1
+                self.counters["queued_seconds"] += waited
+
+    def _done(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        start = time.monotonic()
+        self._enter_queue()
+        semaphore = None
+        try:
+            delay = self.bucket.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+            semaphore = self._semaphore()
+            if semaphore is not None:
+                await semaphore.acquire()
+        except BaseException:
+            with self.lock:
+                self.queued -= 1
+            raise
+        waited = time.monotonic() - start
+        self._leave_queue(waited)
+        try:
+            yield waited
+        finally:
+            self._done()
+            if semaphore is not None:
+                semaphore.release()
+
+    @contextlib.contextmanager
+    def sync_slot(self):
+        start = time.monotonic()
+        self._enter_queue()
+        try:
+            delay = self.bucket.reserve()
+            if delay:
+                time.sleep(delay)
+            if self._thread_semaphore is not None:
+                self._thread_semaphore.acquire()
+        except BaseException:
+            with self.lock:
+                self.queued -= 1
+            raise
+        waited = time.monotonic() - start
+        self._leave_queue(waited)
+        try:
+            yield waited
+        finally:
+            self._done()
+            if self._thread_semaphore is not None:
+                self._thread_semaphore.release()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "rate": self.bucket.rate,
+                "burst": self.bucket.burst,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                **self.counters,
+                "queued_seconds": round(self.counters["queued_seconds"], 3),
+            }
+
+
+class GovernorPool:
+    """One Governor per API key, created on first use with the same limits."""
+
+    def __init__(self, rate: float = 0, burst: int = 1, max_in_flight: int = 0):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.governors = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def label(api_key: str) -> str:
+        """Short fingerprint of an API key to report statistics under, so the key itself is never shown."""
+        return hashlib.sha256(api_key.encode()).hexdigest()[:8]
+
+    def get(self, api_key: str) -> Governor:
+        with self.lock:
+            governor = self.governors.get(api_key)
+            if governor is None:
+                governor = self.governors[api_key] = Governor(self.rate, self.burst, self.max_in_flight)
+            return governor
+
+    def stats(self) -> dict:
+        with self.lock:
+            governors = list(self.governors.items())
+        return {self.label(api_key): governor.stats() for api_key, governor in governors}
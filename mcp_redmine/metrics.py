@@ -0,0 +1,272 @@
+"""
+Process metrics in the Prometheus text exposition format, served on /metrics by the health check server and the
+SSE server.
+
+Metrics are plain counters, gauges and histograms with labels, kept in memory and rendered on demand, so the
+server needs no metrics library. Values owned by other components (the response cache, the rate limiter) are
+read at scrape time through collectors registered with REGISTRY.register_collector().
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import math
+import threading
+import time
+
+from mcp_redmine import tracing
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from a cache hit to a slow fetch_all page.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def path_template(path: str) -> str:
+    """Label for an API path that keeps the number of label values bounded: the identifiers in a Redmine path,
+    every second segment, are replaced, e.g. '/projects/foo/issues.json?x=1' -> '/projects/{id}/issues.json'."""
+    segments = [segment for segment in path.split("?", 1)[0].strip("/").split("/") if segment]
+    for i in range(1, len(segments), 2):
+        _, dot, extension = segments[i].partition(".")
+        segments[i] = "{id}" + dot + extension
+    return "/" + "/".join(segments)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self.lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            lines.extend(self._lines(key, value))
+        return lines
+
+    def _lines(self, key: tuple, value) -> list:
+        return [f"{self.name}{_labels(self.label_names, key)} {_number(value)}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self.lock:
+            return self.values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        with self.lock:
+            return self.values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * len(self.buckets), 0.0, 0]  # per bucket counts, sum, count
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels) -> int:
+        with self.lock:
+            state = self.values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _lines(self, key: tuple, state) -> list:
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, state[0]):
+            cumulative += count
+            le = 'le="' + _number(bound) + '"'
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(state[1])}")
+        lines.append(f"{self.name}_count{_labels(self.label_names, key)} {state[2]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collect):
+        """Add a function called at every scrape that returns (name, type, help, [(labels dict, value)]) tuples."""
+        self.collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            for name, kind, help, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TOOL_CALLS = REGISTRY.counter("mcp_redmine_tool_calls_total", "MCP tool calls by tool and outcome.",
+                              ("tool", "outcome"))
+TOOL_DURATION = REGISTRY.histogram("mcp_redmine_tool_duration_seconds", "MCP tool call latency.", ("tool",))
+UPSTREAM_REQUESTS = REGISTRY.counter("mcp_redmine_upstream_requests_total",
+                                     "Requests sent to Redmine by method, path template and status code "
+                                     "(0 when no response was received).", ("method", "path", "status"))
+UPSTREAM_DURATION = REGISTRY.histogram("mcp_redmine_upstream_request_duration_seconds",
+                                       "Latency of requests to Redmine by method, path template and status code "
+                                       "(0 when no response was received).", ("method", "path", "status"))
+BYTES_SENT = REGISTRY.counter("mcp_redmine_upstream_sent_bytes_total", "Request body bytes sent to Redmine.")
+BYTES_RECEIVED = REGISTRY.counter("mcp_redmine_upstream_received_bytes_total",
+                                  "Response body bytes received from Redmine.")
+SSE_SESSIONS = REGISTRY.gauge("mcp_redmine_sse_sessions", "Connected SSE sessions.")
+EVENT_LOOP_LAG = REGISTRY.gauge("mcp_redmine_event_loop_lag_seconds",
+                                "How late the event loop last woke up a task that was due.")
+
+# Set by instrumented() for the duration of a tool call, flipped by tool_failed().
+_tool_failed = contextvars.ContextVar("mcp_redmine_tool_failed", default=None)
+
+
+def tool_failed():
+    """Mark the running tool call as failed, for tools that report errors in their result instead of raising."""
+    state = _tool_failed.get()
+    if state is not None:
+        state[0] = True
+
+def _record(tool: str, start: float, failed: bool):
+    TOOL_CALLS.inc(tool=tool, outcome="error" if failed else "ok")
+    TOOL_DURATION.observe(time.perf_counter() - start, tool=tool)
+
+def _tool_span(tool: str):
+    if not tracing.enabled():
+        return tracing.NO_SPAN
+    return tracing.span(f"tool {tool}", {"mcp.tool.name": tool})
+
+def _annotate(current, result, failed: bool):
+    if current is tracing.NO_SPAN:
+        return
+    if isinstance(result, str):
+        current.set_attribute("mcp.tool.result_size", len(result))
+    if failed:
+        tracing.mark_error(current, "the tool returned an error")
+
+def instrumented(fn):
+    """Count calls, time and trace a tool function, sync or async. Apply below @mcp.tool() so that FastMCP sees
+    the original signature through functools.wraps."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            state, start = [False], time.perf_counter()
+            token = _tool_failed.set(state)
+            try:
+                with _tool_span(fn.__name__) as current:
+                    result = await fn(*args, **kwargs)
+                    _annotate(current, result, state[0])
+                    return result
+            except BaseException:
+                state[0] = True
+                raise
+            finally:
+                _tool_failed.reset(token)
+                _record(fn.__name__, start, state[0])
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            state, start = [False], time.perf_counter()
+            token = _tool_failed.set(state)
+            try:
+                with _tool_span(fn.__name__) as current:
+                    result = fn(*args, **kwargs)
+                    _annotate(current, result, state[0])
+                    return result
+            except BaseException:
+                state[0] = True
+                raise
+            finally:
+                _tool_failed.reset(token)
+                _record(fn.__name__, start, state[0])
+    return wrapper
+
+async def monitor_event_loop(interval: float = 1.0):
+    """Measure, every interval seconds, how much later than asked the event loop resumes a sleeping task.
+
+    A lag well above a few milliseconds means something is blocking the loop, and every tool call waits for it.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(round(max(0.0, loop.time() - start - interval), 6))
@@ -0,0 +1,148 @@
+import json
+import sqlite3
+import threading
+import time
+
+from mcp_redmine.sqlite_store import SqliteStore
+
+
+def _id(key):
+    return lambda obj: (obj.get(key) or {}).get("id")
+
+def _field(key):
+    return lambda obj: obj.get(key)
+
+# Columns extracted from the API objects for each mirrored table. Every table also has an integer `id` primary
+# key and a `data` column holding the object as returned by the API, for use with SQLite's JSON functions.
+TABLES = {
+    "issues": {
+        "project_id": _id("project"),
+        "tracker_id": _id("tracker"),
+        "status_id": _id("status"),
+        "priority_id": _id("priority"),
+        "author_id": _id("author"),
+        "assigned_to_id": _id("assigned_to"),
+        "category_id": _id("category"),
+        "fixed_version_id": _id("fixed_version"),
+        "parent_id": _id("parent"),
+        "subject": _field("subject"),
+        "start_date": _field("start_date"),
+        "due_date": _field("due_date"),
+        "done_ratio": _field("done_ratio"),
+        "estimated_hours": _field("estimated_hours"),
+        "created_on": _field("created_on"),
+        "updated_on": _field("updated_on"),
+        "closed_on": _field("closed_on"),
+    },
+    "projects": {
+        "identifier": _field("identifier"),
+        "name": _field("name"),
+        "parent_id": _id("parent"),
+        "status": _field("status"),
+        "is_public": _field("is_public"),
+        "created_on": _field("created_on"),
+        "updated_on": _field("updated_on"),
+    },
+    "users": {
+        "login": _field("login"),
+        "firstname": _field("firstname"),
+        "lastname": _field("lastname"),
+        "mail": _field("mail"),
+        "status": _field("status"),
+        "created_on": _field("created_on"),
+        "last_login_on": _field("last_login_on"),
+    },
+    "trackers": {
+        "name": _field("name"),
+    },
+    "issue_statuses": {
+        "name": _field("name"),
+        "is_closed": _field("is_closed"),
+    },
+}
+
+# SQLite authorizer action codes a read-only query may need.
+_READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+
+def schema_description() -> str:
+    return "\n".join(f"    {table}(id, {', '.join(columns)}, data)" for table, columns in TABLES.items())
+
+def _row(table: str, obj: dict) -> tuple:
+    return (obj["id"], *(extract(obj) for extract in TABLES[table].values()), json.dumps(obj, ensure_ascii=False))
+
+
+class Mirror(SqliteStore):
+    """Local SQLite copy of Redmine issues, projects, users, trackers and issue statuses.
+
+    Filled by a sync engine through upsert() and replace(); answers read-only SQL through query() on a separate
+    connection, so that reads never see a half-applied page and never block the sync for longer than a
+    transaction.
+    """
+
+    meta_table = "mirror_meta"
+
+    def __init__(self, path: str, query_timeout: float = 10.0):
+        super().__init__(path)
+        self.query_timeout = query_timeout
+        with self.db:
+            for table, columns in TABLES.items():
+                self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                                f"(id INTEGER PRIMARY KEY, {', '.join(columns)}, data TEXT)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS issues_updated_on ON issues (updated_on)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS issues_project_status ON issues (project_id, status_id)")
+        self.read_lock = threading.Lock()
+        self.reader = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self.reader.set_authorizer(lambda action, *args: sqlite3.SQLITE_OK if action in _READ_ACTIONS
+                                   else sqlite3.SQLITE_DENY)
+
+    def close(self):
+        with self.read_lock:
+            self.reader.close()
+        super().close()
+
+    def upsert(self, table: str, objects: list) -> int:
+        placeholders = ", ".join("?" * (len(TABLES[table]) + 2))
+        with self.lock, self.db:
+            self.db.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})",
+                                [_row(table, obj) for obj in objects])
+        return len(objects)
+
+    def replace(self, table: str, objects: list) -> int:
+        """Make table hold exactly objects. Returns the number of rows deleted."""
+        self.upsert(table, objects)
+        return self.delete_missing(table, [obj["id"] for obj in objects])
+
+    def query(self, sql: str, params: list = None, limit: int = 200) -> dict:
+        """Run one read-only statement and return at most limit rows as dicts.
+
+        Anything other than reading (writes, ATTACH, PRAGMA) is refused by the authorizer, and statements running
+        longer than query_timeout seconds are interrupted.
+        """
+        deadline = time.monotonic() + self.query_timeout
+        with self.read_lock:
+            self.reader.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+            try:
+                cursor = self.reader.execute(sql, params or [])
+                columns = [column[0] for column in cursor.description or ()]
+                rows = cursor.fetchmany(limit + 1)
+            finally:
+                self.reader.set_progress_handler(None, 0)
+        return {
+            "columns": columns,
+            "rows": [dict(zip(columns, row)) for row in rows[:limit]],
+            "truncated": len(rows) > limit,
+        }
+
+    def info(self) -> dict:
+        synced_at = self.get_meta("synced_at")
+        synced_at = float(synced_at) if synced_at else None
+        reconciled_at = self.get_meta("reconciled_at")
+        return {
+            "tables": {table: self.count(table) for table in TABLES},
+            "watermark": self.get_meta("watermark"),
+            "synced_at": synced_at,
+            "age_seconds": round(time.time() - synced_at, 1) if synced_at else None,
+            "reconciled_at": float(reconciled_at) if reconciled_at else None,
+            "last_error": self.get_meta("last_error") or None,
+        }
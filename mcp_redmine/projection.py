@@ -0,0 +1,93 @@
+"""
+Field selection for API responses, so that tools only serialise and return the parts of a body the caller asked
+for.
+
+Selectors are dotted paths such as "issues.status.name". Lists are traversed implicitly, "*" matches any key
+and JSONPath spellings ("$.issues[*].id") are accepted. A selector that does not start with a key of the body is
+taken to be relative to the body's item, the list in a collection response ("issues" in /issues.json) or the
+object in a single resource response ("issue" in /issues/1.json), so ["id", "subject"] works for both.
+"""
+import re
+
+_BRACKETS = re.compile(r'\[(\*|\d*)\]')
+
+
+def parse_selector(selector: str) -> list:
+    """'$.issues[*].status.name' -> ['issues', 'status', 'name']."""
+    selector = _BRACKETS.sub('.', selector.strip())
+    return [part for part in selector.lstrip('$').split('.') if part]
+
+def selector_tree(selectors: list) -> dict:
+    """Merge selectors into a nested dict whose leaves are True, e.g. {'issues': {'id': True}}."""
+    tree = {}
+    for selector in selectors:
+        parts = parse_selector(selector)
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is True:
+                break  # a parent is already selected as a whole
+            node = child
+        else:
+            node[parts[-1]] = True
+    return tree
+
+def item_key(body: dict):
+    """Key of the single list or object in a Redmine response body, e.g. 'issues' or 'issue', else None."""
+    keys = [key for key, value in body.items() if isinstance(value, (dict, list))]
+    return keys[0] if len(keys) == 1 else None
+
+def _anchor(selectors: list, body: dict) -> list:
+    key = item_key(body)
+    anchored = []
+    for selector in selectors:
+        parts = parse_selector(selector)
+        if key is not None and parts and parts[0] not in body and parts[0] != '*':
+            parts = [key, *parts]
+        anchored.append('.'.join(parts))
+    return anchored
+
+def _include(value, tree: dict):
+    if isinstance(value, list):
+        return [_include(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    selected = {}
+    for key, item in value.items():
+        subtree = tree.get(key, tree.get('*'))
+        if subtree is None:
+            continue
+        selected[key] = item if subtree is True else _include(item, subtree)
+    return selected
+
+def _exclude(value, tree: dict):
+    if isinstance(value, list):
+        return [_exclude(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    kept = {}
+    for key, item in value.items():
+        subtree = tree.get(key, tree.get('*'))
+        if subtree is True:
+            continue
+        kept[key] = item if subtree is None else _exclude(item, subtree)
+    return kept
+
+def project(body, fields: list = None, exclude: list = None):
+    """Return body reduced to fields, minus exclude. Bodies that are not JSON objects are returned unchanged.
+
+    With fields, scalar values at the top of the body (total_count, offset, limit) are always kept.
+    """
+    if not isinstance(body, dict) or not (fields or exclude):
+        return body
+    if fields:
+        tree = selector_tree(_anchor(fields, body))
+        for key, value in body.items():
+            if not isinstance(value, (dict, list)):
+                tree.setdefault(key, True)
+        body = _include(body, tree)
+    if exclude:
+        body = _exclude(body, selector_tree(_anchor(exclude, body)))
+    return body
@@ -0,0 +1,97 @@
+import email.utils
+import random
+import threading
+import time
+
+import httpx
+
+# Methods that can be sent twice without changing the outcome. POST and PATCH are never retried.
+IDEMPOTENT_METHODS = frozenset(("get", "head", "options", "put", "delete"))
+
+# Responses a load balancer or an overloaded Redmine sends that are worth another try.
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+
+def retry_after(response) -> float:
+    """Seconds to wait according to the response's Retry-After header, in seconds or as an HTTP date, else None."""
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+def retryable_error(error: Exception) -> bool:
+    """Connection level failures. A read or write timeout already cost a full REDMINE_TIMEOUT, so it is not
+    retried."""
+    return isinstance(error, httpx.TransportError) and not isinstance(error, (httpx.ReadTimeout, httpx.WriteTimeout))
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter for idempotent requests, limited by a retry budget.
+
+    The budget is a token bucket: every request deposits budget_ratio tokens, up to budget_max, and every retry
+    spends one. While most requests succeed the budget stays full; when a backend is down, retries are held to
+    about budget_ratio of the traffic instead of multiplying it.
+    """
+
+    def __init__(self, retries: int, backoff: float, max_delay: float, budget_ratio: float,
+                 budget_max: float = 10.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_max = budget_max
+        self.balance = budget_max
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(("requests", "retries", "budget_exhausted", "retry_after_too_long"), 0)
+
+    def record_request(self):
+        with self.lock:
+            self.counters["requests"] += 1
+            self.balance = min(self.budget_max, self.balance + self.budget_ratio)
+
+    def delay(self, method: str, attempt: int, response=None, error: Exception = None,
+              replayable: bool = True, retries: int = None) -> float:
+        """Seconds to wait before retry number attempt + 1 of a request that got response or raised error, or
+        None when it must not be retried. retries overrides the policy's number of retries for this request."""
+        limit = self.retries if retries is None else retries
+        if attempt >= limit or not replayable or method.lower() not in IDEMPOTENT_METHODS:
+            return None
+        if error is not None:
+            if not retryable_error(error):
+                return None
+        elif response is None or response.status_code not in RETRY_STATUSES:
+            return None
+
+        delay = random.uniform(0, min(self.max_delay, self.backoff * 2 ** attempt))
+        wait = retry_after(response)
+        if wait is not None:
+            if wait > self.max_delay:
+                with self.lock:
+                    self.counters["retry_after_too_long"] += 1
+                return None
+            delay = max(delay, wait)
+
+        with self.lock:
+            if self.balance < 1:
+                self.counters["budget_exhausted"] += 1
+                return None
+            self.balance -= 1
+            self.counters["retries"] += 1
+        return delay
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                **self.counters,
+                "budget": round(self.balance, 2),
+                "budget_max": self.budget_max,
+                "max_retries": self.retries,
+            }
@@ -0,0 +1,131 @@
+import re
+import time
+
+from mcp_redmine.sqlite_store import SqliteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER,
+    project TEXT,
+    tracker TEXT,
+    status_id INTEGER,
+    status TEXT,
+    is_closed INTEGER NOT NULL DEFAULT 0,
+    assigned_to TEXT,
+    subject TEXT,
+    updated_on TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS issue_text USING fts5(subject, description, journals, tokenize='porter unicode61');
+"""
+
+# Column weights for bm25(): a match in the subject counts for more than one in a long description or comment.
+BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching any of its words, including as a prefix.
+
+    Every token is quoted, so FTS5 operators and punctuation in the user's text can't cause a syntax error.
+    Issues matching more of the words rank higher through bm25().
+    """
+    return " OR ".join(f'"{token}"*' for token in _TOKEN.findall(text))
+
+def journal_text(issue: dict) -> str:
+    return "\n".join(journal["notes"] for journal in issue.get("journals", []) if journal.get("notes"))
+
+def _name(issue: dict, key: str):
+    return (issue.get(key) or {}).get("name")
+
+
+class IssueIndex(SqliteStore):
+    """SQLite FTS5 index over issue subjects, descriptions and journal notes.
+
+    Ranked with BM25. The index itself knows nothing about Redmine's API; it is filled through upsert() and
+    remembers a watermark, the newest updated_on it has seen, so that the caller can fetch only what changed.
+    Deletions don't show up in such deltas, so the caller drops them now and then with delete_missing("issues").
+    """
+
+    meta_table = "index_meta"
+    dependents = {"issues": (("issue_text", "rowid"),)}
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.db.executescript(SCHEMA)
+
+    def upsert(self, issues: list, closed_status_ids: set = frozenset()) -> int:
+        """Add or replace issues as returned by /issues.json, with a 'journals' list when available.
+
+        An issue without 'journals' keeps the journal text it was indexed with before.
+        """
+        with self.lock, self.db:
+            for issue in issues:
+                journals = journal_text(issue) if "journals" in issue else None
+                if journals is None:
+                    row = self.db.execute("SELECT journals FROM issue_text WHERE rowid = ?", (issue["id"],)).fetchone()
+                    journals = row[0] if row else ""
+                status = issue.get("status") or {}
+                self.db.execute(
+                    "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (issue["id"], (issue.get("project") or {}).get("id"), _name(issue, "project"),
+                     _name(issue, "tracker"), status.get("id"), status.get("name"),
+                     int(bool(status.get("is_closed", status.get("id") in closed_status_ids))),
+                     _name(issue, "assigned_to"), issue.get("subject", ""), issue.get("updated_on")))
+                self.db.execute("DELETE FROM issue_text WHERE rowid = ?", (issue["id"],))
+                self.db.execute("INSERT INTO issue_text (rowid, subject, description, journals) VALUES (?, ?, ?, ?)",
+                                (issue["id"], issue.get("subject", ""), issue.get("description") or "", journals))
+        return len(issues)
+
+    def search(self, query: str, project_id: int = None, status_id: str = "open", limit: int = 10) -> list:
+        """Return up to limit issues matching query, best first.
+
+        status_id takes the values the Redmine API does: "open", "closed", "*", a status ID or several joined
+        with "|", and raises ValueError for anything else. project_id matches the issue's own project only, not
+        its subprojects.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        sql = ["SELECT i.id, i.subject, i.project, i.tracker, i.status, i.assigned_to, i.updated_on,",
+               f"-bm25(issue_text, {', '.join(map(str, BM25_WEIGHTS))}) AS score,",
+               "snippet(issue_text, -1, '[', ']', '...', 12)",
+               "FROM issue_text JOIN issues i ON i.id = issue_text.rowid WHERE issue_text MATCH ?"]
+        args = [match]
+        if project_id is not None:
+            sql.append("AND i.project_id = ?")
+            args.append(int(project_id))
+        status_id = str(status_id)
+        if status_id == "open":
+            sql.append("AND i.is_closed = 0")
+        elif status_id == "closed":
+            sql.append("AND i.is_closed = 1")
+        elif status_id != "*":
+            ids = status_id.split("|")
+            if not all(part.strip().isdigit() for part in ids):
+                raise ValueError(f"Unsupported status_id for the search index: {status_id!r}")
+            sql.append(f"AND i.status_id IN ({', '.join('?' * len(ids))})")
+            args.extend(int(part) for part in ids)
+        sql.append("ORDER BY score DESC, i.id DESC LIMIT ?")
+        args.append(int(limit))
+
+        columns = ("id", "subject", "project", "tracker", "status", "assigned_to", "updated_on", "score", "snippet")
+        with self.lock:
+            rows = self.db.execute(" ".join(sql), args).fetchall()
+        hits = [dict(zip(columns, row)) for row in rows]
+        for hit in hits:
+            hit["score"] = round(hit["score"], 3)
+        return hits
+
+    def info(self) -> dict:
+        """Size and freshness of the index."""
+        count = self.count("issues")
+        synced_at = self.get_meta("synced_at")
+        synced_at = float(synced_at) if synced_at else None
+        return {
+            "issues": count,
+            "watermark": self.get_meta("watermark"),
+            "synced_at": synced_at,
+            "age_seconds": round(time.time() - synced_at, 1) if synced_at else None,
+        }
@@ -1,25 +1,44 @@
-import os, yaml, pathlib
-import socket
-import threading
 import time
+STARTUP_STARTED = time.perf_counter()
+
+import os, pathlib, json
+import sys
+import hashlib
+import atexit
+import threading
 import asyncio
+import contextlib
 import anyio
-from functools import lru_cache
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urljoin
+from datetime import datetime, timezone
+from urllib.parse import quote, urljoin
 
 import httpx
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from mcp.server.fastmcp.utilities.logging import get_logger
 
+from mcp_redmine import tracing
+from mcp_redmine.aggregate import Aggregator
+from mcp_redmine.batch import normalize_operations, run_batch
+from mcp_redmine.budget import OutputBudget, ResultStore, parse_budget, slice_result
+from mcp_redmine.cache import DEFAULT_CACHE_TTLS, ResponseCache, parse_ttls
+from mcp_redmine.formats import OUTPUT_FORMATS, SERIALIZERS, join_mappings
+from mcp_redmine.governor import Governor, GovernorPool
+from mcp_redmine.metrics import (BYTES_RECEIVED, BYTES_SENT, REGISTRY, UPSTREAM_DURATION, UPSTREAM_REQUESTS,
+                                 instrumented, monitor_event_loop, path_template, tool_failed)
+from mcp_redmine.mirror import Mirror, schema_description
+from mcp_redmine.projection import project
+from mcp_redmine.retry import IDEMPOTENT_METHODS, RetryPolicy
+from mcp_redmine.search_index import IssueIndex
+from mcp_redmine.singleflight import SingleFlight
+from mcp_redmine.spec import SpecIndex, load_spec
+from mcp_redmine.sqlite_store import SqliteStore
+
 ### Constants ###
 
 VERSION = "2026.01.01.000001"
 
 # Load OpenAPI spec
-current_dir = pathlib.Path(__file__).parent
-with open(current_dir / 'redmine_openapi.yml') as f:
-    SPEC = yaml.safe_load(f)
+SPEC, SPEC_LOAD_INFO = load_spec()
 
 # Constants from environment
 REDMINE_URL = os.environ['REDMINE_URL']
@@ -31,44 +50,867 @@ else:
     REDMINE_REQUEST_INSTRUCTIONS = ""
 
 
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# Serialization of tool results: yaml (default), json or lean
+REDMINE_OUTPUT_FORMAT = os.environ.get('REDMINE_OUTPUT_FORMAT', '').strip().lower() or 'yaml'
+if REDMINE_OUTPUT_FORMAT not in OUTPUT_FORMATS:
+    raise ValueError(f"REDMINE_OUTPUT_FORMAT must be one of {', '.join(OUTPUT_FORMATS)}, got: {REDMINE_OUTPUT_FORMAT}")
+
+# Largest tool result, in bytes or e.g. '15000 tokens'; larger ones are cut down and continued with
+# redmine_continue. Off when 0.
+REDMINE_OUTPUT_BUDGET = parse_budget(os.environ.get('REDMINE_OUTPUT_BUDGET', '0'))
+REDMINE_RESULT_STORE_MAX_BYTES = int(os.environ.get('REDMINE_RESULT_STORE_MAX_BYTES', 64 * 1024 * 1024))
+REDMINE_RESULT_STORE_TTL = float(os.environ.get('REDMINE_RESULT_STORE_TTL', 900))
+RESULT_STORE = ResultStore(REDMINE_RESULT_STORE_MAX_BYTES, REDMINE_RESULT_STORE_TTL)
+OUTPUT_BUDGET = OutputBudget(REDMINE_OUTPUT_BUDGET, RESULT_STORE)
+# Items per slice of a cursor (redmine_request cursor=true, redmine_cursor) when no limit is given
+REDMINE_CURSOR_PAGE_SIZE = int(os.environ.get('REDMINE_CURSOR_PAGE_SIZE', 25))
+
+# Optional OpenTelemetry tracing: console or otlp, off when empty
+REDMINE_TRACING = os.environ.get('REDMINE_TRACING', '').strip().lower()
+if REDMINE_TRACING:
+    tracing.setup_tracing(REDMINE_TRACING, version=VERSION)
+
+# HTTP connection pool settings
+REDMINE_TIMEOUT = float(os.environ.get('REDMINE_TIMEOUT', 60.0))
+REDMINE_HTTP_MAX_CONNECTIONS = int(os.environ.get('REDMINE_HTTP_MAX_CONNECTIONS', 20))
+REDMINE_HTTP_MAX_KEEPALIVE = int(os.environ.get('REDMINE_HTTP_MAX_KEEPALIVE', 10))
+REDMINE_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('REDMINE_HTTP_KEEPALIVE_EXPIRY', 30.0))
+REDMINE_HTTP2 = env_bool('REDMINE_HTTP2')
+
+# Retries of idempotent requests on connection errors, 429 and 502-504
+REDMINE_RETRIES = int(os.environ.get('REDMINE_RETRIES', 2))
+REDMINE_RETRY_BACKOFF = float(os.environ.get('REDMINE_RETRY_BACKOFF', 0.5))
+REDMINE_RETRY_MAX_DELAY = float(os.environ.get('REDMINE_RETRY_MAX_DELAY', 10.0))
+REDMINE_RETRY_BUDGET = float(os.environ.get('REDMINE_RETRY_BUDGET', 0.1))
+RETRY_POLICY = RetryPolicy(REDMINE_RETRIES, REDMINE_RETRY_BACKOFF, REDMINE_RETRY_MAX_DELAY, REDMINE_RETRY_BUDGET)
+
+# Limits on outbound traffic to Redmine, for all requests and for each API key. 0 disables a limit.
+REDMINE_RATE_LIMIT = float(os.environ.get('REDMINE_RATE_LIMIT', 0))  # requests per second
+REDMINE_RATE_BURST = int(os.environ.get('REDMINE_RATE_BURST', 10))
+REDMINE_MAX_IN_FLIGHT = int(os.environ.get('REDMINE_MAX_IN_FLIGHT', REDMINE_HTTP_MAX_CONNECTIONS))
+REDMINE_KEY_RATE_LIMIT = float(os.environ.get('REDMINE_KEY_RATE_LIMIT', 0))
+REDMINE_KEY_MAX_IN_FLIGHT = int(os.environ.get('REDMINE_KEY_MAX_IN_FLIGHT', 0))
+GOVERNOR = Governor(REDMINE_RATE_LIMIT, REDMINE_RATE_BURST, REDMINE_MAX_IN_FLIGHT)
+KEY_GOVERNORS = GovernorPool(REDMINE_KEY_RATE_LIMIT, REDMINE_RATE_BURST, REDMINE_KEY_MAX_IN_FLIGHT)
+
+# Identical GETs in flight at the same time share one upstream call
+SINGLE_FLIGHT = SingleFlight()
+
+# Response cache for idempotent GETs
+REDMINE_CACHE = env_bool('REDMINE_CACHE', True)
+REDMINE_CACHE_TTLS = os.environ.get('REDMINE_CACHE_TTLS', DEFAULT_CACHE_TTLS)
+REDMINE_CACHE_MAX_BYTES = int(os.environ.get('REDMINE_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+RESPONSE_CACHE = ResponseCache(parse_ttls(REDMINE_CACHE_TTLS), REDMINE_CACHE_MAX_BYTES, enabled=REDMINE_CACHE,
+                               match=lambda path: spec_index().router.match(path))
+
+# Pagination settings for fetch_all
+REDMINE_PAGE_LIMIT = 100  # Redmine's own maximum for limit
+REDMINE_FETCH_ALL_CONCURRENCY = int(os.environ.get('REDMINE_FETCH_ALL_CONCURRENCY', 4))
+REDMINE_FETCH_ALL_MAX_ITEMS = int(os.environ.get('REDMINE_FETCH_ALL_MAX_ITEMS', 10000))
+REDMINE_FETCH_ALL_MAX_BYTES = int(os.environ.get('REDMINE_FETCH_ALL_MAX_BYTES', 20 * 1024 * 1024))
+
+# File transfer settings
+REDMINE_UPLOAD_CHUNK_SIZE = int(os.environ.get('REDMINE_UPLOAD_CHUNK_SIZE', 1024 * 1024))
+REDMINE_UPLOAD_MAX_SIZE = int(os.environ.get('REDMINE_UPLOAD_MAX_SIZE', 1024 * 1024 * 1024))  # 0 for no limit
+REDMINE_DOWNLOAD_ATTEMPTS = int(os.environ.get('REDMINE_DOWNLOAD_ATTEMPTS', 3))
+REDMINE_DOWNLOAD_CONCURRENCY = int(os.environ.get('REDMINE_DOWNLOAD_CONCURRENCY', 4))
+
+# Batch operations
+REDMINE_BATCH_CONCURRENCY = int(os.environ.get('REDMINE_BATCH_CONCURRENCY', 4))
+REDMINE_BATCH_MAX_OPERATIONS = int(os.environ.get('REDMINE_BATCH_MAX_OPERATIONS', 200))
+
+# Check redmine_request arguments against the OpenAPI spec before sending them (per call with check_spec)
+REDMINE_VALIDATE_REQUESTS = env_bool('REDMINE_VALIDATE_REQUESTS', False)
+
+# Optional local full-text index behind redmine_search_issues
+REDMINE_SEARCH_INDEX = os.environ.get('REDMINE_SEARCH_INDEX', '')  # path of the SQLite file, empty to disable
+REDMINE_SEARCH_INDEX_REFRESH = float(os.environ.get('REDMINE_SEARCH_INDEX_REFRESH', 300))
+REDMINE_SEARCH_INDEX_JOURNALS = env_bool('REDMINE_SEARCH_INDEX_JOURNALS', True)
+REDMINE_SEARCH_INDEX_RECONCILE = float(os.environ.get('REDMINE_SEARCH_INDEX_RECONCILE', 24 * 3600))
+SEARCH_INDEX = IssueIndex(REDMINE_SEARCH_INDEX) if REDMINE_SEARCH_INDEX else None
+
+# Optional local mirror of issues and reference data, queried with SQL
+REDMINE_MIRROR = os.environ.get('REDMINE_MIRROR', '')  # path of the SQLite file, empty to disable
+REDMINE_MIRROR_INTERVAL = float(os.environ.get('REDMINE_MIRROR_INTERVAL', 300))
+REDMINE_MIRROR_RECONCILE = float(os.environ.get('REDMINE_MIRROR_RECONCILE', 24 * 3600))
+REDMINE_MIRROR_QUERY_TIMEOUT = float(os.environ.get('REDMINE_MIRROR_QUERY_TIMEOUT', 10))
+MIRROR = Mirror(REDMINE_MIRROR, REDMINE_MIRROR_QUERY_TIMEOUT) if REDMINE_MIRROR else None
+
+
+# HTTP client
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+_async_client = None
+_async_client_loop = None
+_async_client_pid = None
+
+def client_options() -> dict:
+    """Keyword arguments shared by every httpx client the server creates."""
+    options = {
+        "limits": httpx.Limits(max_connections=REDMINE_HTTP_MAX_CONNECTIONS,
+                               max_keepalive_connections=REDMINE_HTTP_MAX_KEEPALIVE,
+                               keepalive_expiry=REDMINE_HTTP_KEEPALIVE_EXPIRY),
+        "timeout": REDMINE_TIMEOUT,
+        "http2": False,
+    }
+    if REDMINE_HTTP2:
+        try:
+            import h2  # noqa: F401
+            options["http2"] = True
+        except ImportError:
+            get_logger(__name__).warning("REDMINE_HTTP2 is set but the 'h2' package is not installed, "
+                                         "falling back to HTTP/1.1 (pip install 'httpx[http2]')")
+    return options
+
+def get_client() -> httpx.Client:
+    """Return the long-lived pooled client, creating it on first use or after a fork."""
+    global _client, _client_pid
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = httpx.Client(**client_options())
+            _client_pid = os.getpid()
+        return _client
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled async client shared by all tool calls on the running event loop.
+
+    Connections belong to the loop that opened them, so a client created on another loop (or in the
+    parent of a fork) is replaced rather than reused.
+    """
+    global _async_client, _async_client_loop, _async_client_pid
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop or _async_client_pid != os.getpid():
+        _async_client = httpx.AsyncClient(**client_options())
+        _async_client_loop = loop
+        _async_client_pid = os.getpid()
+    return _async_client
+
+def close_client():
+    """Close the pooled client. Safe to call more than once."""
+    global _client, _client_pid
+    with _client_lock:
+        client, _client, _client_pid = _client, None, None
+    if client is not None:
+        client.close()
+
+async def aclose_client():
+    """Close the pooled async client if it belongs to the running event loop."""
+    global _async_client, _async_client_loop, _async_client_pid
+    client, loop = _async_client, _async_client_loop
+    _async_client, _async_client_loop, _async_client_pid = None, None, None
+    if client is not None and loop is asyncio.get_running_loop():
+        await client.aclose()
+
+def _reset_client_after_fork():
+    # The parent's sockets must not be shared with the child, so drop the pools without closing them.
+    global _client, _client_pid, _client_lock, _async_client, _async_client_loop, _async_client_pid
+    _client, _client_pid, _client_lock = None, None, threading.Lock()
+    _async_client, _async_client_loop, _async_client_pid = None, None, None
+
+atexit.register(close_client)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
+
+
 # Core
+def _response_result(response: httpx.Response) -> dict:
+    body = None
+    if response.content:
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.content
+
+    return {"status_code": response.status_code, "body": body, "error": ""}
+
+def _error_result(e: Exception) -> dict:
+    try:
+        status_code = e.response.status_code
+    except:
+        status_code = 0
+
+    try:
+        body = e.response.json()
+    except:
+        try:
+            body = e.response.text
+        except:
+            body = None
+
+    return {"status_code": status_code, "body": body, "error": f"{e.__class__.__name__}: {e}"}
+
+def _content_result(status_code: int, content: bytes) -> dict:
+    body = None
+    if content:
+        try:
+            body = json.loads(content)
+        except ValueError:
+            body = content
+
+    return {"status_code": status_code, "body": body, "error": ""}
+
+def _cache_plan(method: str, path: str, params: dict) -> tuple:
+    """Return (key, ttl, entry, generation) for a cacheable GET, or (None, 0, None, None) when the response must
+    not be cached."""
+    if not RESPONSE_CACHE.enabled or method != 'get':
+        return None, 0, None, None
+    ttl = RESPONSE_CACHE.ttl_for(path)
+    if ttl <= 0:
+        return None, 0, None, None
+    key = RESPONSE_CACHE.key(path, params, REDMINE_API_KEY)
+    return key, ttl, RESPONSE_CACHE.lookup(key), RESPONSE_CACHE.generation
+
+def _cached_result(entry, state: str) -> dict:
+    result = _content_result(entry.status_code, entry.content)
+    result["meta"] = {"cache": state, "age_seconds": round(entry.age(), 1)}
+    return result
+
+def _http_span(method: str, template: str, attempt: int, queued: float):
+    if not tracing.enabled():
+        return tracing.NO_SPAN
+    return tracing.span(f"HTTP {method.upper()}", {"http.request.method": method.upper(), "url.template": template,
+                                                   "http.request.resend_count": attempt,
+                                                   "redmine.queued_seconds": round(queued, 6)})
+
+def _observe_upstream(method: str, template: str, start: float, response: httpx.Response = None,
+                      received: int = None, current=tracing.NO_SPAN):
+    """Record one request to Redmine in the metrics and on its span. received defaults to the size of a read
+    response body."""
+    status = response.status_code if response is not None else 0
+    UPSTREAM_DURATION.observe(time.perf_counter() - start, method=method, path=template, status=status)
+    UPSTREAM_REQUESTS.inc(method=method, path=template, status=status)
+    if current is not tracing.NO_SPAN:
+        current.set_attribute("http.response.status_code", status)
+        if status == 0 or status >= 500:
+            tracing.mark_error(current, "no response" if status == 0 else f"HTTP {status}")
+    if response is None:
+        return
+    try:
+        sent = int(response.request.headers.get('content-length', 0))
+        received = len(response.content) if received is None else received
+    except Exception:  # a response built without a request, or a streamed one that was not read
+        return
+    BYTES_SENT.inc(sent)
+    BYTES_RECEIVED.inc(received)
+    current.set_attribute("http.request.body.size", sent)
+    current.set_attribute("http.response.body.size", received)
+
+def _with_meta(result: dict, retries: int, queued: float) -> dict:
+    if retries:
+        result.setdefault("meta", {})["retries"] = retries
+    if queued >= 0.001:
+        result.setdefault("meta", {})["queued_seconds"] = round(queued, 3)
+    return result
+
+@contextlib.contextmanager
+def outbound_slot(api_key: str = None):
+    """Wait for the per API key and the global limits on outbound traffic. Yields the seconds waited."""
+    with KEY_GOVERNORS.get(api_key or REDMINE_API_KEY).sync_slot() as key_wait, GOVERNOR.sync_slot() as wait:
+        yield key_wait + wait
+
+@contextlib.asynccontextmanager
+async def aoutbound_slot(api_key: str = None):
+    """Async twin of outbound_slot()."""
+    async with KEY_GOVERNORS.get(api_key or REDMINE_API_KEY).slot() as key_wait, GOVERNOR.slot() as wait:
+        yield key_wait + wait
+
+class _Exchange:
+    """One request to Redmine as request() and _arequest() both make it, up to sending and waiting.
+
+    start() answers from the response cache when it can, attempted() accounts for each attempt and says how long
+    to wait before the next, and result() turns the outcome into a result dict.
+    """
+
+    def __init__(self, path: str, method: str, params: dict, content_type: str, headers: dict = None,
+                 replayable: bool = True, max_retries: int = None):
+        self.path, self.method = path, method
+        self.url = urljoin(REDMINE_URL, path.lstrip('/'))
+        self.headers = {'X-Redmine-API-Key': REDMINE_API_KEY, 'Content-Type': content_type, **(headers or {})}
+        self.template = route_template(path)
+        self.replayable, self.max_retries = replayable, max_retries
+        self.retries, self.queued = 0, 0.0
+        self.response = self.error = None
+        self.key, self.ttl, self.entry, self.generation = _cache_plan(method, path, params)
+
+    def start(self) -> dict:
+        """The cached result when a fresh entry answers the request, otherwise None once it is ready to send."""
+        if self.entry is not None and self.entry.fresh():
+            RESPONSE_CACHE.count("hits")
+            return _cached_result(self.entry, "hit")
+        if self.key is not None:
+            RESPONSE_CACHE.count("misses")
+        if self.entry is not None:
+            self.headers.update(self.entry.validators())
+        RETRY_POLICY.record_request()
+        return None
+
+    def span(self, waited: float):
+        return _http_span(self.method, self.template, self.retries, waited)
+
+    def attempted(self, response: httpx.Response, error: Exception, waited: float) -> float:
+        """Record an attempt's outcome. Returns the seconds to wait before retrying, or None to stop."""
+        self.response, self.error = response, error
+        self.queued += waited
+        delay = RETRY_POLICY.delay(self.method, self.retries, response, error, self.replayable, self.max_retries)
+        if delay is not None:
+            self.retries += 1
+        return delay
+
+    def result(self) -> dict:
+        try:
+            if self.error is not None:
+                raise self.error
+            if self.entry is not None and self.response.status_code == 304:
+                RESPONSE_CACHE.refresh(self.entry, self.ttl)
+                return _with_meta(_cached_result(self.entry, "revalidated"), self.retries, self.queued)
+            self.response.raise_for_status()
+            if self.key is not None:
+                RESPONSE_CACHE.store(self.key, self.response.status_code, self.response.content,
+                                     self.response.headers, self.ttl, self.generation)
+            return _with_meta(_response_result(self.response), self.retries, self.queued)
+        except Exception as e:
+            return _with_meta(_error_result(e), self.retries, self.queued)
+        finally:
+            if self.method != 'get':
+                RESPONSE_CACHE.invalidate(self.path)
+
 def request(path: str, method: str = 'get', data: dict = None, params: dict = None,
             content_type: str = 'application/json', content: bytes = None) -> dict:
-    headers = {'X-Redmine-API-Key': REDMINE_API_KEY, 'Content-Type': content_type}
-    url = urljoin(REDMINE_URL, path.lstrip('/'))
+    method = method.lower()
+    exchange = _Exchange(path, method, params, content_type)
+    cached = exchange.start()
+    if cached is not None:
+        return cached
+    try:
+        while True:
+            with outbound_slot() as waited, exchange.span(waited) as current:
+                start = time.perf_counter()
+                try:
+                    response, error = get_client().request(method=method, url=exchange.url, json=data, params=params,
+                                                           headers=exchange.headers, content=content,
+                                                           timeout=REDMINE_TIMEOUT), None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                _observe_upstream(method, exchange.template, start, response, current=current)
+            delay = exchange.attempted(response, error, waited)
+            if delay is None:
+                break
+            time.sleep(delay)
+    except Exception as e:
+        exchange.error = e
+    return exchange.result()
+
+async def arequest(path: str, method: str = 'get', data: dict = None, params: dict = None,
+                   content_type: str = 'application/json', content=None, headers: dict = None,
+                   max_retries: int = None) -> dict:
+    """Async twin of request(), sharing one pooled httpx.AsyncClient between concurrent tool calls.
 
+    content may be bytes or an async iterator of bytes, which is streamed to Redmine without being buffered.
+    Identical GETs running at the same time share one upstream call. A GET issued after a write does not join
+    a call that started before it. max_retries overrides REDMINE_RETRIES for this request; only idempotent methods
+    are ever retried.
+    """
+    method = method.lower()
+    if method != 'get' or headers:
+        return await _arequest(path, method, data, params, content_type, content, headers, max_retries)
+    key = (*RESPONSE_CACHE.key(path, params, REDMINE_API_KEY), RESPONSE_CACHE.generation)
+    return await SINGLE_FLIGHT.do(key, lambda: _arequest(path, method, data, params, content_type, content,
+                                                         max_retries=max_retries))
+
+async def _arequest(path: str, method: str, data: dict, params: dict, content_type: str, content=None,
+                    headers: dict = None, max_retries: int = None) -> dict:
+    # A streamed body is consumed by the first attempt and can't be sent again.
+    replayable = content is None or isinstance(content, (bytes, str))
+    exchange = _Exchange(path, method, params, content_type, headers, replayable, max_retries)
+    cached = exchange.start()
+    if cached is not None:
+        return cached
     try:
-        response = httpx.request(method=method.lower(), url=url, json=data, params=params, headers=headers,
-                                 content=content, timeout=60.0)
-        response.raise_for_status()
+        while True:
+            async with aoutbound_slot() as waited:
+                with exchange.span(waited) as current:
+                    start = time.perf_counter()
+                    try:
+                        response, error = await get_async_client().request(method=method, url=exchange.url,
+                                                                           json=data, params=params,
+                                                                           headers=exchange.headers,
+                                                                           content=content,
+                                                                           timeout=REDMINE_TIMEOUT), None
+                    except httpx.TransportError as e:
+                        response, error = None, e
+                    _observe_upstream(method, exchange.template, start, response, current=current)
+            delay = exchange.attempted(response, error, waited)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+    except Exception as e:
+        exchange.error = e
+    return exchange.result()
+
+async def file_chunks(path: pathlib.Path, chunk_size: int = REDMINE_UPLOAD_CHUNK_SIZE):
+    """Yield a file's content in chunks, reading in a worker thread so the event loop is never blocked."""
+    async with await anyio.open_file(path, 'rb') as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
 
-        body = None
-        if response.content:
+def transfer_meta(size: int, elapsed: float) -> dict:
+    return {"bytes": size, "elapsed_seconds": round(elapsed, 3),
+            "bytes_per_second": int(size / elapsed) if elapsed > 0 else None}
+
+def content_size(response: httpx.Response, offset: int = 0) -> int:
+    """Full size of the file behind a download response, or None when the headers don't say."""
+    content_range = response.headers.get('content-range', '')
+    total = content_range.rpartition('/')[2]
+    if total.isdigit():
+        return int(total)
+    length = response.headers.get('content-length', '')
+    return offset + int(length) if length.isdigit() else None
+
+async def adownload(path: str, target: pathlib.Path, expected_size: int = None,
+                    attempts: int = REDMINE_DOWNLOAD_ATTEMPTS, template: str = None) -> dict:
+    """Stream a Redmine file to target, holding no more than one chunk of it in memory.
+
+    The body goes to a .part file next to target that is renamed into place once complete, so target never
+    holds a partial download. A .part file left by an interrupted transfer, in this call or an earlier one, is
+    resumed with a Range request. The final size is checked against expected_size, or against the size the
+    response headers announce when it is not given. template labels the transfer in the metrics. Returns the file
+    size and transfer statistics.
+    """
+    url = urljoin(REDMINE_URL, path.lstrip('/'))
+    # Named after the source so that a partial download of one file is never resumed as another.
+    part = target.with_name(f"{target.name}.{hashlib.sha256(url.encode()).hexdigest()[:8]}.part")
+    template = template or route_template(path)
+    start = time.perf_counter()
+    transferred = 0
+    resumed_from = 0
+
+    for attempt in range(attempts):
+        offset = part.stat().st_size if part.exists() else 0
+        if expected_size is not None and offset > expected_size:
+            offset = 0
+        headers = {'X-Redmine-API-Key': REDMINE_API_KEY}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+        response, received, attempt_start = None, 0, time.perf_counter()
+        with _http_span('get', template, attempt, 0) as current:
             try:
-                body = response.json()
-            except ValueError:
-                body = response.content
+                async with aoutbound_slot(), get_async_client().stream('GET', url, headers=headers,
+                                                                       timeout=REDMINE_TIMEOUT) as response:
+                    if response.status_code == 416 and offset and offset == content_size(response):
+                        expected_size = offset  # the previous attempt had already received everything
+                        break
+                    if response.status_code >= 400:
+                        await response.aread()
+                        response.raise_for_status()
+                    if response.status_code != 206:
+                        offset = 0  # no Range sent, or the server ignored it
+                    resumed_from = resumed_from or offset
+                    if expected_size is None:
+                        expected_size = content_size(response, offset)
+                    # Chunks are written as they arrive off the socket rather than regrouped, so that everything
+                    # received before a dropped connection is on disk for the next attempt to resume from.
+                    async with await anyio.open_file(part, 'ab' if offset else 'wb') as f:
+                        async for chunk in response.aiter_bytes():
+                            await f.write(chunk)
+                            received += len(chunk)
+                break
+            except httpx.TransportError:
+                if attempt == attempts - 1:
+                    raise
+            finally:
+                transferred += received
+                _observe_upstream('get', template, attempt_start, response, received, current)
 
-        return {"status_code": response.status_code, "body": body, "error": ""}
-    except Exception as e:
-        try:
-            status_code = e.response.status_code
-        except:
-            status_code = 0
+    size = part.stat().st_size if part.exists() else 0
+    if expected_size is not None and size != expected_size:
+        part.unlink(missing_ok=True)
+        raise ValueError(f"Downloaded {size} bytes but the attachment is {expected_size} bytes")
+    os.replace(part, target)
+    return {"size": size, "resumed_from": resumed_from, **transfer_meta(transferred, time.perf_counter() - start)}
+
+DOWNLOAD_TEMPLATE = "/attachments/download/{id}/{filename}"
+
+def download_path(attachment_id: int, filename: str) -> str:
+    # Filenames may contain '#', '?' or '/', which must not be read as part of the URL structure.
+    return f"attachments/download/{attachment_id}/{quote(filename, safe='')}"
+
+def file_sha256(path: pathlib.Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def collection_key(body) -> str:
+    """Return the key holding the item list of a Redmine collection response, e.g. 'issues'."""
+    if isinstance(body, dict) and "total_count" in body:
+        for key, value in body.items():
+            if isinstance(value, list):
+                return key
+    return None
+
+async def aiter_pages(path: str, params: dict = None, concurrency: int = REDMINE_FETCH_ALL_CONCURRENCY):
+    """Yield (offset, result) for every page of a Redmine collection endpoint.
+
+    The first page is fetched alone to learn total_count and the page size Redmine actually applies. The
+    remaining pages are fetched with at most `concurrency` requests in flight and yielded as they complete,
+    so a consumer that processes pages one by one holds no more than `concurrency` pages in memory.
+    """
+    params = dict(params or {})
+    start = int(params.pop('offset', 0) or 0)
+    params['limit'] = REDMINE_PAGE_LIMIT
+
+    first = await arequest(path, method='get', params={**params, 'offset': start})
+    yield start, first
+    if first["error"] or collection_key(first["body"]) is None:
+        return
+
+    total = int(first["body"]["total_count"])
+    limit = int(first["body"].get("limit") or REDMINE_PAGE_LIMIT)
+    offsets = iter(range(start + limit, total, limit))
+    pending = set()
+
+    async def fetch(offset):
+        return offset, await arequest(path, method='get', params={**params, 'offset': offset, 'limit': limit})
+
+    def schedule():
+        while len(pending) < max(1, concurrency):
+            offset = next(offsets, None)
+            if offset is None:
+                return
+            pending.add(asyncio.ensure_future(fetch(offset)))
+
+    schedule()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            schedule()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+def page_count(result: dict) -> int:
+    """Number of pages a collection read will take, judged from its first page."""
+    body = result["body"]
+    limit = int(body.get("limit") or REDMINE_PAGE_LIMIT)
+    remaining = max(0, int(body["total_count"]) - int(body.get("offset") or 0))
+    return max(1, -(-remaining // limit))
+
+async def afetch_all(path: str, params: dict = None, ctx: Context = None,
+                     max_items: int = REDMINE_FETCH_ALL_MAX_ITEMS, max_bytes: int = REDMINE_FETCH_ALL_MAX_BYTES) -> dict:
+    """Read every page of a collection endpoint and merge them into one response.
 
+    Stops early, with meta.truncated set, once max_items items or roughly max_bytes of JSON have been collected.
+    Sends a progress notification per page when the client asked for progress.
+    """
+    pages, key, first, total_pages = {}, None, None, 1
+    size = 0
+    truncated = ""
+    # Pages complete out of order; `ready` counts the items in the gap-free run of pages from the first one.
+    ready, next_offset = 0, None
+
+    async with contextlib.aclosing(aiter_pages(path, params)) as page_iter:
+        async for offset, result in page_iter:
+            if result["error"]:
+                result["meta"] = {"pages_fetched": len(pages), "items_fetched": sum(map(len, pages.values()))}
+                return result
+            if first is None:
+                first, key, next_offset = result, collection_key(result["body"]), offset
+                if key is None:
+                    return result
+                total_pages = page_count(result)
+
+            page = result["body"][key]
+            size += len(json.dumps(page, ensure_ascii=False))
+            pages[offset] = page
+            while next_offset in pages:
+                ready += len(pages[next_offset])
+                next_offset += len(pages[next_offset]) or 1
+            if ctx is not None:
+                await ctx.report_progress(len(pages), total_pages)
+
+            if ready >= max_items:
+                truncated = f"max_items ({max_items}) reached"
+            elif size >= max_bytes:
+                truncated = f"max_bytes ({max_bytes}) reached"
+            if truncated:
+                break
+
+    merged = [item for offset in sorted(pages) if offset < next_offset for item in pages[offset]][:max_items]
+    body = dict(first["body"])
+    body[key] = merged
+    body["limit"] = len(merged)
+    meta = {"pages_fetched": len(pages), "pages_total": total_pages, "items": len(merged), "truncated": bool(truncated)}
+    if truncated:
+        meta["truncated_reason"] = truncated
+
+    return {"status_code": first["status_code"], "body": body, "error": "", "meta": meta}
+
+async def open_cursor(path: str, params: dict = None, ctx: Context = None) -> dict:
+    """Read every page of a collection into RESULT_STORE as a snapshot and return its first slice.
+
+    Errors and responses that are not collections are returned as they are, without a cursor.
+    """
+    result = await afetch_all(path, params=params, ctx=ctx)
+    key = collection_key(result["body"]) if not result["error"] else None
+    if key is None:
+        return result
+    taken_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    snapshot = {**result, "meta": {**result["meta"], "snapshot": {"list": key, "taken_at": taken_at}}}
+    cursor = RESULT_STORE.put(snapshot, len(SERIALIZERS["json"](snapshot)))
+    return cursor_page(snapshot, cursor, 0, int((params or {}).get("limit") or REDMINE_CURSOR_PAGE_SIZE))
+
+def cursor_page(snapshot: dict, cursor: str, offset: int, limit: int) -> dict:
+    """Items offset to offset + limit of a snapshot, with meta.cursor saying where the next slice starts."""
+    key = snapshot["meta"]["snapshot"]["list"]
+    page = slice_result(snapshot, (key,), offset, limit)
+    total, returned = len(snapshot["body"][key]), len(page["body"][key])
+    page["body"].update({name: value for name, value in (("offset", offset), ("limit", limit))
+                         if name in page["body"]})
+    page["meta"] = {**snapshot["meta"], "cursor": {
+        "id": cursor, "offset": offset, "returned": returned, "total": total,
+        "next_offset": offset + returned if offset + returned < total else None}}
+    if cursor is None:
+        page["meta"]["cursor"]["note"] = "Not kept, the result is larger than REDMINE_RESULT_STORE_MAX_BYTES"
+    return page
+
+async def sync_issues(store: SqliteStore, store_page, reconcile_every: float, reconcile: bool = None,
+                      **meta) -> dict:
+    """Bring a store's issues up to date with the ones updated since its watermark, or all issues on the first run.
+
+    store_page(issues, reconciling) is awaited with each page read and returns the number of issues it stored.
+    Issues deleted in Redmine, or no longer visible to its API key, never appear in a delta. A reconcile re-reads
+    every issue, repairing anything a delta missed, and drops the others from the store. It runs every
+    reconcile_every seconds, or right away when the number of issues Redmine reports differs from the store's
+    count, which after a delta can only mean deletions. meta is saved with the store's own sync metadata.
+    """
+    watermark = await anyio.to_thread.run_sync(store.get_meta, "watermark")
+    params = {"status_id": "*", "sort": "updated_on"}
+    if watermark:
+        params["updated_on"] = f">={watermark}"
+    # The first sync reads every issue, which is as good as a reconcile: collect the ids on the way.
+    ids = None if watermark else set()
+    newest, updated = await _read_issues(params, store_page, False, ids)
+
+    if reconcile is None and watermark:
+        reconciled_at = float(await anyio.to_thread.run_sync(store.get_meta, "reconciled_at", 0))
+        reconcile = time.time() - reconciled_at > reconcile_every
+        if not reconcile:
+            remote = await arequest('/issues.json', 'get', params={"status_id": "*", "limit": 1})
+            local = await anyio.to_thread.run_sync(store.count, "issues")
+            reconcile = not remote["error"] and remote["body"]["total_count"] != local
+    if reconcile and ids is None:
+        ids = set()
+        reconciled_newest, _ = await _read_issues({"status_id": "*", "sort": "updated_on"}, store_page, True, ids)
+        newest = max(newest or "", reconciled_newest or "") or None
+    reconciled = ids is not None
+    deleted = await anyio.to_thread.run_sync(store.delete_missing, "issues", ids) if reconciled else 0
+
+    # Issues edited while the pages were read can shift between pages, so the watermark only moves once the
+    # whole delta went through, and the next sync re-reads from the same timestamp (>=, not >).
+    values = {"synced_at": time.time(), **meta}
+    if newest:
+        values["watermark"] = newest
+    if reconciled:
+        values["reconciled_at"] = values["synced_at"]
+    await anyio.to_thread.run_sync(lambda: store.set_meta(**values))
+    return {"updated": updated, "deleted": deleted, "reconciled": reconciled}
+
+async def _read_issues(params: dict, store_page, reconciling: bool, ids: set = None) -> tuple:
+    """Hand every issue matching params to store_page() page by page. Returns (newest updated_on, count)."""
+    newest, count = None, 0
+    async with contextlib.aclosing(aiter_pages('/issues.json', params)) as page_iter:
+        async for _, result in page_iter:
+            if result["error"]:
+                raise RuntimeError(f"Could not read issues: {result['error']}")
+            issues = result["body"]["issues"]
+            count += await store_page(issues, reconciling)
+            newest = max([newest or "", *(issue.get("updated_on") or "" for issue in issues)]) or None
+            if ids is not None:
+                ids.update(issue["id"] for issue in issues)
+    return newest, count
+
+async def sync_search_index(index: IssueIndex, reconcile: bool = None) -> dict:
+    """Bring the index up to date with sync_issues(), reconciling every REDMINE_SEARCH_INDEX_RECONCILE seconds."""
+    start = time.perf_counter()
+    statuses = await arequest('/issue_statuses.json', 'get')  # served from the response cache most of the time
+    if statuses["error"]:
+        raise RuntimeError(f"Could not read issue statuses: {statuses['error']}")
+    closed = {status["id"] for status in statuses["body"]["issue_statuses"] if status.get("is_closed")}
+    semaphore = asyncio.Semaphore(REDMINE_FETCH_ALL_CONCURRENCY)
+
+    async def with_journals(issue):
+        # /issues.json can't include journals, so comments need one request per changed issue.
+        async with semaphore:
+            result = await arequest(f"issues/{issue['id']}.json", "get", params={"include": "journals"})
+        return result["body"]["issue"] if not result["error"] else issue
+
+    async def store_page(issues, reconciling):
+        # A reconcile re-reads unchanged issues, whose comments are still indexed; upsert() keeps them.
+        if REDMINE_SEARCH_INDEX_JOURNALS and not reconciling:
+            issues = await asyncio.gather(*(with_journals(issue) for issue in issues))
+        return await anyio.to_thread.run_sync(index.upsert, issues, closed)
+
+    stats = await sync_issues(index, store_page, REDMINE_SEARCH_INDEX_RECONCILE, reconcile)
+    return {"issues_updated": stats["updated"], "issues_deleted": stats["deleted"], "reconciled": stats["reconciled"],
+            "seconds": round(time.perf_counter() - start, 3)}
+
+_search_index_sync = None
+
+def refresh_search_index(index: IssueIndex) -> asyncio.Task:
+    """Start a background sync of the index unless one is already running, and return its task."""
+    global _search_index_sync
+    if _search_index_sync is None or _search_index_sync.done():
+        _search_index_sync = asyncio.create_task(sync_search_index(index))
+        _search_index_sync.add_done_callback(_log_search_index_sync)
+    return _search_index_sync
+
+def _log_search_index_sync(task: asyncio.Task):
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        get_logger(__name__).warning(f"Search index sync failed: {task.exception()}")
+    else:
+        get_logger(__name__).info(f"Search index synced: {task.result()}")
+
+# Reference data mirrored in full on every sync: small, and deletions show up as missing rows.
+MIRROR_COLLECTIONS = (
+    ("trackers", "/trackers.json", None),
+    ("issue_statuses", "/issue_statuses.json", None),
+    ("projects", "/projects.json", None),
+    ("users", "/users.json", {"status": ""}),  # every status, not only active users
+)
+
+async def sync_mirror(mirror: Mirror, reconcile: bool = None) -> dict:
+    """One sync pass: reference collections in full, then issues through sync_issues(), reconciling every
+    REDMINE_MIRROR_RECONCILE seconds."""
+    start = time.perf_counter()
+    stats, errors = {}, []
+
+    for table, path, params in MIRROR_COLLECTIONS:
+        result = await afetch_all(path, params=params, max_items=sys.maxsize, max_bytes=sys.maxsize)
+        if result["error"]:
+            # e.g. /users.json needs an administrator's API key; keep what we have and sync the rest.
+            errors.append(f"{path}: {result['error']}")
+            continue
+        objects = result["body"][collection_key(result["body"]) or table]
+        deleted = await anyio.to_thread.run_sync(mirror.replace, table, objects)
+        stats[table] = {"rows": len(objects), "deleted": deleted}
+
+    async def store_page(issues, reconciling):
+        return await anyio.to_thread.run_sync(mirror.upsert, "issues", issues)
+
+    stats["issues"] = await sync_issues(mirror, store_page, REDMINE_MIRROR_RECONCILE, reconcile,
+                                        last_error="; ".join(errors))
+    return {**stats, "errors": errors, "seconds": round(time.perf_counter() - start, 3)}
+
+async def mirror_sync_loop(mirror: Mirror, interval: float = REDMINE_MIRROR_INTERVAL):
+    """Keep the mirror in sync until cancelled."""
+    while True:
         try:
-            body = e.response.json()
-        except:
-            try:
-                body = e.response.text
-            except:
-                body = None
+            get_logger(__name__).info(f"Mirror synced: {await sync_mirror(mirror)}")
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}"
+            get_logger(__name__).warning(f"Mirror sync failed: {error}")
+            await anyio.to_thread.run_sync(lambda: mirror.set_meta(last_error=error))
+        await asyncio.sleep(interval)
+
+@contextlib.asynccontextmanager
+async def background_tasks():
+    """Run the server's background work, if any is configured, for the duration of the block."""
+    tasks = []
+    if MIRROR is not None:
+        tasks.append(asyncio.create_task(mirror_sync_loop(MIRROR)))
+    try:
+        yield tasks
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+@REGISTRY.register_collector
+def collect_metrics() -> list:
+    """Counters and gauges kept by the cache, request coalescing, retries, the rate limiter and the result store,
+    for /metrics."""
+    cache, flight, retries, governor = (RESPONSE_CACHE.stats(), SINGLE_FLIGHT.stats(), RETRY_POLICY.stats(),
+                                        GOVERNOR.stats())
+    store = RESULT_STORE.stats()
+    return [
+        ("mcp_redmine_cache_lookups_total", "counter", "Response cache lookups by result.",
+         [({"result": result}, cache[result]) for result in ("hits", "misses", "revalidated")]),
+        ("mcp_redmine_cache_hit_ratio", "gauge", "Share of cacheable GETs answered from the cache.",
+         [({}, cache["hit_ratio"])]),
+        ("mcp_redmine_cache_bytes", "gauge", "Size of the cached responses.", [({}, cache["bytes"])]),
+        ("mcp_redmine_cache_evictions_total", "counter", "Cache entries evicted to stay under max_bytes.",
+         [({}, cache["evictions"])]),
+        ("mcp_redmine_coalesced_requests_total", "counter", "GETs that joined an identical one in flight.",
+         [({}, flight["collapsed"])]),
+        ("mcp_redmine_retries_total", "counter", "Requests to Redmine retried after a transient failure.",
+         [({}, retries["retries"])]),
+        ("mcp_redmine_retry_budget", "gauge", "Retries the retry budget still allows.", [({}, retries["budget"])]),
+        ("mcp_redmine_outbound_in_flight", "gauge", "Requests to Redmine in flight.",
+         [({}, governor["in_flight"])]),
+        ("mcp_redmine_outbound_queued", "gauge", "Requests waiting for the rate limit or a free slot.",
+         [({}, governor["queued"])]),
+        ("mcp_redmine_outbound_queued_seconds_total", "counter", "Time requests spent waiting to be sent.",
+         [({}, governor["queued_seconds"])]),
+        ("mcp_redmine_result_store_entries", "gauge", "Cursor snapshots and cut down results kept.",
+         [({}, store["entries"])]),
+        ("mcp_redmine_result_store_bytes", "gauge", "Approximate size of the results kept.", [({}, store["size"])]),
+        ("mcp_redmine_result_store_max_bytes", "gauge", "Memory budget of the result store.",
+         [({}, store["max_bytes"])]),
+        ("mcp_redmine_result_store_lookups_total", "counter", "Cursor and continuation lookups by result.",
+         [({"result": result}, store[result]) for result in ("hits", "misses")]),
+        ("mcp_redmine_result_store_evictions_total", "counter", "Results dropped to stay under the memory budget.",
+         [({}, store["evictions"])]),
+    ]
+
+# Built once at startup; rebuilt only if SPEC is replaced (tests patch it).
+_spec_index = SpecIndex(SPEC)
+
+def spec_index() -> SpecIndex:
+    global _spec_index
+    if _spec_index.spec is not SPEC:
+        _spec_index = SpecIndex(SPEC)
+    return _spec_index
+
+def route_template(path: str) -> str:
+    """Metrics and tracing label for path: its template in the spec, e.g. '/issues/{issueId}.json', or a
+    generic one for paths the spec does not describe."""
+    found = spec_index().router.match(path)
+    return found[0] if found is not None else path_template(path)
 
-        return {"status_code": status_code, "body": body, "error": f"{e.__class__.__name__}: {e}"}
-        
 def yd(obj):
-    # Allow direct Unicode output, prevent line wrapping for long lines, and avoid automatic key sorting.
-    return yaml.safe_dump(obj, allow_unicode=True, sort_keys=False, width=4096)
+    if isinstance(obj, dict) and obj.get("error"):
+        tool_failed()
+    if not tracing.enabled():
+        return _serialize(obj)
+    with tracing.span("serialize", {"mcp.output.format": REDMINE_OUTPUT_FORMAT}) as current:
+        text = _serialize(obj)
+        current.set_attribute("mcp.output.size", len(text))
+        return text
+
+def _serialize(obj):
+    dump = SERIALIZERS[REDMINE_OUTPUT_FORMAT]
+    text = dump(obj)
+    # Only results of the {status_code, body, error} shape are cut down, as only those say so in their meta.
+    if not OUTPUT_BUDGET.fits(text) and isinstance(obj, dict) and "body" in obj:
+        text = OUTPUT_BUDGET.render(obj, dump, size=len(text))
+    return text
 
 
 # Tools
@@ -78,11 +920,18 @@ mcp = FastMCP(
         "httpx>=0.28.1",
         "mcp[cli]>=1.3.0",
         "openapi-core>=0.19.4",
+        "openapi-schema-validator>=0.6.0",
         "pyyaml>=6.0.2",
     ],
     transport="sse"
 )
 get_logger(__name__).info(f"Starting MCP Redmine version {VERSION}")
+if SPEC_LOAD_INFO["source"] == "compiled":
+    get_logger(__name__).info(f"Loaded compiled OpenAPI spec in {SPEC_LOAD_INFO['seconds'] * 1000:.1f} ms")
+else:
+    get_logger(__name__).warning(f"Compiled OpenAPI spec is {SPEC_LOAD_INFO['reason']}, parsed YAML in "
+                                 f"{SPEC_LOAD_INFO['seconds'] * 1000:.1f} ms. Run 'python -m "
+                                 f"mcp_redmine.convert_schema --compile' to rebuild it")
 
 @mcp.tool(description="""
 Make a request to the Redmine API
@@ -92,17 +941,57 @@ Args:
     method: HTTP method to use (default: 'get')
     data: Dictionary for request body (for POST/PUT)
     params: Dictionary for query parameters
+    fetch_all: For GET on collection endpoints (e.g. '/issues.json', '/users.json'), fetch every page and
+        return them merged into one body. offset/limit are handled by the server. (default: False)
+    fields: Only return these fields of the body, as dotted paths relative to the returned items, e.g.
+        ['id', 'subject', 'status.name', 'journals.notes'] for '/issues.json' or '/issues/1.json'. Much
+        shorter results for large responses. Pagination values such as total_count are always kept
+    exclude: Leave these fields out of the body, same syntax as fields, e.g. ['description', 'journals.details']
+    cursor: For GET on collection endpoints, read every page like fetch_all but keep the result on the
+        server and return only the first params['limit'] items (default 25) with a cursor id in meta.cursor.
+        Use redmine_cursor to read further slices of the same snapshot without querying Redmine again.
+        (default: False)
+    check_spec: Check path, params and data against the OpenAPI spec first. A body that doesn't match is
+        not sent and its problems are returned in meta.validation.errors. Path and query parameters the spec
+        doesn't describe the way Redmine accepts them (e.g. 'current' as a user id, a project identifier as
+        project_id) are sent anyway and reported in meta.validation.warnings. Paths the spec does not describe
+        are sent unchecked. (default: the server's REDMINE_VALIDATE_REQUESTS setting)
 
 Returns:
-    str: YAML string containing response status code, body and error message
+    str: YAML string containing response status code, body and error message. With fetch_all a meta
+        section reports pages fetched and whether the result was truncated by the server's size caps.
 
 {}""".format(REDMINE_REQUEST_INSTRUCTIONS).strip())
     
-def redmine_request(path: str, method: str = 'get', data: dict = None, params: dict = None) -> str:
-    return yd(request(path, method=method, data=data, params=params))
+@instrumented
+async def redmine_request(path: str, method: str = 'get', data: dict = None, params: dict = None,
+                          fetch_all: bool = False, fields: list[str] = None, exclude: list[str] = None,
+                          cursor: bool = False, check_spec: bool = None, ctx: Context = None) -> str:
+    warnings = []
+    if REDMINE_VALIDATE_REQUESTS if check_spec is None else check_spec:
+        status, errors, warnings = spec_index().validate(method, path, params, data)
+        if status == "invalid":
+            return yd({"status_code": 0, "body": None, "error": "Request does not match the API spec: " +
+                       "; ".join(errors), "meta": {"validation": {"errors": errors, "warnings": warnings}}})
+    if cursor:
+        if method.lower() != 'get':
+            return yd({"status_code": 0, "body": None, "error": "cursor is only supported for GET requests"})
+        result = await open_cursor(path, params=params, ctx=ctx)
+    elif fetch_all:
+        if method.lower() != 'get':
+            return yd({"status_code": 0, "body": None, "error": "fetch_all is only supported for GET requests"})
+        result = await afetch_all(path, params=params, ctx=ctx)
+    else:
+        result = await arequest(path, method=method, data=data, params=params)
+
+    # Pruned before serialisation, so dropped fields cost neither yd() time nor output size.
+    result["body"] = project(result["body"], fields, exclude)
+    if warnings:
+        result["meta"] = {**(result.get("meta") or {}), "validation": {"warnings": warnings}}
+    return yd(result)
 
 @mcp.tool()
-@lru_cache(maxsize=None)
+@instrumented
 def redmine_paths_list() -> str:
     """Return a list of available API paths from OpenAPI spec
     
@@ -112,28 +1001,31 @@ def redmine_paths_list() -> str:
     Returns:
         str: YAML string containing a list of path templates (e.g. '/issues.json')
     """
-    return yd(list(SPEC['paths'].keys()))
+    return yd(spec_index().paths)
 
 @mcp.tool()
-@lru_cache(maxsize=None)
-def redmine_paths_info(path_templates: list) -> str:
+@instrumented
+def redmine_paths_info(path_templates: list, resolve_refs: bool = False) -> str:
     """Get full path information for given path templates
     
     Args:
         path_templates: List of path templates (e.g. ['/issues.json', '/projects.json'])
+        resolve_refs: Replace the $ref pointers to shared schemas (e.g. '#/components/schemas/Issue') with the
+            schemas themselves, so the answer is complete on its own. Larger output.
         
     Returns:
         str: YAML string containing API specifications for the requested paths
     """
-    info = {}
-    for path in path_templates:
-        if path in SPEC['paths']:
-            info[path] = SPEC['paths'][path]
-
-    return yd(info)
+    index = spec_index()
+    dump = SERIALIZERS[REDMINE_OUTPUT_FORMAT]
+    # The fragments are serialised once per path and reused, so a lookup only joins strings.
+    fragments = [index.fragment(path, resolve_refs, dump) for path in dict.fromkeys(path_templates)
+                 if path in index.items]
+    return join_mappings(REDMINE_OUTPUT_FORMAT, fragments)
 
 @mcp.tool()
-def redmine_upload(file_path: str, description: str = None) -> str:
+@instrumented
+async def redmine_upload(file_path: str, description: str = None) -> str:
     """
     Upload a file to Redmine and get a token for attachment
     
@@ -143,28 +1035,36 @@ def redmine_upload(file_path: str, description: str = None) -> str:
         
     Returns:
         str: YAML string containing response status code, body and error message
-             The body contains the attachment token
+             The body contains the attachment token, meta the bytes sent, elapsed time and throughput
     """
     try:
         path = pathlib.Path(file_path).expanduser()
         assert path.is_absolute(), f"Path must be fully qualified, got: {file_path}"
         assert path.exists(), f"File does not exist: {file_path}"
 
+        size = path.stat().st_size
+        assert not REDMINE_UPLOAD_MAX_SIZE or size <= REDMINE_UPLOAD_MAX_SIZE, \
+            f"File is {size} bytes, larger than the {REDMINE_UPLOAD_MAX_SIZE} bytes allowed by REDMINE_UPLOAD_MAX_SIZE"
+
         params = {'filename': path.name}
         if description:
             params['description'] = description
 
-        with open(path, 'rb') as f:
-            file_content = f.read()
-
-        result = request(path='uploads.json', method='post', params=params,
-                         content_type='application/octet-stream', content=file_content)
+        # The file is streamed in REDMINE_UPLOAD_CHUNK_SIZE pieces, so memory use does not grow with its size.
+        # An explicit Content-Length avoids chunked transfer encoding, which not every Redmine front end accepts.
+        start = time.perf_counter()
+        result = await arequest(path='uploads.json', method='post', params=params,
+                                content_type='application/octet-stream',
+                                content=file_chunks(path, REDMINE_UPLOAD_CHUNK_SIZE),
+                                headers={'Content-Length': str(size)})
+        result["meta"] = {**result.get("meta", {}), **transfer_meta(size, time.perf_counter() - start)}
         return yd(result)
     except Exception as e:
         return yd({"status_code": 0, "body": None, "error": f"{e.__class__.__name__}: {e}"})
 
 @mcp.tool()
-def redmine_download(attachment_id: int, save_path: str, filename: str = None) -> str:
+@instrumented
+async def redmine_download(attachment_id: int, save_path: str, filename: str = None) -> str:
     """
     Download an attachment from Redmine and save it to a local file
     
@@ -175,34 +1075,129 @@ def redmine_download(attachment_id: int, save_path: str, filename: str = None) -
                  will be determined from attachment data or URL
         
     Returns:
-        str: YAML string containing download status, file path, and any error messages
+        str: YAML string containing download status, file path, and any error messages. The meta section
+             reports bytes transferred, throughput and the offset an interrupted download was resumed from
     """
     try:
         path = pathlib.Path(save_path).expanduser()
         assert path.is_absolute(), f"Path must be fully qualified, got: {save_path}"
         assert not path.is_dir(), f"Path can't be a directory, got: {save_path}"
 
+        filesize = None
         if not filename:
-            attachment_response = request(f"attachments/{attachment_id}.json", "get")
+            attachment_response = await arequest(f"attachments/{attachment_id}.json", "get")
             if attachment_response["status_code"] != 200:
                 return yd(attachment_response)
 
             filename = attachment_response["body"]["attachment"]["filename"]
+            filesize = attachment_response["body"]["attachment"].get("filesize")
+
+        transfer = await adownload(download_path(attachment_id, filename), path, filesize,
+                                   template=DOWNLOAD_TEMPLATE)
+        size = transfer.pop("size")
+
+        return yd({"status_code": 200, "body": {"saved_to": str(path), "filename": filename, "size": size},
+                   "error": "", "meta": transfer})
+    except httpx.HTTPStatusError as e:
+        return yd(_error_result(e))
+    except Exception as e:
+        return yd({"status_code": 0, "body": None, "error": f"{e.__class__.__name__}: {e}"})
+
+async def attachment_metadata(issue_id: int = None, attachment_ids: list = None) -> tuple:
+    """Return (attachments, failures, error_result) for an issue's attachments or a list of attachment IDs."""
+    if issue_id is not None:
+        response = await arequest(f"issues/{issue_id}.json", "get", params={"include": "attachments"})
+        if response["status_code"] != 200:
+            return [], [], response
+        return response["body"]["issue"].get("attachments", []), [], None
+
+    semaphore = asyncio.Semaphore(REDMINE_DOWNLOAD_CONCURRENCY)
+
+    async def fetch(attachment_id):
+        async with semaphore:
+            return attachment_id, await arequest(f"attachments/{attachment_id}.json", "get")
+
+    attachments, failures = [], []
+    for attachment_id, response in await asyncio.gather(*(fetch(i) for i in dict.fromkeys(attachment_ids))):
+        if response["status_code"] == 200:
+            attachments.append(response["body"]["attachment"])
+        else:
+            failures.append({"id": attachment_id, "error": response["error"]})
+    return attachments, failures, None
+
+@mcp.tool()
+@instrumented
+async def redmine_download_attachments(target_dir: str, issue_id: int = None, attachment_ids: list[int] = None,
+                                       ctx: Context = None) -> str:
+    """
+    Download several attachments in parallel into a directory
+
+    Pass either issue_id to download every attachment of that issue, or attachment_ids. Files are named after the
+    attachment; when two share a name the later ones are prefixed with their attachment ID.
+
+    Args:
+        target_dir: Fully qualified path of the directory to save the files in, created if missing
+        issue_id: ID of the issue whose attachments should be downloaded
+        attachment_ids: IDs of the attachments to download
 
-        response = request(f"attachments/download/{attachment_id}/{filename}", "get",
-                           content_type="application/octet-stream")
-        if response["status_code"] != 200 or not response["body"]:
-            return yd(response)
+    Returns:
+        str: YAML string with a manifest of the saved files (path, size and SHA-256), the attachments that
+             could not be downloaded, and transfer statistics
+    """
+    try:
+        directory = pathlib.Path(target_dir).expanduser()
+        assert directory.is_absolute(), f"Path must be fully qualified, got: {target_dir}"
+        assert (issue_id is None) != (not attachment_ids), "Pass either issue_id or attachment_ids"
+
+        attachments, failures, error_result = await attachment_metadata(issue_id, attachment_ids)
+        if error_result is not None:
+            return yd(error_result)
+        await anyio.to_thread.run_sync(lambda: directory.mkdir(parents=True, exist_ok=True))
 
-        with open(path, 'wb') as f:
-            f.write(response["body"])
+        # The issue payload already has every filename and size, so no per-file metadata request is needed.
+        jobs, taken = [], set()
+        for attachment in attachments:
+            name = pathlib.Path(attachment["filename"]).name  # never let a filename escape target_dir
+            if name in taken:
+                name = f"{attachment['id']}_{name}"
+            taken.add(name)
+            jobs.append((attachment, directory / name))
 
-        return yd({"status_code": 200, "body": {"saved_to": str(path), "filename": filename}, "error": ""})
+        semaphore = asyncio.Semaphore(REDMINE_DOWNLOAD_CONCURRENCY)
+        files, done, transferred = [], 0, 0
+        start = time.perf_counter()
+
+        async def download(attachment, target):
+            nonlocal done, transferred
+            async with semaphore:
+                try:
+                    transfer = await adownload(download_path(attachment["id"], attachment["filename"]), target,
+                                               attachment.get("filesize"), template=DOWNLOAD_TEMPLATE)
+                    sha256 = await anyio.to_thread.run_sync(file_sha256, target)
+                    files.append({"id": attachment["id"], "filename": attachment["filename"],
+                                  "saved_to": str(target), "size": transfer["size"], "sha256": sha256})
+                    transferred += transfer["bytes"]
+                except Exception as e:
+                    failures.append({"id": attachment["id"], "filename": attachment["filename"],
+                                     "error": f"{e.__class__.__name__}: {e}"})
+            done += 1
+            if ctx is not None:
+                await ctx.report_progress(done, len(jobs))
+
+        await asyncio.gather(*(download(attachment, target) for attachment, target in jobs))
+
+        files.sort(key=lambda f: f["id"])
+        failures.sort(key=lambda f: f["id"])
+        error = f"{len(failures)} of {len(files) + len(failures)} attachments failed" if failures else ""
+        meta = {"files": len(files), **transfer_meta(transferred, time.perf_counter() - start)}
+        return yd({"status_code": 200, "body": {"target_dir": str(directory), "files": files, "failures": failures},
+                   "error": error, "meta": meta})
     except Exception as e:
         return yd({"status_code": 0, "body": None, "error": f"{e.__class__.__name__}: {e}"})
 
 @mcp.tool()
-def redmine_search_issues(query: str, project_id: int = None, status_id: str = "open", limit: int = 10) -> str:
+@instrumented
+async def redmine_search_issues(query: str, project_id: int = None, status_id: str = "open", limit: int = 10) -> str:
     """
     Smart search for issues using fuzzy matching on subject and description.
     
@@ -213,8 +1208,25 @@ def redmine_search_issues(query: str, project_id: int = None, status_id: str = "
         limit: Maximum number of results to return (default: 10)
         
     Returns:
-        str: YAML string containing search results
+        str: YAML string containing search results. When the server keeps a local search index, results are
+             ranked by relevance and meta.index says how long ago the index was last synced with Redmine
     """
+    if SEARCH_INDEX is not None:
+        info = await anyio.to_thread.run_sync(SEARCH_INDEX.info)
+        if info["synced_at"] is None or info["age_seconds"] > REDMINE_SEARCH_INDEX_REFRESH:
+            sync = refresh_search_index(SEARCH_INDEX)
+            info["refreshing"] = not sync.done()
+        # Until the first sync completes, searches go to Redmine as they did without an index, and so do
+        # searches the index can't answer, e.g. for a status filter it doesn't understand.
+        if info["synced_at"] is not None:
+            try:
+                hits = await anyio.to_thread.run_sync(SEARCH_INDEX.search, query, project_id, status_id, limit)
+            except Exception as e:
+                get_logger(__name__).warning(f"Search index query failed, asking Redmine instead: {e}")
+            else:
+                return yd({"status_code": 200, "body": {"issues": hits, "total_count": len(hits)}, "error": "",
+                           "meta": {"index": info}})
+
     params = {
         'text_search': query,
         'limit': limit,
@@ -223,177 +1235,312 @@ def redmine_search_issues(query: str, project_id: int = None, status_id: str = "
     if project_id:
         params['project_id'] = project_id
         
-    return yd(request('/issues.json', method='get', params=params))
-
-class HealthCheckHandler(BaseHTTPRequestHandler):
-    """Simple HTTP handler for health checks."""
-    def do_GET(self):
-        if self.path == '/' or self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(b'{"status":"ok","service":"mcp-redmine"}\n')
-        else:
-            self.send_response(404)
-            self.end_headers()
-    
-    def do_HEAD(self):
-        if self.path == '/' or self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-        else:
-            self.send_response(404)
-            self.end_headers()
-    
-    def log_message(self, format, *args):
-        # Suppress HTTP server logs
-        pass
+    return yd(await arequest('/issues.json', method='get', params=params))
+
+@mcp.tool()
+@instrumented
+async def redmine_issue_stats(filters: dict = None, group_by: list[str] = None, aggregates: list[str] = None,
+                              ctx: Context = None) -> str:
+    """
+    Aggregate issues on the server and return only the totals, instead of reading every page of /issues.json
 
-# Global reference to keep the health server alive
-_health_server = None
+    Pages are read concurrently and folded into the totals one at a time, so any number of issues can be
+    aggregated without reading them into the conversation.
 
-def start_health_server(port=8080):
-    """Start a simple HTTP server for health checks in a background thread."""
-    global _health_server
+    Args:
+        filters: Query parameters for /issues.json, e.g. {"project_id": 1, "status_id": "*",
+            "created_on": ">=2024-01-01"}
+        group_by: Fields to group by (default: none, one total row). References such as status, tracker,
+            assigned_to, fixed_version, priority or project group by name; use e.g. assigned_to.id for the ID
+            and cf_<id> for custom fields
+        aggregates: Values to compute per group as function or function:field with function one of count, sum,
+            avg, min, max (default: ["count"]), e.g. ["count", "sum:estimated_hours", "sum:spent_hours",
+            "min:start_date", "max:due_date"]
+
+    Returns:
+        str: YAML string with one row per group, and in meta the number of issues and pages read
+    """
     try:
-        # Explicitly bind to 0.0.0.0 to accept connections from any interface
-        server_address = ('0.0.0.0', port)
-        get_logger(__name__).info(f"Starting health check server on {server_address[0]}:{server_address[1]}")
-        server = HTTPServer(server_address, HealthCheckHandler)
-        _health_server = server  # Keep global reference
-        
-        thread = threading.Thread(target=server.serve_forever, daemon=True)
-        thread.start()
-        
-        # Wait for the server to be ready and verify it's listening
-        max_attempts = 10
-        for attempt in range(max_attempts):
-            time.sleep(0.2)
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('127.0.0.1', port))
-            sock.close()
-            if result == 0:
-                get_logger(__name__).info(f"Health check server is listening on 0.0.0.0:{port}")
-                return server
-            if attempt < max_attempts - 1:
-                get_logger(__name__).debug(f"Waiting for health server to be ready (attempt {attempt + 1}/{max_attempts})")
-        
-        get_logger(__name__).warning(f"Health check server started but verification failed after {max_attempts} attempts")
-        return server
+        aggregator = Aggregator(group_by or [], aggregates or ["count"])
+        params = {key: value for key, value in (filters or {}).items() if key not in ("offset", "limit")}
+        pages, total_pages = 0, 1
+        async with contextlib.aclosing(aiter_pages('/issues.json', params)) as page_iter:
+            async for _, result in page_iter:
+                if result["error"]:
+                    return yd(result)
+                if pages == 0:
+                    total_pages = page_count(result)
+                aggregator.add(result["body"]["issues"])
+                pages += 1
+                if ctx is not None:
+                    await ctx.report_progress(pages, total_pages)
+
+        return yd({"status_code": 200, "body": {"rows": aggregator.rows()}, "error": "",
+                   "meta": {"issues": aggregator.items, "groups": len(aggregator.groups), "pages_fetched": pages}})
     except Exception as e:
-        get_logger(__name__).error(f"Failed to start health check server: {e}", exc_info=True)
-        _health_server = None
-        return None
+        return yd({"status_code": 0, "body": None, "error": f"{e.__class__.__name__}: {e}"})
 
-# Add necessary imports for custom SSE run with CORS
-from starlette.applications import Starlette
-from starlette.middleware import Middleware
-from starlette.middleware.cors import CORSMiddleware
-from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
-from starlette.routing import Mount, Route
-from mcp.server.sse import SseServerTransport
-import uvicorn
-import mcp.server.stdio
-
-class ASGIInstance(Response):
-    def __init__(self, app):
-        self.app = app
-    
-    async def __call__(self, scope, receive, send):
-        await self.app(scope, receive, send)
-
-async def run_sse_with_cors(mcp_instance, host, port):
-    """Custom run loop to enable CORS for the SSE server"""
-    # Create the SSE transport - Use /sse to match client behavior
-    sse = SseServerTransport("/sse")
-
-    async def dispatch_sse(request):
-        # Log headers for debugging auth
-        get_logger(__name__).info(f"Incoming {request.method} request to {request.url.path}")
-        get_logger(__name__).info(f"Headers: {dict(request.headers)}")
-        
-        if request.method == "POST":
-            # Wrap the ASGI app in a Response compatible object
-            return ASGIInstance(sse.handle_post_message)
-        elif request.method == "GET":
-            # Connect SSE stream and run request loop
-            async with sse.connect_sse(
-                request.scope, request.receive, request._send
-            ) as streams:
-                await mcp_instance._mcp_server.run(
-                    streams[0],
-                    streams[1],
-                    mcp_instance._mcp_server.create_initialization_options(),
-                )
-            # When run finishes (connection closed), we return None, which Starlette handles as response done
-            return None
-        else:
-            return JSONResponse({"error": "Method not allowed"}, status_code=405)
-
-    async def handle_root(request):
-        return JSONResponse({"status": "online", "service": "mcp-redmine", "mode": "sse"})
-
-    async def handle_health(request):
-        return JSONResponse({"status": "ok"})
-
-    # Configure CORS middleware
-    middleware = [
-        Middleware(
-            CORSMiddleware,
-            allow_origins=["*"],  # Allow all origins for Connector
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
-    ]
+@mcp.tool()
+@instrumented
+async def redmine_batch(operations: list[dict], dry_run: bool = False, concurrency: int = None,
+                        ctx: Context = None) -> str:
+    """
+    Run many API requests, e.g. bulk issue creates, updates or deletes, in one call
 
-    # Create the Starlette app with CORS and routes
-    starlette_app = Starlette(
-        debug=True,
-        middleware=middleware,
-        routes=[
-            Route("/", endpoint=handle_root),
-            Route("/health", endpoint=handle_health),
-            Route("/sse", endpoint=dispatch_sse, methods=["GET", "POST"]),
-            Mount("/messages", app=sse.handle_post_message),
-        ],
-    )
-
-    # Run with Uvicorn
-    config = uvicorn.Config(
-        starlette_app,
-        host=host,
-        port=port,
-        log_level="info",
-    )
-    server = uvicorn.Server(config)
-    await server.serve()
+    Operations run in parallel over the server's connection pool, at most `concurrency` at a time. Use
+    depends_on to order them: an operation starts after the ones it depends on succeeded, and is skipped if
+    any of them failed.
+
+    Args:
+        operations: List of operations, each an object with:
+            path: API endpoint path (e.g. '/issues/123.json')
+            method: HTTP method, one of get, post, put, patch, delete (default: 'get')
+            data: Dictionary for request body (for POST/PUT)
+            params: Dictionary for query parameters
+            id: Name for the operation to use in depends_on and the results (default: its position)
+            depends_on: List of operation ids that must succeed first
+            retries: Times to retry a get, put or delete after a connection error or a 429, 502, 503 or 504
+                response (default: the server's REDMINE_RETRIES). Not allowed for post and patch, which could
+                be applied twice
+        dry_run: Validate every operation against the bundled OpenAPI spec without sending anything. Paths
+            the spec does not describe are reported as unvalidated, path and query parameters that don't match
+            as warnings (default: False)
+        concurrency: Maximum operations in flight, capped by the server's REDMINE_BATCH_CONCURRENCY
+
+    Returns:
+        str: YAML string with one row per operation (status, status_code, attempts, error and response body)
+             and in meta the number of operations that succeeded, failed and were skipped
+    """
+    try:
+        operations = normalize_operations(operations)
+        assert len(operations) <= REDMINE_BATCH_MAX_OPERATIONS, \
+            f"At most {REDMINE_BATCH_MAX_OPERATIONS} operations per batch, got {len(operations)}"
+
+        if dry_run:
+            def check():
+                index = spec_index()
+                rows = []
+                for operation in operations:
+                    status, errors, warnings = index.validate(operation["method"], operation["path"],
+                                                              operation["params"], operation["data"])
+                    rows.append({"id": operation["id"], "method": operation["method"], "path": operation["path"],
+                                 "status": status, "error": "; ".join(errors), "warnings": warnings})
+                return rows
+
+            rows = await anyio.to_thread.run_sync(check)
+            invalid = sum(row["status"] == "invalid" for row in rows)
+            return yd({"status_code": 200, "body": {"operations": rows},
+                       "error": f"{invalid} of {len(rows)} operations are invalid" if invalid else "",
+                       "meta": {"dry_run": True}})
+
+        async def send(operation):
+            return await arequest(operation["path"], method=operation["method"], data=operation["data"],
+                                  params=operation["params"], max_retries=operation["retries"])
+
+        async def progress(done):
+            if ctx is not None:
+                await ctx.report_progress(done, len(operations))
+
+        start = time.perf_counter()
+        concurrency = min(concurrency or REDMINE_BATCH_CONCURRENCY, REDMINE_BATCH_CONCURRENCY)
+        rows = await run_batch(operations, send, concurrency, on_done=progress)
+
+        counts = {status: sum(row["status"] == status for row in rows) for status in ("ok", "failed", "skipped")}
+        unsuccessful = counts["failed"] + counts["skipped"]
+        return yd({"status_code": 200, "body": {"operations": rows},
+                   "error": f"{unsuccessful} of {len(rows)} operations did not succeed" if unsuccessful else "",
+                   "meta": {**counts, "seconds": round(time.perf_counter() - start, 3)}})
+    except Exception as e:
+        return yd({"status_code": 0, "body": None, "error": f"{e.__class__.__name__}: {e}"})
+
+@mcp.tool()
+@instrumented
+def redmine_stats() -> str:
+    """
+    Report runtime statistics of this MCP server
+
+    Returns:
+        str: YAML string with response cache counters (hits, misses, revalidations, evictions), entries and size,
+             the number of GETs collapsed into a concurrent identical one, retry counters and the remaining retry
+             budget, outbound requests in flight and queued for the rate limits, the results kept for
+             redmine_continue, and the size and age of the local search index and mirror when they are configured
+    """
+    stats = {"cache": RESPONSE_CACHE.stats(), "coalescing": SINGLE_FLIGHT.stats(), "retries": RETRY_POLICY.stats(),
+             "outbound": {"global": GOVERNOR.stats(), "per_key": KEY_GOVERNORS.stats()},
+             "result_store": RESULT_STORE.stats()}
+    if SEARCH_INDEX is not None:
+        stats["search_index"] = SEARCH_INDEX.info()
+    if MIRROR is not None:
+        stats["mirror"] = MIRROR.info()
+    return yd(stats)
+
+@mcp.tool()
+@instrumented
+def redmine_continue(handle: str) -> str:
+    """
+    Get the next part of a result that was cut down to fit the output budget
+
+    Results larger than the server's output budget come with shortened text, fewer list items and a
+    meta.budget section. Its continuation handle returns the items that follow from the copy of the result
+    the server kept, without another request to Redmine.
+
+    Args:
+        handle: meta.budget.continuation of the previous part (e.g. 'kq3HZ8b1YxQw:25')
+
+    Returns:
+        str: YAML string with the next items of the same result, and a new continuation handle in meta.budget
+             while items remain
+    """
+    text = OUTPUT_BUDGET.resume(handle, SERIALIZERS[REDMINE_OUTPUT_FORMAT])
+    if text is None:
+        return yd({"status_code": 0, "body": None,
+                   "error": f"Unknown or expired continuation handle: {handle}. Repeat the original request, with "
+                            "fields or a smaller limit to get a shorter result."})
+    return text
+
+@mcp.tool()
+@instrumented
+def redmine_cursor(cursor: str, offset: int = 0, limit: int = None, fields: list[str] = None,
+                   exclude: list[str] = None) -> str:
+    """
+    Read a slice of a collection kept on the server by redmine_request with cursor=true
+
+    Slices come from the snapshot taken when the cursor was opened, so they are consistent with each other
+    and cost no request to Redmine. Cursors expire after a while without use; open a new one then.
+
+    Args:
+        cursor: meta.cursor.id of a redmine_request result
+        offset: Position of the first item to return (default: 0, see meta.cursor.next_offset)
+        limit: Number of items to return (default: the server's REDMINE_CURSOR_PAGE_SIZE, 25)
+        fields: Only return these fields of the items, same syntax as for redmine_request
+        exclude: Leave these fields out, same syntax as for redmine_request
+
+    Returns:
+        str: YAML string with the slice as body and, in meta.cursor, the number of items in the snapshot and
+             the offset of the next slice (null after the last one)
+    """
+    snapshot = RESULT_STORE.get(cursor)
+    if snapshot is None or "snapshot" not in (snapshot.get("meta") or {}):
+        return yd({"status_code": 0, "body": None,
+                   "error": f"Unknown or expired cursor: {cursor}. Repeat the request with cursor=true."})
+    page = cursor_page(snapshot, cursor, max(0, offset), limit or REDMINE_CURSOR_PAGE_SIZE)
+    page["body"] = project(page["body"], fields, exclude)
+    return yd(page)
+
+@mcp.tool()
+@instrumented
+def redmine_route(path: str, method: str = 'get') -> str:
+    """
+    Explain what a request maps to, without sending it
+
+    Finds the OpenAPI path template a concrete path belongs to (e.g. '/issues/123.json' ->
+    '/issues/{issueId}.json') with the operation for the method, and how this server treats the request.
+
+    Args:
+        path: API endpoint path (e.g. '/issues/123.json')
+        method: HTTP method (default: 'get')
+
+    Returns:
+        str: YAML string with the matched template, path parameters, the methods the spec lists for it, the
+             operation id and summary, whether the request is cached (and for how long) and retried, and the
+             path label used in metrics. matched is false for paths the spec does not describe
+    """
+    method = method.lower()
+    route = spec_index().route(path, method)
+    body = {"matched": route is not None, **(route or {})}
+    body["cache_ttl"] = RESPONSE_CACHE.ttl_for(path.split('?', 1)[0]) if method == 'get' else 0
+    body["retried"] = method in IDEMPOTENT_METHODS and RETRY_POLICY.retries > 0
+    body["metrics_path"] = route["template"] if route is not None else path_template(path)
+    return yd({"status_code": 200, "body": body, "error": ""})
+
+async def redmine_mirror_query(sql: str, params: list = None, limit: int = 200) -> str:
+    if MIRROR is None:
+        return yd({"status_code": 0, "body": None, "error": "The local mirror is disabled, set REDMINE_MIRROR"})
+    try:
+        info = await anyio.to_thread.run_sync(MIRROR.info)
+        if info["synced_at"] is None:
+            return yd({"status_code": 0, "body": None, "meta": {"mirror": info},
+                       "error": "The local mirror has not completed its first sync yet, use redmine_request"})
+        body = await anyio.to_thread.run_sync(MIRROR.query, sql, params, limit)
+        return yd({"status_code": 200, "body": body, "error": "", "meta": {"mirror": info}})
+    except Exception as e:
+        return yd({"status_code": 0, "body": None, "error": f"{e.__class__.__name__}: {e}"})
+
+# Only offered to the client when a mirror is configured.
+if MIRROR is not None:
+    mcp.tool(description="""
+Answer read-only questions from a local SQLite mirror of Redmine, without calling the API
+
+The mirror is kept in sync in the background (see meta.mirror.age_seconds for how fresh it is) and holds:
+{}
+The `data` column has the full API object as JSON, use json_extract(data, '$.custom_fields') and the like
+for anything not in a column. Dates are ISO 8601 strings.
+
+Args:
+    sql: A single SELECT statement, e.g. "SELECT status_id, COUNT(*) FROM issues GROUP BY status_id"
+    params: Optional values for ? placeholders in sql
+    limit: Maximum number of rows to return (default: 200)
+
+Returns:
+    str: YAML string with the result columns and rows, and whether rows were cut off by limit
+""".format(schema_description()).strip())(instrumented(redmine_mirror_query))
+
+async def run_sse(mcp_instance, host, port):
+    """Run the SSE transport and background tasks, closing the pooled async client when the server stops."""
+    # The HTTP stack is only needed in SSE mode, so stdio sessions never pay for importing it.
+    from mcp_redmine.sse import run_sse_with_cors
+    try:
+        async with background_tasks() as tasks:
+            # Only the SSE server exposes /metrics, so only it measures event loop lag.
+            tasks.append(asyncio.create_task(monitor_event_loop()))
+            await run_sse_with_cors(mcp_instance, host, port)
+    finally:
+        await aclose_client()
+
+async def run_stdio(mcp_instance):
+    """Run the stdio transport and background tasks, closing the pooled async client when the session ends."""
+    try:
+        async with background_tasks():
+            await mcp_instance.run_stdio_async()
+    finally:
+        await aclose_client()
 
 def main():
     """Main entry point for the mcp-redmine package."""
     # Check for PORT environment variable (set by App Platform)
     port_env = os.environ.get('PORT')
-    
+    get_logger(__name__).info(f"Server initialised in {(time.perf_counter() - STARTUP_STARTED) * 1000:.0f} ms "
+                              f"(OpenAPI spec: {SPEC_LOAD_INFO['seconds'] * 1000:.1f} ms)")
+
     if port_env:
         # Remote/Docker Deployment: Run SSE with CORS
         port = int(port_env)
         get_logger(__name__).info(f"Starting MCP Redmine server on 0.0.0.0:{port} with CORS enabled (SSE mode)")
         try:
-            anyio.run(run_sse_with_cors, mcp_server, "0.0.0.0", port)
+            anyio.run(run_sse, mcp, "0.0.0.0", port)
         except Exception as e:
             get_logger(__name__).error(f"Failed to start server: {e}", exc_info=True)
             raise
+        finally:
+            close_client()
     else:
         # Local Execution: Run standard stdio
         # This is what Claude Desktop expects when running locally
         get_logger(__name__).info("Starting MCP Redmine server in stdio mode (Local)")
         try:
-            mcp_server.run(transport="stdio")
+            anyio.run(run_stdio, mcp)
         except Exception as e:
             get_logger(__name__).error(f"Failed to start local server: {e}", exc_info=True)
             raise
+        finally:
+            close_client()
+
+def __getattr__(name):
+    # HealthCheckHandler, start_health_server and run_sse_with_cors used to live here; import them on demand.
+    if name in ("HealthCheckHandler", "start_health_server", "run_sse_with_cors", "ASGIInstance"):
+        from mcp_redmine import sse
+        return getattr(sse, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one.
+
+    The first caller for a key starts the call as a task and everyone asking for the key while it runs awaits
+    the same task, so a caller that is cancelled does not cancel the call for the others. Results are dicts; each
+    caller gets its own shallow copy, and those that joined a running call are marked with meta.coalesced.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.counters = {"calls": 0, "collapsed": 0}
+
+    async def do(self, key, fn) -> dict:
+        """Return the result of fn() for key, an async function, sharing a call already running for key."""
+        key = (asyncio.get_running_loop(), key)
+        task = self.calls.get(key)
+        joined = task is not None
+        if joined:
+            with self.lock:
+                self.counters["collapsed"] += 1
+        else:
+            with self.lock:
+                self.counters["calls"] += 1
+            task = self.calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        result = dict(await asyncio.shield(task))
+        if joined:
+            result["meta"] = {**result.get("meta", {}), "coalesced": True}
+        return result
+
+    def stats(self) -> dict:
+        with self.lock:
+            calls, collapsed = self.counters["calls"], self.counters["collapsed"]
+        return {
+            "calls": calls,
+            "collapsed": collapsed,
+            "collapse_ratio": round(collapsed / (calls + collapsed), 4) if calls + collapsed else 0.0,
+            "in_flight": len(self.calls),
+        }
@@ -0,0 +1,299 @@
+import hashlib
+import json
+import pathlib
+import re
+import time
+import urllib.parse
+
+import yaml
+
+SPEC_SOURCE = pathlib.Path(__file__).parent / 'redmine_openapi.yml'
+SPEC_COMPILED = pathlib.Path(__file__).parent / 'redmine_openapi.compiled.json'
+
+# libyaml's C loader is an order of magnitude faster than the pure-Python one when it is available.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def source_digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+def parse_yaml(raw: bytes) -> dict:
+    return yaml.load(raw, Loader=YAML_LOADER)
+
+def compile_spec(source: pathlib.Path = SPEC_SOURCE, target: pathlib.Path = SPEC_COMPILED) -> dict:
+    """Write the JSON form of the YAML spec, stamped with the SHA-256 of the YAML it came from."""
+    raw = source.read_bytes()
+    spec = parse_yaml(raw)
+    compiled = {"source_sha256": source_digest(raw), "spec": spec}
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(compiled, f, ensure_ascii=False, separators=(',', ':'))
+    return spec
+
+def load_spec(source: pathlib.Path = SPEC_SOURCE, compiled: pathlib.Path = SPEC_COMPILED) -> tuple:
+    """Load the OpenAPI spec, preferring the compiled JSON form.
+
+    The YAML source is only parsed when the compiled file is missing, unreadable or was built from a different
+    version of the YAML. Returns (spec, info) where info says which form was used and how long loading took.
+    """
+    start = time.perf_counter()
+    raw = source.read_bytes()
+    digest = source_digest(raw)
+
+    try:
+        with open(compiled, 'rb') as f:
+            data = json.loads(f.read())
+        if data.get("source_sha256") == digest:
+            return data["spec"], {"source": "compiled", "seconds": time.perf_counter() - start}
+        reason = "stale"
+    except FileNotFoundError:
+        reason = "missing"
+    except (ValueError, KeyError, AttributeError) as e:
+        reason = f"unreadable ({e.__class__.__name__})"
+
+    spec = parse_yaml(raw)
+    return spec, {"source": "yaml", "reason": reason, "seconds": time.perf_counter() - start}
+
+
+# Path lookups
+
+def resolve_refs(node, spec: dict, _active: tuple = ()):
+    """Copy of node with every local $ref ('#/components/schemas/Issue') replaced by what it points to.
+
+    Keys next to a $ref are kept and win over the referenced ones. A $ref that refers back to one being
+    expanded is left as it is, so recursive schemas don't recurse forever.
+    """
+    if isinstance(node, list):
+        return [resolve_refs(item, spec, _active) for item in node]
+    if not isinstance(node, dict):
+        return node
+    ref = node.get('$ref')
+    if isinstance(ref, str) and ref.startswith('#/') and ref not in _active:
+        target = spec
+        for part in ref[2:].split('/'):
+            target = target[part.replace('~1', '/').replace('~0', '~')]
+        resolved = resolve_refs(target, spec, _active + (ref,))
+        siblings = {key: resolve_refs(value, spec, _active) for key, value in node.items() if key != '$ref'}
+        return {**resolved, **siblings} if isinstance(resolved, dict) else resolved
+    return {key: resolve_refs(value, spec, _active) for key, value in node.items()}
+
+
+# A path segment holding one parameter, e.g. '{issueId}.json' -> ('', 'issueId', '.json').
+PARAM_SEGMENT = re.compile(r'^([^{}]*)\{([^{}/]+)\}([^{}]*)$')
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+
+class _RouteNode:
+    __slots__ = ('literals', 'params', 'template')
+
+    def __init__(self):
+        self.literals = {}
+        self.params = []  # (prefix, name, suffix, node), most specific first
+        self.template = None
+
+
+class Router:
+    """Map concrete paths such as '/issues/123.json' to the path template they belong to.
+
+    Templates without parameters are found with one dict lookup. The others are walked segment by segment
+    through a trie, where a literal segment takes precedence over a parameter ('/users/current.json' wins over
+    '/users/{userId}.json') and a parameter segment may carry a fixed prefix and suffix like '{issueId}.json'.
+    """
+
+    def __init__(self, templates):
+        self.static = {}
+        self.root = _RouteNode()
+        for template in templates:
+            if '{' not in template:
+                self.static[template] = template
+                continue
+            node = self.root
+            for segment in template.strip('/').split('/'):
+                param = PARAM_SEGMENT.match(segment)
+                if param is None:
+                    node = node.literals.setdefault(segment, _RouteNode())
+                    continue
+                prefix, name, suffix = param.groups()
+                child = next((entry[3] for entry in node.params if entry[:3] == (prefix, name, suffix)), None)
+                if child is None:
+                    child = _RouteNode()
+                    node.params.append((prefix, name, suffix, child))
+                    node.params.sort(key=lambda entry: -len(entry[0]) - len(entry[2]))
+                node = child
+            node.template = template
+
+    def match(self, path: str) -> tuple:
+        """(template, {parameter: value}) for path, which may carry a query string, or None."""
+        path = '/' + path.split('?', 1)[0].lstrip('/')
+        template = self.static.get(path)
+        if template is not None:
+            return template, {}
+        params = {}
+        template = self._walk(self.root, path.strip('/').split('/'), 0, params)
+        return (template, params) if template is not None else None
+
+    def _walk(self, node: _RouteNode, segments: list, i: int, params: dict):
+        if i == len(segments):
+            return node.template
+        segment = segments[i]
+        child = node.literals.get(segment)
+        if child is not None:
+            template = self._walk(child, segments, i + 1, params)
+            if template is not None:
+                return template
+        for prefix, name, suffix, child in node.params:
+            if (len(segment) > len(prefix) + len(suffix) and segment.startswith(prefix)
+                    and segment.endswith(suffix)):
+                template = self._walk(child, segments, i + 1, params)
+                if template is not None:
+                    params[name] = urllib.parse.unquote(segment[len(prefix):len(segment) - len(suffix)])
+                    return template
+        return None
+
+
+# Request validation
+#
+# Each operation's parameters and body schema are compiled into validators the first time a request for it is
+# checked, after which a check takes microseconds. openapi-schema-validator, the OpenAPI 3.0 flavour of
+# jsonschema that openapi-core is built on, is only imported then.
+
+def _coerce(value, schema: dict):
+    """A query or path parameter as the schema's type, the way Redmine parses the string it receives."""
+    kind = schema.get('type')
+    if kind == 'array':
+        items = value if isinstance(value, list) else [value]
+        return [_coerce(item, schema.get('items') or {}) for item in items]
+    if not isinstance(value, str):
+        return value
+    try:
+        if kind == 'integer':
+            return int(value)
+        if kind == 'number':
+            return float(value)
+    except ValueError:
+        return value
+    if kind == 'boolean' and value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    return value
+
+def _error_location(error, default: str) -> str:
+    return '.'.join(map(str, error.absolute_path)) or default
+
+
+class OperationValidator:
+    """Path and query parameters and JSON body of one operation, checked against its compiled schemas.
+
+    Only the body is held to the spec. Redmine takes more forms of path and query parameters than the spec
+    describes, e.g. 'current' for a user id, project identifiers for project_id or 'updated_on:desc' for sort,
+    so problems with them are warnings. Query parameters the spec does not list are let through.
+    """
+
+    def __init__(self, path_item: dict, method: str, components: dict):
+        from openapi_schema_validator import OAS30Validator
+
+        def compile_schema(schema: dict):
+            # Recursive $refs are left in place by resolve_refs(); they resolve against the copied components.
+            return OAS30Validator({**schema, 'components': components}, format_checker=OAS30Validator.FORMAT_CHECKER)
+
+        operation = path_item[method]
+        parameters = {(p['name'], p.get('in')): p for p in path_item.get('parameters') or () if 'name' in p}
+        parameters.update({(p['name'], p.get('in')): p for p in operation.get('parameters') or () if 'name' in p})
+        self.parameters = [(name, location, bool(p.get('required')), p.get('schema') or {},
+                            compile_schema(p.get('schema') or {}))
+                           for (name, location), p in parameters.items() if location in ('path', 'query')]
+
+        body = operation.get('requestBody') or {}
+        schema = ((body.get('content') or {}).get('application/json') or {}).get('schema')
+        self.body_required = bool(body.get('required'))
+        self.body = compile_schema(schema) if schema is not None else None
+
+    def validate(self, path_params: dict, params: dict = None, data=None) -> tuple:
+        """Problems with the request as (errors, warnings), lists of 'location: message' strings.
+
+        errors are those of the body, which Redmine would refuse; warnings those of path and query parameters.
+        """
+        errors, warnings = [], []
+        values = {'path': path_params, 'query': params or {}}
+        for name, location, required, schema, validator in self.parameters:
+            if name not in values[location]:
+                if required:
+                    warnings.append(f"{name}: required {location} parameter is missing")
+                continue
+            value = _coerce(values[location][name], schema)
+            warnings.extend(f"{name}: {error.message}" for error in validator.iter_errors(value))
+        if data is None:
+            if self.body_required:
+                errors.append("body: a request body is required")
+        elif self.body is not None:
+            found = sorted(self.body.iter_errors(data), key=lambda error: [str(part) for part in error.absolute_path])
+            errors.extend(f"{_error_location(error, 'body')}: {error.message}" for error in found)
+        return errors, warnings
+
+
+# Index of the whole spec, built once at startup
+
+class SpecIndex:
+    """Path templates of a spec with their path items, as written and with $refs resolved, built once.
+
+    fragment() serialises a path item on first use and keeps the text, so that answering redmine_paths_info
+    is a matter of joining cached strings.
+    """
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.items = dict(spec.get('paths') or {})
+        self.paths = list(self.items)
+        self.resolved = {template: resolve_refs(item, spec) for template, item in self.items.items()}
+        self.fragments = {}
+        self.router = Router(self.paths)
+        self.validators = {}
+
+    def validator(self, template: str, method: str) -> OperationValidator:
+        """Compiled validator for an operation, built on first use. None if the spec has no such operation."""
+        key = (template, method)
+        if key not in self.validators:
+            item = self.resolved[template]
+            self.validators[key] = (OperationValidator(item, method, self.spec.get('components') or {})
+                                    if isinstance(item.get(method), dict) else None)
+        return self.validators[key]
+
+    def validate(self, method: str, path: str, params: dict = None, data=None) -> tuple:
+        """Validate a request against the spec without sending it.
+
+        Returns (status, errors, warnings) where status is "invalid" when the body does not match its schema,
+        "valid" otherwise, or "unvalidated" when the spec does not describe the path or method, which is the case
+        for much of Redmine's API. warnings are path and query parameters that do not match the spec, which
+        Redmine may still accept.
+        """
+        found = self.router.match(path)
+        validator = self.validator(found[0], method.lower()) if found is not None else None
+        if validator is None:
+            return "unvalidated", [], []
+        errors, warnings = validator.validate(found[1], params, data)
+        return ("invalid" if errors else "valid"), errors, warnings
+
+    def route(self, path: str, method: str) -> dict:
+        """What a request for method and concrete path maps to in the spec, or None if no path template matches."""
+        found = self.router.match(path)
+        if found is None:
+            return None
+        template, params = found
+        item = self.items[template]
+        methods = [name for name in HTTP_METHODS if isinstance(item.get(name), dict)]
+        operation = item.get(method.lower())
+        return {
+            "template": template,
+            "path_params": params,
+            "methods": methods,
+            "operation_id": operation.get("operationId") if isinstance(operation, dict) else None,
+            "summary": operation.get("summary") if isinstance(operation, dict) else None,
+        }
+
+    def fragment(self, template: str, resolved: bool, dump) -> str:
+        """dump({template: path item}), cached per template, resolution and serialiser."""
+        key = (template, resolved, dump)
+        text = self.fragments.get(key)
+        if text is None:
+            item = self.resolved[template] if resolved else self.items[template]
+            text = self.fragments[key] = dump({template: item})
+        return text
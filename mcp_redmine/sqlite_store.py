@@ -0,0 +1,52 @@
+import sqlite3
+import threading
+
+
+class SqliteStore:
+    """SQLite file that a sync engine keeps in step with Redmine, the base of the mirror and the search index.
+
+    One connection is shared between threads under a lock. Metadata such as the watermark, the newest updated_on
+    seen, and the time of the last reconcile is kept as key/value rows in meta_table.
+    """
+
+    meta_table = "meta"
+    # Rows in other tables that belong to a row of a table, as (table, column holding its id), deleted with it.
+    dependents = {}
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        with self.db:
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {self.meta_table} (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def get_meta(self, key: str, default=None):
+        with self.lock:
+            row = self.db.execute(f"SELECT value FROM {self.meta_table} WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, **values):
+        with self.lock, self.db:
+            self.db.executemany(f"INSERT OR REPLACE INTO {self.meta_table} (key, value) VALUES (?, ?)",
+                                [(key, str(value)) for key, value in values.items()])
+
+    def count(self, table: str) -> int:
+        with self.lock:
+            return self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def delete_missing(self, table: str, present_ids) -> int:
+        """Delete the rows whose id is not in present_ids, and their dependents. Returns the number deleted."""
+        with self.lock, self.db:
+            self.db.execute("CREATE TEMP TABLE IF NOT EXISTS present (id INTEGER PRIMARY KEY)")
+            self.db.execute("DELETE FROM present")
+            self.db.executemany("INSERT OR IGNORE INTO present VALUES (?)", [(i,) for i in present_ids])
+            deleted = self.db.execute(f"DELETE FROM {table} WHERE id NOT IN (SELECT id FROM present)").rowcount
+            for dependent, column in self.dependents.get(table, ()):
+                self.db.execute(f"DELETE FROM {dependent} WHERE {column} NOT IN (SELECT id FROM present)")
+            self.db.execute("DELETE FROM present")
+        return deleted
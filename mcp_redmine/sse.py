@@ -0,0 +1,171 @@
+"""
+HTTP side of the server: the SSE transport with CORS and the standalone health check server.
+
+Only imported when the server runs in SSE mode (PORT is set), so stdio sessions never load it.
+"""
+import socket
+import threading
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import uvicorn
+from mcp.server.fastmcp.utilities.logging import get_logger
+from mcp.server.sse import SseServerTransport
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from mcp_redmine.metrics import CONTENT_TYPE, REGISTRY, SSE_SESSIONS
+
+
+class HealthCheckHandler(BaseHTTPRequestHandler):
+    """Simple HTTP handler for health checks."""
+    def do_GET(self):
+        if self.path == '/' or self.path == '/health':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{"status":"ok","service":"mcp-redmine"}\n')
+        elif self.path == '/metrics':
+            body = REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header('Content-type', CONTENT_TYPE)
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(404)
+            self.end_headers()
+    
+    def do_HEAD(self):
+        if self.path == '/' or self.path == '/health':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+        else:
+            self.send_response(404)
+            self.end_headers()
+    
+    def log_message(self, format, *args):
+        # Suppress HTTP server logs
+        pass
+
+# Global reference to keep the health server alive
+_health_server = None
+
+def start_health_server(port=8080):
+    """Start a simple HTTP server for health checks in a background thread."""
+    global _health_server
+    try:
+        # Explicitly bind to 0.0.0.0 to accept connections from any interface
+        server_address = ('0.0.0.0', port)
+        get_logger(__name__).info(f"Starting health check server on {server_address[0]}:{server_address[1]}")
+        server = HTTPServer(server_address, HealthCheckHandler)
+        _health_server = server  # Keep global reference
+        
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        
+        # Wait for the server to be ready and verify it's listening
+        max_attempts = 10
+        for attempt in range(max_attempts):
+            time.sleep(0.2)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(1)
+            result = sock.connect_ex(('127.0.0.1', port))
+            sock.close()
+            if result == 0:
+                get_logger(__name__).info(f"Health check server is listening on 0.0.0.0:{port}")
+                return server
+            if attempt < max_attempts - 1:
+                get_logger(__name__).debug(f"Waiting for health server to be ready (attempt {attempt + 1}/{max_attempts})")
+        
+        get_logger(__name__).warning(f"Health check server started but verification failed after {max_attempts} attempts")
+        return server
+    except Exception as e:
+        get_logger(__name__).error(f"Failed to start health check server: {e}", exc_info=True)
+        _health_server = None
+        return None
+
+class ASGIInstance(Response):
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+async def run_sse_with_cors(mcp_instance, host, port):
+    """Custom run loop to enable CORS for the SSE server"""
+    # Create the SSE transport - Use /sse to match client behavior
+    sse = SseServerTransport("/sse")
+
+    async def dispatch_sse(request):
+        # Log headers for debugging auth
+        get_logger(__name__).info(f"Incoming {request.method} request to {request.url.path}")
+        get_logger(__name__).info(f"Headers: {dict(request.headers)}")
+        
+        if request.method == "POST":
+            # Wrap the ASGI app in a Response compatible object
+            return ASGIInstance(sse.handle_post_message)
+        elif request.method == "GET":
+            # Connect SSE stream and run request loop
+            SSE_SESSIONS.inc()
+            try:
+                async with sse.connect_sse(
+                    request.scope, request.receive, request._send
+                ) as streams:
+                    await mcp_instance._mcp_server.run(
+                        streams[0],
+                        streams[1],
+                        mcp_instance._mcp_server.create_initialization_options(),
+                    )
+            finally:
+                SSE_SESSIONS.dec()
+            # When run finishes (connection closed), we return None, which Starlette handles as response done
+            return None
+        else:
+            return JSONResponse({"error": "Method not allowed"}, status_code=405)
+
+    async def handle_root(request):
+        return JSONResponse({"status": "online", "service": "mcp-redmine", "mode": "sse"})
+
+    async def handle_health(request):
+        return JSONResponse({"status": "ok"})
+
+    async def handle_metrics(request):
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    # Configure CORS middleware
+    middleware = [
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["*"],  # Allow all origins for Connector
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    ]
+
+    # Create the Starlette app with CORS and routes
+    starlette_app = Starlette(
+        debug=True,
+        middleware=middleware,
+        routes=[
+            Route("/", endpoint=handle_root),
+            Route("/health", endpoint=handle_health),
+            Route("/metrics", endpoint=handle_metrics),
+            Route("/sse", endpoint=dispatch_sse, methods=["GET", "POST"]),
+            Mount("/messages", app=sse.handle_post_message),
+        ],
+    )
+
+    # Run with Uvicorn
+    config = uvicorn.Config(
+        starlette_app,
+        host=host,
+        port=port,
+        log_level="info",
+    )
+    server = uvicorn.Server(config)
+    await server.serve()
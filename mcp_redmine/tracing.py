@@ -0,0 +1,82 @@
+"""
+Optional OpenTelemetry tracing: a span per tool call with child spans for the HTTP requests to Redmine and for
+serialising the result.
+
+Off unless REDMINE_TRACING is set, in which case the OpenTelemetry SDK is imported and spans are exported to
+the console (stderr) or over OTLP. While it is off, span() hands out one shared do-nothing object, so the
+instrumented code paths neither import OpenTelemetry nor allocate anything.
+"""
+import atexit
+import sys
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+TRACING_EXPORTERS = ("console", "otlp")
+
+_tracer = None
+
+
+class _NoSpan:
+    """Stands in for both the context manager and the span while tracing is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+NO_SPAN = _NoSpan()
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+def span(name: str, attributes: dict = None):
+    """Context manager for a child span of the current one, yielding the span."""
+    if _tracer is None:
+        return NO_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+def mark_error(current, description: str):
+    """Set the status of a span to error, for failures that are returned rather than raised."""
+    if current is NO_SPAN:
+        return
+    from opentelemetry.trace import Status, StatusCode
+    current.set_status(Status(StatusCode.ERROR, description))
+
+def _span_exporter(exporter: str):
+    if exporter == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        # stdout carries the MCP protocol in stdio mode.
+        return ConsoleSpanExporter(out=sys.stderr)
+    # Endpoint, headers and the like come from the standard OTEL_EXPORTER_OTLP_* environment variables.
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter()
+
+def setup_tracing(exporter: str, service_name: str = "mcp-redmine", version: str = None) -> bool:
+    """Start tracing with the 'console' or 'otlp' exporter. Returns False, after logging why, when the
+    OpenTelemetry packages are not installed."""
+    global _tracer
+    if exporter not in TRACING_EXPORTERS:
+        raise ValueError(f"REDMINE_TRACING must be one of {', '.join(TRACING_EXPORTERS)}, got: {exporter}")
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        span_exporter = _span_exporter(exporter)
+    except ImportError as e:
+        get_logger(__name__).warning(f"REDMINE_TRACING is set but OpenTelemetry is not installed ({e}), tracing "
+                                     f"is off (pip install 'mcp-redmine[tracing]')")
+        return False
+    resource = {"service.name": service_name}
+    if version:
+        resource["service.version"] = version
+    provider = TracerProvider(resource=Resource.create(resource))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    atexit.register(provider.shutdown)  # flushes the spans still queued for export
+    _tracer = provider.get_tracer("mcp_redmine", version)
+    return True
@@ -19,6 +19,26 @@ def pytest_configure(config):
     os.environ.setdefault('REDMINE_REQUEST_INSTRUCTIONS', '')
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Keep cached Redmine responses from leaking between tests."""
+    from mcp_redmine.server import RESPONSE_CACHE
+    RESPONSE_CACHE.clear()
+    RESPONSE_CACHE.counters = dict.fromkeys(RESPONSE_CACHE.counters, 0)
+    yield
+    RESPONSE_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def retry_policy(mocker):
+    """Give every test a fresh retry budget, with the backoff sleeps taken out."""
+    from mcp_redmine import server
+    from mcp_redmine.retry import RetryPolicy
+    policy = RetryPolicy(server.REDMINE_RETRIES, 0.0, server.REDMINE_RETRY_MAX_DELAY, server.REDMINE_RETRY_BUDGET)
+    mocker.patch('mcp_redmine.server.RETRY_POLICY', policy)
+    return policy
+
+
 @pytest.fixture
 def mock_env(monkeypatch):
     """Set up mock environment variables for testing."""
@@ -142,10 +162,20 @@ def mock_openapi_spec():
 @pytest.fixture
 def mock_httpx_client(mocker):
     """Mock httpx client for testing HTTP requests."""
-    mock_client = mocker.patch('httpx.request')
+    mock_client = mocker.patch('httpx.Client.request')
     return mock_client
 
 
+@pytest.fixture
+def mock_async_client(mocker):
+    """Serve arequest() from a handler function through httpx.MockTransport."""
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mocker.patch('mcp_redmine.server.get_async_client', return_value=client)
+        return client
+    return install
+
+
 @pytest.fixture
 def sample_issue_data():
     """Sample issue data for testing."""
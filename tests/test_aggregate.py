@@ -0,0 +1,135 @@
+"""
+Unit tests for issue aggregation in mcp_redmine.aggregate module and the redmine_issue_stats() tool.
+"""
+import httpx
+import pytest
+import yaml
+from mcp_redmine.aggregate import Aggregator, field_value, parse_aggregate
+from mcp_redmine.server import redmine_issue_stats
+
+
+def make_issue(issue_id, status="New", assignee=None, estimated=None, due=None, custom=None):
+    issue = {"id": issue_id, "status": {"id": 1, "name": status}, "estimated_hours": estimated, "due_date": due}
+    if assignee:
+        issue["assigned_to"] = {"id": assignee, "name": f"User {assignee}"}
+    if custom is not None:
+        issue["custom_fields"] = [{"id": 3, "name": "Customer", "value": custom}]
+    return issue
+
+
+class TestAggregator:
+    """Tests for field access and the Aggregator class."""
+
+    @pytest.mark.unit
+    def test_field_value(self):
+        """Test name resolution, dotted paths and custom fields."""
+        # Arrange
+        issue = make_issue(1, assignee=5, custom=["ACME", "Globex"])
+
+        # Assert
+        assert field_value(issue, "status") == "New"
+        assert field_value(issue, "assigned_to.id") == 5
+        assert field_value(issue, "cf_3") == "ACME, Globex"
+        assert field_value(issue, "cf_9") is None
+        assert field_value(issue, "fixed_version") is None
+
+    @pytest.mark.unit
+    def test_parse_aggregate_rejects_unknown(self):
+        """Test that aggregate specs are validated."""
+        # Assert
+        assert parse_aggregate("sum:estimated_hours") == ("sum", "estimated_hours")
+        with pytest.raises(ValueError, match="Unknown aggregate"):
+            parse_aggregate("median:estimated_hours")
+        with pytest.raises(ValueError, match="needs a field"):
+            parse_aggregate("sum")
+
+    @pytest.mark.unit
+    def test_grouped_aggregates(self):
+        """Test count, sum, avg, min and max per group across several batches."""
+        # Arrange
+        aggregator = Aggregator(["status"], ["count", "sum:estimated_hours", "avg:estimated_hours",
+                                             "min:due_date", "max:due_date"])
+
+        # Act
+        aggregator.add([make_issue(1, "New", estimated=2, due="2024-03-01"),
+                        make_issue(2, "Closed", estimated=1)])
+        aggregator.add([make_issue(3, "New", estimated=4.5, due="2024-01-15"),
+                        make_issue(4, "New")])
+        rows = aggregator.rows()
+
+        # Assert
+        assert rows[0] == {"status": "New", "count": 3, "sum:estimated_hours": 6.5, "avg:estimated_hours": 3.25,
+                           "min:due_date": "2024-01-15", "max:due_date": "2024-03-01"}
+        assert rows[1]["status"] == "Closed"
+        assert rows[1]["max:due_date"] is None
+        assert aggregator.items == 4
+
+    @pytest.mark.unit
+    def test_no_group_by_gives_one_row(self):
+        """Test that without group_by there is a single total row."""
+        # Arrange
+        aggregator = Aggregator([], ["count"])
+
+        # Act
+        aggregator.add([make_issue(i) for i in range(5)])
+
+        # Assert
+        assert aggregator.rows() == [{"count": 5}]
+
+
+class TestRedmineIssueStatsTool:
+    """Tests for the redmine_issue_stats() tool."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_aggregates_every_page(self, mock_env, mock_async_client):
+        """Test that all pages are read with the given filters and only totals are returned."""
+        # Arrange
+        issues = [make_issue(i, assignee=i % 3 + 1, estimated=1) for i in range(250)]
+        requests = []
+
+        def handler(req):
+            requests.append(req)
+            offset, limit = int(req.url.params['offset']), int(req.url.params['limit'])
+            return httpx.Response(200, json={'issues': issues[offset:offset + limit], 'total_count': len(issues),
+                                             'offset': offset, 'limit': limit})
+
+        mock_async_client(handler)
+
+        # Act
+        result = await redmine_issue_stats(filters={'project_id': 1, 'status_id': '*', 'limit': 5},
+                                           group_by=['assigned_to'], aggregates=['count', 'sum:estimated_hours'])
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 200
+        assert parsed['meta'] == {'issues': 250, 'groups': 3, 'pages_fetched': 3}
+        rows = {row['assigned_to']: row for row in parsed['body']['rows']}
+        assert rows['User 1']['count'] == 84
+        assert rows['User 1']['sum:estimated_hours'] == 84
+        assert all(req.url.params['project_id'] == '1' for req in requests)
+        assert all(req.url.params['limit'] == '100' for req in requests)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_invalid_aggregate(self, mock_env):
+        """Test that an invalid aggregate spec is reported without any request."""
+        # Act
+        parsed = yaml.safe_load(await redmine_issue_stats(aggregates=['median:estimated_hours']))
+
+        # Assert
+        assert parsed['status_code'] == 0
+        assert 'Unknown aggregate' in parsed['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_request_error(self, mock_env, mock_async_client):
+        """Test that a failed page read is returned as is."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(403, json={'errors': ['Forbidden']}))
+
+        # Act
+        parsed = yaml.safe_load(await redmine_issue_stats())
+
+        # Assert
+        assert parsed['status_code'] == 403
@@ -0,0 +1,266 @@
+"""
+Unit tests for batch operations in mcp_redmine.batch module, request validation in mcp_redmine.spec and the
+redmine_batch() tool.
+"""
+import asyncio
+
+import httpx
+import pytest
+import yaml
+from mcp_redmine.batch import normalize_operations, run_batch
+from mcp_redmine.server import SPEC, redmine_batch
+from mcp_redmine.spec import SpecIndex
+
+
+def ok(body=None):
+    return {"status_code": 200, "body": body, "error": ""}
+
+
+class TestNormalizeOperations:
+    """Tests for normalize_operations() and dependency checks."""
+
+    @pytest.mark.unit
+    def test_defaults(self):
+        """Test that ids, methods and dependencies are filled in."""
+        # Act
+        operations = normalize_operations([{"path": "/issues.json", "method": "POST"},
+                                           {"path": "/issues/1.json", "id": "x", "depends_on": 0}])
+
+        # Assert
+        assert operations[0]["id"] == "0"
+        assert operations[0]["method"] == "post"
+        assert operations[1]["depends_on"] == ["0"]
+        assert operations[1]["retries"] is None
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("operations,message", [
+        ([{"method": "get"}], "at least a path"),
+        ([{"path": "/a.json", "method": "options"}], "unsupported method"),
+        ([{"path": "/a.json", "id": "a"}, {"path": "/b.json", "id": "a"}], "more than once"),
+        ([{"path": "/a.json", "depends_on": ["missing"]}], "unknown operation"),
+        ([{"path": "/issues.json", "method": "post", "retries": 2}], "can't be retried"),
+        ([{"path": "/issues/1.json", "method": "patch", "retries": 1}], "can't be retried"),
+        ([{"path": "/a.json", "id": "a", "depends_on": ["b"]}, {"path": "/b.json", "id": "b", "depends_on": ["a"]}],
+         "cycle"),
+    ])
+    def test_rejects_bad_operations(self, operations, message):
+        """Test that malformed batches are rejected before anything runs."""
+        # Act / Assert
+        with pytest.raises(ValueError, match=message):
+            normalize_operations(operations)
+
+
+class TestRunBatch:
+    """Tests for run_batch()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_dependencies_run_first_and_failures_skip(self):
+        """Test ordering by depends_on and skipping after a failed dependency."""
+        # Arrange
+        order = []
+
+        async def send(operation):
+            order.append(operation["id"])
+            if operation["id"] == "bad":
+                return {"status_code": 422, "body": None, "error": "HTTPStatusError: 422"}
+            return ok()
+
+        operations = normalize_operations([
+            {"id": "child", "path": "/c.json", "depends_on": ["parent"]},
+            {"id": "parent", "path": "/p.json"},
+            {"id": "bad", "path": "/b.json"},
+            {"id": "after-bad", "path": "/a.json", "depends_on": ["bad"]},
+        ])
+
+        # Act
+        rows = await run_batch(operations, send, concurrency=4)
+
+        # Assert
+        assert [row["id"] for row in rows] == ["child", "parent", "bad", "after-bad"]
+        assert order.index("parent") < order.index("child")
+        assert "after-bad" not in order
+        assert [row["status"] for row in rows] == ["ok", "ok", "failed", "skipped"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_attempts_come_from_send(self):
+        """Test that retries are left to send() and reported from its meta.retries."""
+        # Arrange
+        calls = []
+
+        async def send(operation):
+            calls.append(operation["id"])
+            return {"status_code": 503, "body": None, "error": "HTTPStatusError: 503", "meta": {"retries": 2}}
+
+        operations = normalize_operations([{"id": "put", "path": "/issues/1.json", "method": "put", "retries": 2}])
+
+        # Act
+        rows = await run_batch(operations, send, concurrency=1)
+
+        # Assert
+        assert calls == ["put"]
+        assert rows[0]["status"] == "failed" and rows[0]["attempts"] == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test that no more than concurrency operations are in flight."""
+        # Arrange
+        active, peak = 0, 0
+
+        async def send(operation):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return ok()
+
+        operations = normalize_operations([{"path": f"/issues/{i}.json", "method": "put"} for i in range(10)])
+
+        # Act
+        await run_batch(operations, send, concurrency=3)
+
+        # Assert
+        assert peak == 3
+
+
+class TestValidateRequest:
+    """Tests for SpecIndex.validate() against the bundled spec."""
+
+    @pytest.mark.unit
+    def test_invalid_body(self):
+        """Test that a body of the wrong type is reported with its location."""
+        # Act
+        status, errors, warnings = SpecIndex(SPEC).validate("put", "/issues/12.json",
+                                                            data={"issue": {"status_id": "closed"}})
+
+        # Assert
+        assert status == "invalid"
+        assert errors == ["issue.status_id: 'closed' is not of type 'integer'"]
+        assert warnings == []
+
+    @pytest.mark.unit
+    def test_query_parameter_mismatch_is_a_warning(self):
+        """Test that query parameters are checked, but only warned about."""
+        # Act
+        status, errors, warnings = SpecIndex(SPEC).validate("get", "/issues.json", params={"limit": "many"})
+
+        # Assert
+        assert (status, errors) == ("valid", [])
+        assert "limit" in warnings[0]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("path,params", [
+        ("/users/current.json", None),
+        ("/issues.json", {"project_id": "acme"}),
+        ("/issues.json", {"sort": "updated_on:desc"}),
+        ("/issues.json", {"sort": "priority:desc,updated_on"}),
+    ])
+    def test_forms_redmine_accepts_are_not_rejected(self, path, params):
+        """Test that 'current', project identifiers and sort directions, which Redmine accepts, are sent."""
+        # Act
+        status, errors, _ = SpecIndex(SPEC).validate("get", path, params=params)
+
+        # Assert
+        assert (status, errors) == ("valid", [])
+
+    @pytest.mark.unit
+    def test_valid_and_unvalidated(self):
+        """Test a valid request and a path the spec does not describe."""
+        # Assert
+        index = SpecIndex(SPEC)
+        assert index.validate("put", "/issues/12.json", data={"issue": {"status_id": 3}}) == ("valid", [], [])
+        assert index.validate("put", "/versions/3.json", data={"version": {}}) == ("unvalidated", [], [])
+
+
+class TestRedmineBatchTool:
+    """Tests for the redmine_batch() tool."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_dry_run_sends_nothing(self, mock_env, mocker):
+        """Test that dry_run validates every operation without any request."""
+        # Arrange
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+
+        # Act
+        result = await redmine_batch([
+            {"id": "ok", "method": "put", "path": "/issues/1.json", "data": {"issue": {"status_id": 3}}},
+            {"id": "bad", "method": "post", "path": "/issues.json", "data": {"subject": "no wrapper"}},
+        ], dry_run=True)
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        statuses = {row['id']: row['status'] for row in parsed['body']['operations']}
+        assert statuses == {'ok': 'valid', 'bad': 'invalid'}
+        assert parsed['error'] == '1 of 2 operations are invalid'
+        mock_request.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_runs_operations(self, mock_env, mock_async_client):
+        """Test that operations are sent over the pooled client and reported per operation."""
+        # Arrange
+        requests = []
+
+        def handler(req):
+            requests.append((req.method, req.url.path))
+            if req.url.path == '/issues/3.json':
+                return httpx.Response(404, json={'errors': ['Not found']})
+            return httpx.Response(204)
+
+        mock_async_client(handler)
+
+        # Act
+        result = await redmine_batch([{"method": "put", "path": f"/issues/{i}.json",
+                                       "data": {"issue": {"status_id": 5}}} for i in (1, 2, 3)])
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert sorted(requests) == [('PUT', '/issues/1.json'), ('PUT', '/issues/2.json'), ('PUT', '/issues/3.json')]
+        assert [row['status'] for row in parsed['body']['operations']] == ['ok', 'ok', 'failed']
+        assert parsed['meta']['ok'] == 2
+        assert parsed['meta']['failed'] == 1
+        assert parsed['error'] == '1 of 3 operations did not succeed'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_max_operations(self, mock_env, mocker):
+        """Test that oversized batches are rejected."""
+        # Arrange
+        mocker.patch('mcp_redmine.server.REDMINE_BATCH_MAX_OPERATIONS', 2)
+
+        # Act
+        parsed = yaml.safe_load(await redmine_batch([{"path": "/issues.json"}] * 3))
+
+        # Assert
+        assert parsed['status_code'] == 0
+        assert 'At most 2 operations' in parsed['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_post_is_never_resent(self, mock_env, mock_async_client):
+        """Test that a failing POST is sent once and a PUT only as often as its own retries allow."""
+        # Arrange
+        sent = []
+
+        def handler(req):
+            sent.append((req.method, req.url.path))
+            return httpx.Response(503)
+
+        mock_async_client(handler)
+
+        # Act
+        result = await redmine_batch([
+            {"id": "create", "method": "post", "path": "/issues.json", "data": {"issue": {"subject": "x"}}},
+            {"id": "update", "method": "put", "path": "/issues/1.json", "data": {"issue": {}}, "retries": 2},
+        ])
+
+        # Assert
+        rows = {row['id']: row for row in yaml.safe_load(result)['body']['operations']}
+        assert sent.count(('POST', '/issues.json')) == 1
+        assert sent.count(('PUT', '/issues/1.json')) == 3
+        assert rows['create']['attempts'] == 1
+        assert rows['update']['attempts'] == 3
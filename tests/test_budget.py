@@ -0,0 +1,241 @@
+"""
+Unit tests for the output budget in mcp_redmine.budget module.
+"""
+import json
+import pytest
+import yaml
+from mcp_redmine.budget import OutputBudget, ResultStore, main_list, parse_budget, shorten
+from mcp_redmine.formats import dump_json, dump_yaml
+
+
+def issues_result(count, description_length=100):
+    return {"status_code": 200, "error": "",
+            "body": {"issues": [{"id": i, "subject": f"Issue {i}", "description": "d" * description_length}
+                                for i in range(count)], "total_count": count}}
+
+
+class TestHelpers:
+    """Tests for budget parsing and the shortening helpers."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("value,expected", [
+        ("", 0), ("0", 0), ("60000", 60000), ("15000t", 60000), ("15000 tokens", 60000), (" 1 Token ", 4),
+    ])
+    def test_parse_budget(self, value, expected):
+        """Test that budgets are read as bytes or as tokens of about four bytes."""
+        # Assert
+        assert parse_budget(value) == expected
+
+    @pytest.mark.unit
+    def test_parse_budget_rejects_garbage(self):
+        """Test that an unreadable budget is reported."""
+        # Assert
+        with pytest.raises(ValueError, match="REDMINE_OUTPUT_BUDGET"):
+            parse_budget("lots")
+
+    @pytest.mark.unit
+    def test_shorten_marks_what_was_left_out(self):
+        """Test that long strings and lists are cut with a marker, and the input is left alone."""
+        # Arrange
+        node = {"notes": "abcdefghij", "ids": [1, 2, 3, 4], "nested": {"text": "abc"}}
+
+        # Act
+        result = shorten(node, max_chars=4, max_items=2)
+
+        # Assert
+        assert result == {"notes": "abcd… [6 more characters]", "ids": [1, 2, "… 2 more items"],
+                          "nested": {"text": "abc"}}
+        assert node["ids"] == [1, 2, 3, 4]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("body,expected", [
+        ({"issues": [1, 2, 3], "total_count": 3}, ("issues",)),
+        ({"issue": {"id": 1, "journals": [1, 2], "children": [1, 2, 3]}}, ("issue", "children")),
+        ([1, 2], ()),
+        ({"issue": {"id": 1, "journals": [1]}}, None),
+        (None, None),
+    ])
+    def test_main_list(self, body, expected):
+        """Test that the longest list in the top two levels is the one to page through."""
+        # Assert
+        assert main_list(body) == expected
+
+
+class TestResultStore:
+    """Tests for the store of full results."""
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used_by_size(self):
+        """Test that the store stays within its byte budget, dropping the least recently used first."""
+        # Arrange
+        store = ResultStore(max_bytes=100, ttl=60)
+        first, second = store.put("a", 40), store.put("b", 40)
+        store.get(first)
+
+        # Act
+        third = store.put("c", 40)
+
+        # Assert
+        assert store.get(second) is None
+        assert (store.get(first), store.get(third)) == ("a", "c")
+        assert store.put("huge", 101) is None
+        assert store.stats()["size"] == 80
+        assert store.stats()["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_entries_expire(self, mocker):
+        """Test that entries are dropped once their TTL has passed."""
+        # Arrange
+        clock = mocker.patch('mcp_redmine.budget.time.monotonic', return_value=100.0)
+        store = ResultStore(max_bytes=100, ttl=10)
+        entry_id = store.put("a", 1)
+
+        # Act
+        clock.return_value = 111.0
+
+        # Assert
+        assert store.get(entry_id) is None
+        assert store.stats()["expired"] == 1
+        assert store.stats()["size"] == 0
+
+
+class TestOutputBudget:
+    """Tests for cutting results down to the budget and continuing them."""
+
+    @pytest.mark.unit
+    def test_pages_through_main_list(self):
+        """Test that a long list is returned in parts that fit, ending without a continuation."""
+        # Arrange
+        budget = OutputBudget(1500, ResultStore(1 << 20, 60))
+        result = issues_result(40)
+
+        # Act
+        parts = [json.loads(budget.render(result, dump_json))]
+        while "continuation" in parts[-1]["meta"]["budget"]:
+            parts.append(json.loads(budget.resume(parts[-1]["meta"]["budget"]["continuation"], dump_json)))
+
+        # Assert
+        ids = [issue["id"] for part in parts for issue in part["body"]["issues"]]
+        assert ids == list(range(40))
+        assert len(parts) > 2
+        assert all(part["body"]["total_count"] == 40 for part in parts)
+        assert all(len(dump_json(part).encode()) <= 1500 for part in parts)
+        assert parts[-1]["meta"]["budget"]["remaining"] == 0
+
+    @pytest.mark.unit
+    def test_shortens_text_before_giving_up_items(self):
+        """Test that long strings are shortened and at least one item is always returned."""
+        # Arrange
+        budget = OutputBudget(600, ResultStore(1 << 20, 60))
+        result = issues_result(3, description_length=5000)
+
+        # Act
+        part = yaml.safe_load(budget.render(result, dump_yaml))
+
+        # Assert
+        issue = part["body"]["issues"][0]
+        assert issue["description"].endswith("… [4800 more characters]")
+        assert part["meta"]["budget"]["text_limit"] == 200
+        assert part["meta"]["budget"]["returned"] >= 1
+        assert result["body"]["issues"][0]["description"] == "d" * 5000
+
+    @pytest.mark.unit
+    def test_work_is_bounded_by_the_budget(self):
+        """Test that choosing the items dumps about as much as the budget, not the whole result over and over."""
+        # Arrange
+        budget = OutputBudget(2000, ResultStore(1 << 24, 60))
+        result = issues_result(2000)
+        full = dump_json(result)
+        dumped = []
+
+        def dump(obj):
+            text = dump_json(obj)
+            dumped.append(len(text))
+            return text
+
+        # Act
+        part = json.loads(budget.render(result, dump, size=len(full)))
+
+        # Assert
+        assert len(dump_json(part).encode()) <= 2000
+        assert part["meta"]["budget"]["returned"] >= 1
+        assert sum(dumped) < len(full) / 10
+
+    @pytest.mark.unit
+    def test_result_without_list_is_shortened(self):
+        """Test that a single large object is shortened as a whole."""
+        # Arrange
+        budget = OutputBudget(1000, ResultStore(1 << 20, 60))
+        result = {"status_code": 200, "error": "", "body": {"issue": {"id": 1, "description": "x" * 5000}}}
+
+        # Act
+        part = json.loads(budget.render(result, dump_json))
+
+        # Assert
+        assert part["body"]["issue"]["description"].startswith("x" * 500 + "…")
+        assert part["meta"]["budget"] == {"text_limit": 500, "list_limit": 20}
+
+    @pytest.mark.unit
+    def test_keeps_existing_meta(self):
+        """Test that the meta of the result, e.g. fetch_all's truncated flag, is kept next to the budget's."""
+        # Arrange
+        budget = OutputBudget(1500, ResultStore(1 << 20, 60))
+        result = {**issues_result(40), "meta": {"pages_fetched": 2, "truncated": False}}
+
+        # Act
+        part = json.loads(budget.render(result, dump_json))
+
+        # Assert
+        assert part["meta"]["pages_fetched"] == 2
+        assert part["meta"]["truncated"] is False
+        assert part["meta"]["budget"]["list"] == "issues"
+
+    @pytest.mark.unit
+    def test_unknown_handles(self):
+        """Test that unknown, expired or malformed handles give None."""
+        # Arrange
+        budget = OutputBudget(1000, ResultStore(1 << 20, 60))
+
+        # Assert
+        assert budget.resume("missing:10", dump_json) is None
+        assert budget.resume("garbage", dump_json) is None
+
+
+class TestYdOutputBudget:
+    """Tests for the output budget applied by yd() and redmine_continue()."""
+
+    @pytest.mark.unit
+    def test_yd_cuts_results_and_redmine_continue_resumes(self, mock_env, mocker):
+        """Test that results over REDMINE_OUTPUT_BUDGET are cut and continued from the server's copy."""
+        # Arrange
+        from mcp_redmine.server import redmine_continue, yd
+        mocker.patch('mcp_redmine.server.OUTPUT_BUDGET', OutputBudget(2000, ResultStore(1 << 20, 60)))
+
+        # Act
+        small = yaml.safe_load(yd(issues_result(2)))
+        first = yaml.safe_load(yd(issues_result(50)))
+        second = yaml.safe_load(redmine_continue(first["meta"]["budget"]["continuation"]))
+        expired = yaml.safe_load(redmine_continue("gone:5"))
+
+        # Assert
+        assert "meta" not in small
+        assert first["body"]["issues"][0]["id"] == 0
+        offset = first["meta"]["budget"]["returned"]
+        assert second["body"]["issues"][0]["id"] == offset
+        assert second["meta"]["budget"]["offset"] == offset
+        assert expired["status_code"] == 0
+        assert "Unknown or expired continuation handle" in expired["error"]
+
+    @pytest.mark.unit
+    def test_yd_leaves_other_output_alone(self, mock_env, mocker):
+        """Test that output not shaped like a request result is never cut."""
+        # Arrange
+        from mcp_redmine.server import yd
+        mocker.patch('mcp_redmine.server.OUTPUT_BUDGET', OutputBudget(100, ResultStore(1 << 20, 60)))
+        stats = {"cache": {"entries": list(range(100))}}
+
+        # Act
+        result = yd(stats)
+
+        # Assert
+        assert yaml.safe_load(result) == stats
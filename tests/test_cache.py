@@ -0,0 +1,258 @@
+"""
+Unit tests for the GET response cache in mcp_redmine.cache module and its use by arequest().
+"""
+import httpx
+import pytest
+from mcp_redmine.cache import ResponseCache, parse_ttls, resource_families
+from mcp_redmine.spec import Router
+from mcp_redmine.server import RESPONSE_CACHE, arequest, request
+
+
+class TestCacheHelpers:
+    """Tests for TTL parsing, template matching and resource families."""
+
+    @pytest.mark.unit
+    def test_parse_ttls(self):
+        """Test parsing of the REDMINE_CACHE_TTLS format."""
+        # Act
+        ttls = parse_ttls("/trackers.json=3600, projects/{id}.json=60,")
+
+        # Assert
+        assert ttls == [('/trackers.json', 3600.0), ('/projects/{id}.json', 60.0)]
+
+    @pytest.mark.unit
+    def test_parse_ttls_rejects_malformed_entry(self):
+        """Test that an entry without a TTL is rejected."""
+        # Act / Assert
+        with pytest.raises(ValueError):
+            parse_ttls("/trackers.json")
+
+    @pytest.mark.unit
+    def test_ttl_for_matches_templates(self):
+        """Test that concrete paths match their path template."""
+        # Arrange
+        cache = ResponseCache(parse_ttls("/projects/{id}.json=60,/projects.json=300"), 1024)
+
+        # Assert
+        assert cache.ttl_for('/projects/acme.json') == 60
+        assert cache.ttl_for('projects.json') == 300
+        assert cache.ttl_for('/projects/acme/issues.json') == 0
+
+    @pytest.mark.unit
+    def test_ttl_for_looks_up_spec_templates(self, mocker):
+        """Test that configured templates are matched to the spec's once and looked up by template after that."""
+        # Arrange
+        router = Router(['/projects/{projectId}.json', '/users/{userId}.json', '/issues/{issueId}.json'])
+        match = mocker.Mock(side_effect=router.match)
+        ttls = parse_ttls("/projects/{id}.json=60,/users/current.json=300,/news/{id}.json=30")
+        cache = ResponseCache(ttls, 1024, match=match)
+
+        # Act
+        project, user, current = (cache.ttl_for(path) for path in ('/projects/acme.json', '/users/5.json',
+                                                                    '/users/current.json'))
+
+        # Assert
+        assert (project, user, current) == (60, 0, 300)
+        assert cache.ttl_for('/news/3.json') == 30  # not in the spec: matched with its regex
+        assert cache.ttl_for('/issues/1.json') == 0
+        exact, by_template, patterns = cache._lookup
+        assert exact == {'/users/current.json': 300}
+        assert by_template == {'/projects/{projectId}.json': 60}
+        assert len(patterns) == 1
+        # Each configured template once, then once per path that is not configured as is.
+        assert match.call_count == 2 + 4
+
+    @pytest.mark.unit
+    def test_resource_families(self):
+        """Test that resource names are taken from the even path segments."""
+        # Assert
+        assert resource_families('/projects/foo/issues.json') == {'projects', 'issues'}
+        assert resource_families('/issues/123.json') == {'issues'}
+
+    @pytest.mark.unit
+    def test_lru_eviction_by_bytes(self):
+        """Test that the least recently used entries go first once the byte budget is exceeded."""
+        # Arrange
+        cache = ResponseCache([], max_bytes=1500)
+        for name in ('a', 'b', 'c'):
+            cache.store((name,), 200, b'x' * 200, {}, 60)
+        cache.lookup(('a',))
+
+        # Act
+        cache.store(('d',), 200, b'x' * 200, {}, 60)
+
+        # Assert
+        assert cache.lookup(('b',)) is None
+        assert cache.lookup(('a',)) is not None
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['bytes'] <= 1500
+
+    @pytest.mark.unit
+    def test_store_skipped_after_concurrent_invalidation(self):
+        """Test that a response fetched before a write is not cached after it."""
+        # Arrange
+        cache = ResponseCache([], max_bytes=10000)
+        generation = cache.generation
+        cache.invalidate('/projects/1.json')
+
+        # Act
+        cache.store(('/projects.json',), 200, b'{}', {}, 60, generation)
+
+        # Assert
+        assert cache.lookup(('/projects.json',)) is None
+
+
+class TestRequestCaching:
+    """Tests for caching in arequest() and request()."""
+
+    @staticmethod
+    def _handler(etag='"v1"'):
+        calls = []
+
+        def handler(req):
+            calls.append(req)
+            if req.headers.get('If-None-Match') == etag:
+                return httpx.Response(304, headers={'ETag': etag})
+            return httpx.Response(200, json={'trackers': [{'id': 1, 'name': 'Bug'}]}, headers={'ETag': etag})
+
+        return handler, calls
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_without_request(self, mock_env, mock_async_client):
+        """Test that a second GET within the TTL does not reach Redmine."""
+        # Arrange
+        handler, calls = self._handler()
+        mock_async_client(handler)
+
+        # Act
+        first = await arequest('/trackers.json')
+        second = await arequest('/trackers.json')
+
+        # Assert
+        assert len(calls) == 1
+        assert second['body'] == first['body']
+        assert second['meta']['cache'] == 'hit'
+        assert RESPONSE_CACHE.stats()['hits'] == 1
+        assert RESPONSE_CACHE.stats()['misses'] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_revalidated(self, mock_env, mock_async_client, mocker):
+        """Test that an expired entry is revalidated with If-None-Match and reused on 304."""
+        # Arrange
+        handler, calls = self._handler()
+        mock_async_client(handler)
+        await arequest('/trackers.json')
+        for entry in RESPONSE_CACHE.entries.values():
+            entry.expires = 0
+
+        # Act
+        result = await arequest('/trackers.json')
+
+        # Assert
+        assert len(calls) == 2
+        assert calls[1].headers['If-None-Match'] == '"v1"'
+        assert result['status_code'] == 200
+        assert result['body'] == {'trackers': [{'id': 1, 'name': 'Bug'}]}
+        assert result['meta']['cache'] == 'revalidated'
+        assert RESPONSE_CACHE.stats()['revalidated'] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_write_invalidates_family(self, mock_env, mock_async_client):
+        """Test that a PUT drops cached GETs of the same resource family."""
+        # Arrange
+        calls = []
+
+        def handler(req):
+            calls.append(req.method)
+            return httpx.Response(200, json={'projects': []})
+
+        mock_async_client(handler)
+        await arequest('/projects.json')
+
+        # Act
+        await arequest('/projects/1.json', method='put', data={'project': {'name': 'New'}})
+        await arequest('/projects.json')
+
+        # Assert
+        assert calls == ['GET', 'PUT', 'GET']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_params_are_part_of_key(self, mock_env, mock_async_client):
+        """Test that different query parameters are cached separately."""
+        # Arrange
+        handler, calls = self._handler()
+        mock_async_client(handler)
+
+        # Act
+        await arequest('/projects.json', params={'limit': 10})
+        await arequest('/projects.json', params={'limit': 20})
+        await arequest('/projects.json', params={'limit': 10})
+
+        # Assert
+        assert len(calls) == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_uncached_path_always_requested(self, mock_env, mock_async_client):
+        """Test that paths without a TTL are not cached."""
+        # Arrange
+        handler, calls = self._handler()
+        mock_async_client(handler)
+
+        # Act
+        await arequest('/issues.json')
+        await arequest('/issues.json')
+
+        # Assert
+        assert len(calls) == 2
+        assert RESPONSE_CACHE.stats()['misses'] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, mock_env, mock_async_client):
+        """Test that a failed GET is not stored."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(503, text='busy'))
+
+        # Act
+        await arequest('/trackers.json')
+
+        # Assert
+        assert RESPONSE_CACHE.stats()['entries'] == 0
+
+    @pytest.mark.unit
+    def test_sync_request_shares_cache(self, mock_env, mocker):
+        """Test that request() serves entries cached by arequest() and vice versa."""
+        # Arrange
+        handler, calls = self._handler()
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        mocker.patch('mcp_redmine.server.get_client', return_value=client)
+
+        # Act
+        request('/trackers.json')
+        result = request('/trackers.json')
+
+        # Assert
+        assert len(calls) == 1
+        assert result['meta']['cache'] == 'hit'
+
+
+class TestRedmineStatsTool:
+    """Tests for the redmine_stats() tool."""
+
+    @pytest.mark.unit
+    def test_reports_cache_counters(self):
+        """Test that cache counters are exposed."""
+        # Arrange
+        import yaml
+        from mcp_redmine.server import redmine_stats
+
+        # Act
+        parsed = yaml.safe_load(redmine_stats())
+
+        # Assert
+        assert {'hits', 'misses', 'hit_ratio', 'entries', 'bytes'} <= set(parsed['cache'])
@@ -5,7 +5,8 @@ import pytest
 import httpx
 import yaml
 from unittest.mock import Mock, patch, MagicMock
-from mcp_redmine.server import request, yd
+from mcp_redmine import server
+from mcp_redmine.server import request, arequest, yd, get_client, close_client
 
 
 class TestRequestFunction:
@@ -21,7 +22,7 @@ class TestRequestFunction:
         mock_response.json.return_value = {"data": "test"}
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         result = request('/test.json', method='get')
@@ -42,7 +43,7 @@ class TestRequestFunction:
         mock_response.json.return_value = {"issues": []}
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         result = request('/issues.json', method='get', params={'limit': 10})
@@ -62,7 +63,7 @@ class TestRequestFunction:
         mock_response.json.return_value = {"issue": {"id": 1}}
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         test_data = {"issue": {"subject": "Test", "project_id": 1}}
 
@@ -86,7 +87,7 @@ class TestRequestFunction:
         mock_response.json.return_value = {"upload": {"token": "abc"}}
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         result = request('/uploads.json', method='post',
@@ -109,7 +110,7 @@ class TestRequestFunction:
         mock_response.json.return_value = {}
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         request('/test.json')
@@ -128,7 +129,7 @@ class TestRequestFunction:
         mock_response.json.return_value = {}
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         request('/api/test.json')
@@ -152,7 +153,7 @@ class TestRequestFunction:
             response=error_response
         )
 
-        mock_httpx = mocker.patch('httpx.request', side_effect=http_error)
+        mock_httpx = mocker.patch('httpx.Client.request', side_effect=http_error)
 
         # Act
         result = request('/nonexistent.json')
@@ -166,7 +167,7 @@ class TestRequestFunction:
     def test_request_handles_connection_error(self, mock_env, mocker):
         """Test error handling for connection errors."""
         # Arrange
-        mock_httpx = mocker.patch('httpx.request',
+        mock_httpx = mocker.patch('httpx.Client.request',
                                  side_effect=httpx.ConnectError("Connection failed"))
 
         # Act
@@ -182,7 +183,7 @@ class TestRequestFunction:
     def test_request_handles_timeout(self, mock_env, mocker):
         """Test error handling for timeouts."""
         # Arrange
-        mock_httpx = mocker.patch('httpx.request',
+        mock_httpx = mocker.patch('httpx.Client.request',
                                  side_effect=httpx.TimeoutException("Request timed out"))
 
         # Act
@@ -201,7 +202,7 @@ class TestRequestFunction:
         mock_response.content = b''
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         result = request('/delete.json', method='delete')
@@ -221,7 +222,7 @@ class TestRequestFunction:
         mock_response.json.side_effect = ValueError("Not JSON")
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         result = request('/text.txt')
@@ -241,7 +242,7 @@ class TestRequestFunction:
         mock_response.json.return_value = {}
         mock_response.raise_for_status = Mock()
 
-        mock_httpx = mocker.patch('httpx.request', return_value=mock_response)
+        mock_httpx = mocker.patch('httpx.Client.request', return_value=mock_response)
 
         # Act
         request('/test.json')
@@ -251,6 +252,154 @@ class TestRequestFunction:
         assert call_args.kwargs['timeout'] == 60.0
 
 
+class TestAsyncRequestFunction:
+    """Tests for the arequest() coroutine."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arequest_success_with_json_response(self, mock_env, mock_async_client):
+        """Test successful async request with JSON response."""
+        # Arrange
+        seen = []
+
+        def handler(req):
+            seen.append(req)
+            return httpx.Response(200, json={"data": "test"})
+
+        mock_async_client(handler)
+
+        # Act
+        result = await arequest('/test.json', params={'limit': 10})
+
+        # Assert
+        assert result == {"status_code": 200, "body": {"data": "test"}, "error": ""}
+        assert str(seen[0].url) == 'https://test.redmine.example.com/test.json?limit=10'
+        assert seen[0].headers['X-Redmine-API-Key'] == 'test_api_key_12345'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arequest_handles_http_error(self, mock_env, mock_async_client):
+        """Test error handling for HTTP errors."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(422, json={"errors": ["Subject cannot be blank"]}))
+
+        # Act
+        result = await arequest('/issues.json', method='post', data={"issue": {}})
+
+        # Assert
+        assert result['status_code'] == 422
+        assert result['body'] == {"errors": ["Subject cannot be blank"]}
+        assert 'HTTPStatusError' in result['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arequest_handles_connection_error(self, mock_env, mock_async_client):
+        """Test error handling for connection errors."""
+        # Arrange
+        def handler(req):
+            raise httpx.ConnectError("Connection failed")
+
+        mock_async_client(handler)
+
+        # Act
+        result = await arequest('/test.json')
+
+        # Assert
+        assert result['status_code'] == 0
+        assert result['body'] is None
+        assert 'ConnectError' in result['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arequest_runs_concurrently(self, mock_env, mocker):
+        """Test that concurrent calls overlap instead of running one after another."""
+        # Arrange
+        import asyncio
+        in_flight = 0
+        peak = 0
+
+        async def slow_request(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={}, request=httpx.Request('GET', kwargs['url']))
+
+        client = Mock()
+        client.request = slow_request
+        mocker.patch('mcp_redmine.server.get_async_client', return_value=client)
+
+        # Act
+        await asyncio.gather(*(arequest(f'/test/{i}.json') for i in range(5)))
+
+        # Assert
+        assert peak == 5
+
+
+class TestHttpClient:
+    """Tests for the pooled httpx client behind request()."""
+
+    @pytest.mark.unit
+    def test_get_client_reuses_instance(self):
+        """Test that repeated calls share one pooled client."""
+        # Act
+        first = get_client()
+        second = get_client()
+
+        # Assert
+        assert first is second
+        assert isinstance(first, httpx.Client)
+
+    @pytest.mark.unit
+    def test_close_client_recreates_on_next_use(self):
+        """Test that a closed client is replaced on the next call."""
+        # Arrange
+        first = get_client()
+
+        # Act
+        close_client()
+        second = get_client()
+
+        # Assert
+        assert first.is_closed
+        assert second is not first
+        assert not second.is_closed
+
+    @pytest.mark.unit
+    def test_get_client_recreated_after_fork(self, mocker):
+        """Test that a client inherited from another process is not reused."""
+        # Arrange
+        first = get_client()
+        mocker.patch('mcp_redmine.server.os.getpid', return_value=server._client_pid + 1)
+
+        # Act
+        second = get_client()
+
+        # Assert
+        assert second is not first
+
+    @pytest.mark.unit
+    def test_request_uses_pooled_client(self, mock_env, mocker):
+        """Test that request() goes through the shared client."""
+        # Arrange
+        mock_response = Mock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.content = b'{}'
+        mock_response.json.return_value = {}
+        mock_response.raise_for_status = Mock()
+        client = Mock()
+        client.request.return_value = mock_response
+        mocker.patch('mcp_redmine.server.get_client', return_value=client)
+
+        # Act
+        request('/test.json')
+        request('/test.json')
+
+        # Assert
+        assert client.request.call_count == 2
+
+
 class TestYdFunction:
     """Tests for the yd() YAML dump function."""
 
@@ -1,21 +1,23 @@
 """
 Unit tests for file operation tools in mcp_redmine.server module.
 """
+import httpx
 import pytest
 import yaml
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
-from mcp_redmine.server import redmine_upload, redmine_download
+from mcp_redmine.server import redmine_upload, redmine_download, redmine_download_attachments, file_chunks
 
 
 class TestRedmineUploadTool:
     """Tests for the redmine_upload() tool."""
 
     @pytest.mark.unit
-    def test_upload_success(self, mock_env, temp_file, mocker):
+    @pytest.mark.asyncio
+    async def test_upload_success(self, mock_env, temp_file, mocker):
         """Test successful file upload."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 201,
             'body': {
@@ -28,7 +30,7 @@ class TestRedmineUploadTool:
         }
 
         # Act
-        result = redmine_upload(str(temp_file))
+        result = await redmine_upload(str(temp_file))
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -44,10 +46,11 @@ class TestRedmineUploadTool:
         assert temp_file.name in call_args.kwargs['params']['filename']
 
     @pytest.mark.unit
-    def test_upload_with_description(self, mock_env, temp_file, mocker):
+    @pytest.mark.asyncio
+    async def test_upload_with_description(self, mock_env, temp_file, mocker):
         """Test file upload with description."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 201,
             'body': {'upload': {'id': 1, 'token': 'token'}},
@@ -55,17 +58,18 @@ class TestRedmineUploadTool:
         }
 
         # Act
-        result = redmine_upload(str(temp_file), description="Test description")
+        result = await redmine_upload(str(temp_file), description="Test description")
 
         # Assert
         call_args = mock_request.call_args
         assert call_args.kwargs['params']['description'] == "Test description"
 
     @pytest.mark.unit
-    def test_upload_file_not_found(self, mock_env):
+    @pytest.mark.asyncio
+    async def test_upload_file_not_found(self, mock_env):
         """Test upload with non-existent file."""
         # Act
-        result = redmine_upload('/nonexistent/file.txt')
+        result = await redmine_upload('/nonexistent/file.txt')
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -75,10 +79,11 @@ class TestRedmineUploadTool:
         assert 'does not exist' in parsed['error']
 
     @pytest.mark.unit
-    def test_upload_relative_path(self, mock_env):
+    @pytest.mark.asyncio
+    async def test_upload_relative_path(self, mock_env):
         """Test upload rejects relative path."""
         # Act
-        result = redmine_upload('relative/path/file.txt')
+        result = await redmine_upload('relative/path/file.txt')
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -86,10 +91,11 @@ class TestRedmineUploadTool:
         assert 'must be fully qualified' in parsed['error']
 
     @pytest.mark.unit
-    def test_upload_reads_file_content(self, mock_env, temp_file, mocker):
+    @pytest.mark.asyncio
+    async def test_upload_reads_file_content(self, mock_env, temp_file, mocker):
         """Test that upload reads file content correctly."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 201,
             'body': {'upload': {'id': 1, 'token': 'token'}},
@@ -97,18 +103,79 @@ class TestRedmineUploadTool:
         }
 
         # Act
-        redmine_upload(str(temp_file))
+        await redmine_upload(str(temp_file))
 
         # Assert
         call_args = mock_request.call_args
-        content = call_args.kwargs['content']
-        assert b'Test file content' in content
+        content = b''.join([chunk async for chunk in call_args.kwargs['content']])
+        assert content == b'Test file content'
+        assert call_args.kwargs['headers']['Content-Length'] == str(len(content))
 
     @pytest.mark.unit
-    def test_upload_handles_request_error(self, mock_env, temp_file, mocker):
+    @pytest.mark.asyncio
+    async def test_upload_streams_file(self, mock_env, temp_dir, mock_async_client):
+        """Test that the file body reaches Redmine with its length and throughput is reported."""
+        # Arrange
+        upload = temp_dir / 'artifact.bin'
+        upload.write_bytes(b'0123456789')
+        received = {}
+
+        def handler(req):
+            received['body'] = req.read()
+            received['length'] = req.headers['Content-Length']
+            return httpx.Response(201, json={'upload': {'id': 1, 'token': '1.abc'}})
+
+        mock_async_client(handler)
+
+        # Act
+        result = await redmine_upload(str(upload))
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 201
+        assert received['body'] == b'0123456789'
+        assert received['length'] == '10'
+        assert parsed['meta']['bytes'] == 10
+        assert 'elapsed_seconds' in parsed['meta']
+        assert 'bytes_per_second' in parsed['meta']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_file_chunks_reads_in_chunk_size_pieces(self, temp_dir):
+        """Test that file_chunks() never yields more than chunk_size bytes at a time."""
+        # Arrange
+        upload = temp_dir / 'artifact.bin'
+        upload.write_bytes(b'0123456789')
+
+        # Act
+        chunks = [chunk async for chunk in file_chunks(upload, 4)]
+
+        # Assert
+        assert chunks == [b'0123', b'4567', b'89']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_upload_rejects_file_over_max_size(self, mock_env, temp_file, mocker):
+        """Test that files over REDMINE_UPLOAD_MAX_SIZE are rejected before anything is sent."""
+        # Arrange
+        mocker.patch('mcp_redmine.server.REDMINE_UPLOAD_MAX_SIZE', 5)
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+
+        # Act
+        result = await redmine_upload(str(temp_file))
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 0
+        assert 'REDMINE_UPLOAD_MAX_SIZE' in parsed['error']
+        mock_request.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_upload_handles_request_error(self, mock_env, temp_file, mocker):
         """Test upload handles request errors."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 500,
             'body': {'error': 'Server error'},
@@ -116,17 +183,18 @@ class TestRedmineUploadTool:
         }
 
         # Act
-        result = redmine_upload(str(temp_file))
+        result = await redmine_upload(str(temp_file))
 
         # Assert
         parsed = yaml.safe_load(result)
         assert parsed['status_code'] == 500
 
     @pytest.mark.unit
-    def test_upload_expanduser_path(self, mock_env, mocker):
+    @pytest.mark.asyncio
+    async def test_upload_expanduser_path(self, mock_env, mocker):
         """Test that upload expands user home directory."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 201,
             'body': {'upload': {'id': 1, 'token': 'token'}},
@@ -141,7 +209,7 @@ class TestRedmineUploadTool:
 
         try:
             # Act - this should work if the file exists
-            result = redmine_upload(temp_path)
+            result = await redmine_upload(temp_path)
 
             # Assert - should succeed
             parsed = yaml.safe_load(result)
@@ -151,44 +219,82 @@ class TestRedmineUploadTool:
             Path(temp_path).unlink(missing_ok=True)
 
 
+def attachment_server(files: dict, fail_after: int = None, failures: int = 1):
+    """MockTransport handler serving attachment metadata and Range-aware downloads.
+
+    files maps attachment id to (filename, content). With fail_after, the first `failures` download responses
+    are cut off after that many bytes.
+    """
+    requests = []
+    downloads = []
+
+    def handler(req):
+        requests.append(req)
+        parts = req.url.path.strip('/').split('/')
+        if parts[0] == 'issues' and len(parts) == 2:
+            attachments = [{'id': i, 'filename': name, 'filesize': len(content)}
+                           for i, (name, content) in files.items()]
+            return httpx.Response(200, json={'issue': {'id': int(parts[1].split('.')[0]), 'attachments': attachments}})
+        if parts[0] == 'attachments' and len(parts) == 2:
+            attachment_id = int(parts[1].split('.')[0])
+            if attachment_id not in files:
+                return httpx.Response(404, json={'errors': ['Not found']})
+            filename, content = files[attachment_id]
+            return httpx.Response(200, json={'attachment': {'id': attachment_id, 'filename': filename,
+                                                            'filesize': len(content)}})
+        if parts[:2] == ['attachments', 'download'] and int(parts[2]) in files:
+            content = files[int(parts[2])][1]
+            start = 0
+            if 'Range' in req.headers:
+                start = int(req.headers['Range'].split('=')[1].rstrip('-'))
+                if start >= len(content):
+                    return httpx.Response(416, headers={'Content-Range': f'bytes */{len(content)}'})
+            body = content[start:]
+            downloads.append(start)
+            headers = {'Content-Length': str(len(body))}
+            if start:
+                headers['Content-Range'] = f'bytes {start}-{len(content) - 1}/{len(content)}'
+            status_code = 206 if start else 200
+            if fail_after is not None and len(downloads) <= failures:
+                return httpx.Response(status_code, headers=headers, stream=TruncatedStream(body[:fail_after]))
+            return httpx.Response(status_code, headers=headers, content=body)
+        return httpx.Response(404, json={'errors': ['Not found']})
+
+    handler.requests = requests
+    return handler
+
+
+class TruncatedStream(httpx.AsyncByteStream):
+    """Response body that breaks off like a dropped connection."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+        raise httpx.ReadError("connection reset")
+
+
 class TestRedmineDownloadTool:
     """Tests for the redmine_download() tool."""
 
     @pytest.mark.unit
-    def test_download_success(self, mock_env, temp_dir, mocker):
+    @pytest.mark.asyncio
+    async def test_download_success(self, mock_env, temp_dir, mock_async_client):
         """Test successful file download."""
         # Arrange
         save_path = temp_dir / 'downloaded_file.pdf'
-
-        mock_request = mocker.patch('mcp_redmine.server.request')
-        # First call: get attachment info
-        # Second call: download file
-        mock_request.side_effect = [
-            {
-                'status_code': 200,
-                'body': {
-                    'attachment': {
-                        'id': 1,
-                        'filename': 'test_file.pdf'
-                    }
-                },
-                'error': ''
-            },
-            {
-                'status_code': 200,
-                'body': b'PDF file content here',
-                'error': ''
-            }
-        ]
+        mock_async_client(attachment_server({1: ('test_file.pdf', b'PDF file content here')}))
 
         # Act
-        result = redmine_download(1, str(save_path))
+        result = await redmine_download(1, str(save_path))
 
         # Assert
         parsed = yaml.safe_load(result)
         assert parsed['status_code'] == 200
         assert parsed['body']['saved_to'] == str(save_path)
         assert parsed['body']['filename'] == 'test_file.pdf'
+        assert parsed['body']['size'] == 21
         assert save_path.exists()
 
         # Verify file content
@@ -197,34 +303,32 @@ class TestRedmineDownloadTool:
         assert content == b'PDF file content here'
 
     @pytest.mark.unit
-    def test_download_with_explicit_filename(self, mock_env, temp_dir, mocker):
+    @pytest.mark.asyncio
+    async def test_download_with_explicit_filename(self, mock_env, temp_dir, mock_async_client):
         """Test download with explicit filename."""
         # Arrange
         save_path = temp_dir / 'custom_name.pdf'
-
-        mock_request = mocker.patch('mcp_redmine.server.request')
-        mock_request.return_value = {
-            'status_code': 200,
-            'body': b'file content',
-            'error': ''
-        }
+        handler = attachment_server({1: ('custom_name.pdf', b'file content')})
+        mock_async_client(handler)
 
         # Act
-        result = redmine_download(1, str(save_path), filename='custom_name.pdf')
+        result = await redmine_download(1, str(save_path), filename='custom_name.pdf')
 
         # Assert
         parsed = yaml.safe_load(result)
         assert parsed['status_code'] == 200
         assert parsed['body']['filename'] == 'custom_name.pdf'
+        assert save_path.read_bytes() == b'file content'
 
-        # Should only call request once (no attachment info fetch)
-        assert mock_request.call_count == 1
+        # Should only make one request (no attachment info fetch)
+        assert len(handler.requests) == 1
 
     @pytest.mark.unit
-    def test_download_relative_path(self, mock_env):
+    @pytest.mark.asyncio
+    async def test_download_relative_path(self, mock_env):
         """Test download rejects relative path."""
         # Act
-        result = redmine_download(1, 'relative/path.pdf')
+        result = await redmine_download(1, 'relative/path.pdf')
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -232,10 +336,11 @@ class TestRedmineDownloadTool:
         assert 'must be fully qualified' in parsed['error']
 
     @pytest.mark.unit
-    def test_download_directory_path(self, mock_env, temp_dir):
+    @pytest.mark.asyncio
+    async def test_download_directory_path(self, mock_env, temp_dir):
         """Test download rejects directory path."""
         # Act
-        result = redmine_download(1, str(temp_dir))
+        result = await redmine_download(1, str(temp_dir))
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -243,153 +348,158 @@ class TestRedmineDownloadTool:
         assert "can't be a directory" in parsed['error']
 
     @pytest.mark.unit
-    def test_download_attachment_not_found(self, mock_env, temp_dir, mocker):
+    @pytest.mark.asyncio
+    async def test_download_attachment_not_found(self, mock_env, temp_dir, mock_async_client):
         """Test download when attachment not found."""
         # Arrange
         save_path = temp_dir / 'file.pdf'
-
-        mock_request = mocker.patch('mcp_redmine.server.request')
-        mock_request.return_value = {
-            'status_code': 404,
-            'body': {'error': 'Not found'},
-            'error': 'HTTPStatusError: 404 Not Found'
-        }
+        mock_async_client(attachment_server({}))
 
         # Act
-        result = redmine_download(999, str(save_path))
+        result = await redmine_download(999, str(save_path))
 
         # Assert
         parsed = yaml.safe_load(result)
         assert parsed['status_code'] == 404
 
     @pytest.mark.unit
-    def test_download_handles_download_error(self, mock_env, temp_dir, mocker):
+    @pytest.mark.asyncio
+    async def test_download_handles_download_error(self, mock_env, temp_dir, mock_async_client):
         """Test download handles errors during file download."""
         # Arrange
         save_path = temp_dir / 'file.pdf'
 
-        mock_request = mocker.patch('mcp_redmine.server.request')
-        mock_request.side_effect = [
-            {
-                'status_code': 200,
-                'body': {'attachment': {'id': 1, 'filename': 'test.pdf'}},
-                'error': ''
-            },
-            {
-                'status_code': 500,
-                'body': None,
-                'error': 'Server error'
-            }
-        ]
+        def handler(req):
+            if req.url.path.endswith('/attachments/1.json'):
+                return httpx.Response(200, json={'attachment': {'id': 1, 'filename': 'test.pdf', 'filesize': 3}})
+            return httpx.Response(500, text='Server error')
+
+        mock_async_client(handler)
 
         # Act
-        result = redmine_download(1, str(save_path))
+        result = await redmine_download(1, str(save_path))
 
         # Assert
         parsed = yaml.safe_load(result)
         assert parsed['status_code'] == 500
+        assert not save_path.exists()
 
     @pytest.mark.unit
-    def test_download_empty_body(self, mock_env, temp_dir, mocker):
-        """Test download with empty response body."""
+    @pytest.mark.asyncio
+    async def test_download_empty_file(self, mock_env, temp_dir, mock_async_client):
+        """Test download of an empty attachment."""
         # Arrange
         save_path = temp_dir / 'file.pdf'
-
-        mock_request = mocker.patch('mcp_redmine.server.request')
-        mock_request.side_effect = [
-            {
-                'status_code': 200,
-                'body': {'attachment': {'id': 1, 'filename': 'test.pdf'}},
-                'error': ''
-            },
-            {
-                'status_code': 200,
-                'body': None,  # Empty body
-                'error': ''
-            }
-        ]
+        mock_async_client(attachment_server({1: ('test.pdf', b'')}))
 
         # Act
-        result = redmine_download(1, str(save_path))
+        result = await redmine_download(1, str(save_path))
 
         # Assert
         parsed = yaml.safe_load(result)
-        # Should return the response as-is when body is None/empty
         assert parsed['status_code'] == 200
+        assert parsed['body']['size'] == 0
+        assert save_path.read_bytes() == b''
 
     @pytest.mark.unit
-    def test_download_creates_file(self, mock_env, temp_dir, mocker):
-        """Test that download creates the file."""
+    @pytest.mark.asyncio
+    async def test_download_constructs_correct_url(self, mock_env, temp_dir, mock_async_client):
+        """Test that download constructs correct download URL."""
         # Arrange
-        save_path = temp_dir / 'new_file.txt'
-        assert not save_path.exists()
+        save_path = temp_dir / 'file.pdf'
+        handler = attachment_server({123: ('document.pdf', b'content')})
+        mock_async_client(handler)
 
-        mock_request = mocker.patch('mcp_redmine.server.request')
-        mock_request.side_effect = [
-            {
-                'status_code': 200,
-                'body': {'attachment': {'id': 1, 'filename': 'test.txt'}},
-                'error': ''
-            },
-            {
-                'status_code': 200,
-                'body': b'test content',
-                'error': ''
-            }
-        ]
+        # Act
+        await redmine_download(123, str(save_path))
+
+        # Assert
+        # First request should get attachment info, second should download
+        assert handler.requests[0].url.path == '/attachments/123.json'
+        assert handler.requests[1].url.path == '/attachments/download/123/document.pdf'
+        assert handler.requests[1].headers['X-Redmine-API-Key'] == 'test_api_key_12345'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_download_resumes_with_range(self, mock_env, temp_dir, mock_async_client):
+        """Test that a download cut off mid-transfer is resumed from where it stopped."""
+        # Arrange
+        save_path = temp_dir / 'big.bin'
+        content = bytes(range(256)) * 4
+        handler = attachment_server({5: ('big.bin', content)}, fail_after=300)
+        mock_async_client(handler)
 
         # Act
-        result = redmine_download(1, str(save_path))
+        result = await redmine_download(5, str(save_path))
 
         # Assert
-        assert save_path.exists()
         parsed = yaml.safe_load(result)
         assert parsed['status_code'] == 200
+        assert save_path.read_bytes() == content
+        assert handler.requests[2].headers['Range'] == 'bytes=300-'
+        assert parsed['meta']['resumed_from'] == 300
+        assert parsed['meta']['bytes'] == len(content)
+        assert list(temp_dir.glob('*.part')) == []
 
     @pytest.mark.unit
-    def test_download_constructs_correct_url(self, mock_env, temp_dir, mocker):
-        """Test that download constructs correct download URL."""
+    @pytest.mark.asyncio
+    async def test_download_resumes_part_file_from_earlier_call(self, mock_env, temp_dir, mock_async_client):
+        """Test that a .part file left by a failed call is picked up by the next one."""
+        # Arrange
+        save_path = temp_dir / 'big.bin'
+        content = b'x' * 10000
+        mock_async_client(attachment_server({5: ('big.bin', content)}, fail_after=400, failures=3))
+        failed = yaml.safe_load(await redmine_download(5, str(save_path)))
+        handler = attachment_server({5: ('big.bin', content)})
+        mock_async_client(handler)
+
+        # Act
+        result = await redmine_download(5, str(save_path))
+
+        # Assert
+        assert failed['status_code'] == 0
+        assert 'ReadError' in failed['error']
+        parsed = yaml.safe_load(result)
+        assert parsed['meta']['resumed_from'] == 1200
+        assert parsed['meta']['bytes'] == 8800
+        assert save_path.read_bytes() == content
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_download_rejects_size_mismatch(self, mock_env, temp_dir, mock_async_client):
+        """Test that a file whose size differs from the attachment's filesize is not saved."""
         # Arrange
         save_path = temp_dir / 'file.pdf'
 
-        mock_request = mocker.patch('mcp_redmine.server.request')
-        mock_request.side_effect = [
-            {
-                'status_code': 200,
-                'body': {'attachment': {'id': 1, 'filename': 'document.pdf'}},
-                'error': ''
-            },
-            {
-                'status_code': 200,
-                'body': b'content',
-                'error': ''
-            }
-        ]
+        def handler(req):
+            if req.url.path.endswith('/attachments/1.json'):
+                return httpx.Response(200, json={'attachment': {'id': 1, 'filename': 'f.pdf', 'filesize': 100}})
+            return httpx.Response(200, content=b'short')
+
+        mock_async_client(handler)
 
         # Act
-        redmine_download(123, str(save_path))
+        result = await redmine_download(1, str(save_path))
 
         # Assert
-        # First call should be to get attachment info
-        first_call = mock_request.call_args_list[0]
-        assert first_call.args[0] == 'attachments/123.json'
-
-        # Second call should be to download
-        second_call = mock_request.call_args_list[1]
-        assert second_call.args[0] == 'attachments/download/123/document.pdf'
-        assert second_call.kwargs['content_type'] == 'application/octet-stream'
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 0
+        assert '100 bytes' in parsed['error']
+        assert not save_path.exists()
+        assert list(temp_dir.glob('*.part')) == []
 
     @pytest.mark.unit
-    def test_download_exception_handling(self, mock_env, temp_dir, mocker):
+    @pytest.mark.asyncio
+    async def test_download_exception_handling(self, mock_env, temp_dir, mocker):
         """Test download handles unexpected exceptions."""
         # Arrange
         save_path = temp_dir / 'file.pdf'
 
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.side_effect = Exception("Unexpected error")
 
         # Act
-        result = redmine_download(1, str(save_path))
+        result = await redmine_download(1, str(save_path))
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -397,3 +507,132 @@ class TestRedmineDownloadTool:
         assert parsed['body'] is None
         assert 'Exception' in parsed['error']
         assert 'Unexpected error' in parsed['error']
+
+
+class TestRedmineDownloadAttachmentsTool:
+    """Tests for the redmine_download_attachments() tool."""
+
+    FILES = {
+        1: ('screenshot.png', b'first screenshot'),
+        2: ('log.txt', b'log line\n' * 100),
+        3: ('screenshot.png', b'second screenshot'),
+    }
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_downloads_all_issue_attachments(self, mock_env, temp_dir, mock_async_client):
+        """Test that every attachment of an issue is saved, with names and sizes from the issue payload."""
+        # Arrange
+        import hashlib
+        handler = attachment_server(self.FILES)
+        mock_async_client(handler)
+        target = temp_dir / 'issue-42'
+
+        # Act
+        result = await redmine_download_attachments(str(target), issue_id=42)
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 200
+        assert parsed['error'] == ''
+        assert parsed['body']['failures'] == []
+        files = {f['id']: f for f in parsed['body']['files']}
+        assert files[1]['saved_to'] == str(target / 'screenshot.png')
+        assert files[3]['saved_to'] == str(target / '3_screenshot.png')
+        assert (target / '3_screenshot.png').read_bytes() == b'second screenshot'
+        assert files[2]['size'] == 900
+        assert files[2]['sha256'] == hashlib.sha256(b'log line\n' * 100).hexdigest()
+        assert parsed['meta']['files'] == 3
+
+        # One issue request, then only downloads
+        paths = [req.url.path for req in handler.requests]
+        assert paths[0] == '/issues/42.json'
+        assert handler.requests[0].url.params['include'] == 'attachments'
+        assert all(path.startswith('/attachments/download/') for path in paths[1:])
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_downloads_attachment_ids_and_reports_failures(self, mock_env, temp_dir, mock_async_client):
+        """Test downloading by attachment ID, with unknown IDs listed as failures."""
+        # Arrange
+        mock_async_client(attachment_server(self.FILES))
+
+        # Act
+        result = await redmine_download_attachments(str(temp_dir), attachment_ids=[2, 99])
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert [f['id'] for f in parsed['body']['files']] == [2]
+        assert [f['id'] for f in parsed['body']['failures']] == [99]
+        assert parsed['error'] == '1 of 2 attachments failed'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_limit(self, mock_env, temp_dir, mock_async_client, mocker):
+        """Test that no more than REDMINE_DOWNLOAD_CONCURRENCY downloads run at once."""
+        # Arrange
+        import asyncio
+        mocker.patch('mcp_redmine.server.REDMINE_DOWNLOAD_CONCURRENCY', 2)
+        files = {i: (f'file{i}.bin', b'data') for i in range(1, 7)}
+        serve = attachment_server(files)
+        active, peak = 0, 0
+
+        async def handler(req):
+            nonlocal active, peak
+            if '/download/' not in req.url.path:
+                return serve(req)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return serve(req)
+
+        mock_async_client(handler)
+
+        # Act
+        result = await redmine_download_attachments(str(temp_dir), issue_id=1)
+
+        # Assert
+        assert len(yaml.safe_load(result)['body']['files']) == 6
+        assert peak == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_filenames_cannot_escape_target_dir(self, mock_env, temp_dir, mock_async_client):
+        """Test that path components in attachment filenames are dropped."""
+        # Arrange
+        mock_async_client(attachment_server({1: ('../../evil.sh', b'#!/bin/sh')}))
+        target = temp_dir / 'out'
+
+        # Act
+        result = await redmine_download_attachments(str(target), issue_id=1)
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['body']['files'][0]['saved_to'] == str(target / 'evil.sh')
+        assert not (temp_dir / 'evil.sh').exists()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_requires_issue_or_attachment_ids(self, mock_env, temp_dir):
+        """Test that exactly one of issue_id and attachment_ids must be given."""
+        # Act
+        neither = yaml.safe_load(await redmine_download_attachments(str(temp_dir)))
+        both = yaml.safe_load(await redmine_download_attachments(str(temp_dir), issue_id=1, attachment_ids=[1]))
+
+        # Assert
+        assert 'either issue_id or attachment_ids' in neither['error']
+        assert 'either issue_id or attachment_ids' in both['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_issue_not_found(self, mock_env, temp_dir, mock_async_client):
+        """Test that a failed issue lookup is returned as is."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(404, json={'errors': ['Not found']}))
+
+        # Act
+        result = await redmine_download_attachments(str(temp_dir), issue_id=999)
+
+        # Assert
+        assert yaml.safe_load(result)['status_code'] == 404
@@ -0,0 +1,198 @@
+"""
+Unit tests for the tool output serializers in mcp_redmine.formats module.
+"""
+import json
+import pytest
+import yaml
+from mcp_redmine import formats
+from mcp_redmine.formats import SERIALIZERS, dump_json, dump_lean, dump_yaml, join_mappings
+
+
+class TestDumpYaml:
+    """Tests for dump_yaml()."""
+
+    @pytest.mark.unit
+    def test_matches_pure_python_dumper(self, sample_issue_data):
+        """Test that output is identical to yaml.safe_dump with the same options."""
+        # Act
+        result = dump_yaml(sample_issue_data)
+
+        # Assert
+        assert result == yaml.safe_dump(sample_issue_data, allow_unicode=True, sort_keys=False, width=4096)
+
+    @pytest.mark.unit
+    def test_keeps_characters_outside_bmp(self):
+        """Test that emoji are written as-is rather than escaped."""
+        # Act
+        result = dump_yaml({"note": "deployed 🚀"})
+
+        # Assert
+        assert "🚀" in result
+        assert yaml.safe_load(result) == {"note": "deployed 🚀"}
+
+    @pytest.mark.unit
+    def test_backslash_u_alone_is_dumped_once(self, mocker):
+        """Test that Windows paths like C:\\Users are not mistaken for escaped emoji and dumped twice."""
+        # Arrange
+        if formats.YAML_DUMPER is yaml.SafeDumper:
+            pytest.skip("libyaml is not available")
+        dump = mocker.spy(formats.yaml, 'dump')
+        data = {"path": "C:\\Users\\dev\\AppData", "quoted": "\"x\": C:\\Users\\dev", "note": "deployed 🚀"}
+
+        # Act
+        plain = dump_yaml({key: data[key] for key in ("path", "quoted")})
+        calls = dump.call_count
+        with_emoji = dump_yaml(data)
+
+        # Assert
+        assert calls == 1
+        assert dump.call_count == 3
+        assert yaml.safe_load(plain) == {key: data[key] for key in ("path", "quoted")}
+        assert yaml.safe_load(with_emoji) == data
+
+
+class TestDumpJson:
+    """Tests for dump_json()."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("use_orjson", [False, True])
+    def test_compact_round_trip(self, mocker, use_orjson):
+        """Test that output is compact JSON that parses back to the input."""
+        # Arrange
+        if use_orjson and formats.orjson is None:
+            pytest.skip("orjson is not installed")
+        if not use_orjson:
+            mocker.patch('mcp_redmine.formats.orjson', None)
+        data = {"status_code": 200, "body": {"issues": [{"id": 1, "subject": "Größe"}]}, "error": ""}
+
+        # Act
+        result = dump_json(data)
+
+        # Assert
+        assert json.loads(result) == data
+        assert ": " not in result
+        assert "Größe" in result
+
+    @pytest.mark.unit
+    def test_encodes_bytes_as_text(self, mocker):
+        """Test that raw response bodies do not break serialization."""
+        # Arrange
+        mocker.patch('mcp_redmine.formats.orjson', None)
+
+        # Act
+        result = dump_json({"body": b"plain text"})
+
+        # Assert
+        assert json.loads(result) == {"body": "plain text"}
+
+
+class TestDumpLean:
+    """Tests for dump_lean()."""
+
+    @pytest.mark.unit
+    def test_collection_becomes_table(self):
+        """Test that a list of objects is written as a header and one row per item."""
+        # Arrange
+        data = {"issues": [
+            {"id": 1, "subject": "Fix login", "status": {"id": 1, "name": "New"}},
+            {"id": 2, "subject": "Crash, on export", "status": {"id": 2, "name": "In Progress"}},
+        ], "total_count": 2}
+
+        # Act
+        result = dump_lean(data)
+
+        # Assert
+        assert result.splitlines() == [
+            "issues[2]{id,subject,status.id,status.name}:",
+            "  1,Fix login,1,New",
+            '  2,"Crash, on export",2,In Progress',
+            "total_count: 2",
+        ]
+
+    @pytest.mark.unit
+    def test_missing_keys_and_nested_lists(self):
+        """Test that missing keys are empty cells and nested lists are inline JSON."""
+        # Arrange
+        data = [
+            {"id": 1, "assigned_to": {"id": 5, "name": "Ann"}, "custom_fields": [{"id": 1, "value": "x"}]},
+            {"id": 2, "custom_fields": []},
+        ]
+
+        # Act
+        result = dump_lean(data)
+
+        # Assert
+        lines = result.splitlines()
+        assert lines[0] == "[2]{id,assigned_to.id,assigned_to.name,custom_fields}:"
+        assert lines[1] == '  1,5,Ann,[{"id":1,"value":"x"}]'
+        assert lines[2] == "  2,,,[]"
+
+    @pytest.mark.unit
+    def test_quotes_ambiguous_scalars(self):
+        """Test that strings that would read as another type or span lines are quoted."""
+        # Act
+        result = dump_lean({"a": "123", "b": "true", "c": "two\nlines", "d": None, "e": "plain: text"})
+
+        # Assert
+        assert result.splitlines() == ['a: "123"', 'b: "true"', 'c: "two\\nlines"', 'd: null', 'e: plain: text']
+
+
+class TestJoinMappings:
+    """Tests for joining serialised single-key dicts."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("output_format", ["yaml", "json", "lean"])
+    def test_matches_serialising_the_whole_dict(self, output_format):
+        """Test that joined fragments equal the serialisation of the merged dict."""
+        # Arrange
+        dump = SERIALIZERS[output_format]
+        data = {"/issues.json": {"get": {"operationId": "getIssues"}},
+                "/projects.json": {"get": {"operationId": "getProjects", "tags": ["a", "b"]}}}
+
+        # Act
+        result = join_mappings(output_format, [dump({key: value}) for key, value in data.items()])
+
+        # Assert
+        assert result == dump(data)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("output_format", ["yaml", "json", "lean"])
+    def test_no_fragments(self, output_format):
+        """Test that nothing to join gives an empty dict."""
+        # Act
+        result = join_mappings(output_format, [])
+
+        # Assert
+        assert result == SERIALIZERS[output_format]({})
+
+
+class TestYdOutputFormat:
+    """Tests for the server-wide REDMINE_OUTPUT_FORMAT option."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("output_format, parse", [("yaml", yaml.safe_load), ("json", json.loads)])
+    def test_yd_uses_configured_format(self, mocker, output_format, parse):
+        """Test that yd() dispatches to the configured serializer."""
+        # Arrange
+        from mcp_redmine.server import yd
+        mocker.patch('mcp_redmine.server.REDMINE_OUTPUT_FORMAT', output_format)
+        data = {"status_code": 200, "body": {"id": 1}, "error": ""}
+
+        # Act
+        result = yd(data)
+
+        # Assert
+        assert parse(result) == data
+
+    @pytest.mark.unit
+    def test_yd_lean_format(self, mocker):
+        """Test that yd() can produce the lean format."""
+        # Arrange
+        from mcp_redmine.server import yd
+        mocker.patch('mcp_redmine.server.REDMINE_OUTPUT_FORMAT', 'lean')
+
+        # Act
+        result = yd({"projects": [{"id": 1, "name": "One"}]})
+
+        # Assert
+        assert result == "projects[1]{id,name}:\n  1,One\n"
@@ -0,0 +1,150 @@
+"""
+Unit tests for the outbound rate limiter in mcp_redmine.governor module and its use in arequest().
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from mcp_redmine.governor import Governor, GovernorPool, TokenBucket
+from mcp_redmine.server import arequest
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    @pytest.mark.unit
+    def test_burst_then_even_pace(self):
+        """Test that a burst is granted at once and later callers are spaced 1/rate apart."""
+        # Arrange
+        bucket = TokenBucket(rate=100, burst=2)
+
+        # Act
+        delays = [bucket.reserve() for _ in range(4)]
+
+        # Assert
+        assert delays[:2] == [0.0, 0.0]
+        assert delays[2] == pytest.approx(0.01, abs=0.002)
+        assert delays[3] == pytest.approx(0.02, abs=0.002)
+
+    @pytest.mark.unit
+    def test_disabled(self):
+        """Test that a rate of 0 never delays."""
+        # Assert
+        assert TokenBucket(rate=0, burst=1).reserve() == 0.0
+
+
+class TestGovernor:
+    """Tests for Governor."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_max_in_flight_and_queue_depth(self):
+        """Test the in-flight cap and that waiting callers are counted and timed."""
+        # Arrange
+        governor = Governor(max_in_flight=2)
+        active, peak, waits = 0, 0, []
+
+        async def call():
+            nonlocal active, peak
+            async with governor.slot() as waited:
+                waits.append(waited)
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+
+        # Act
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        # Assert
+        stats = governor.stats()
+        assert peak == 2
+        assert stats['requests'] == 6
+        assert stats['max_queued'] == 4
+        assert stats['delayed'] == 4
+        assert stats['in_flight'] == 0 and stats['queued'] == 0
+        assert max(waits) >= 0.03
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_rate_limit(self):
+        """Test that callers beyond the burst wait for tokens."""
+        # Arrange
+        governor = Governor(rate=50, burst=1)
+        start = time.monotonic()
+
+        # Act
+        async def call():
+            async with governor.slot():
+                pass
+
+        await asyncio.gather(*(call() for _ in range(4)))
+
+        # Assert
+        assert time.monotonic() - start >= 0.05
+        assert governor.stats()['delayed'] == 3
+
+    @pytest.mark.unit
+    def test_sync_slot(self):
+        """Test the in-flight cap for threads."""
+        # Arrange
+        governor = Governor(max_in_flight=1)
+        lock = threading.Lock()
+        active, peak = 0, 0
+
+        def call():
+            nonlocal active, peak
+            with governor.sync_slot():
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.01)
+                with lock:
+                    active -= 1
+
+        # Act
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert peak == 1
+        assert governor.stats()['requests'] == 4
+
+    @pytest.mark.unit
+    def test_pool_hides_keys(self):
+        """Test that per key statistics are reported under a fingerprint of the key."""
+        # Arrange
+        pool = GovernorPool(max_in_flight=1)
+
+        # Act
+        assert pool.get('secret-key') is pool.get('secret-key')
+        stats = pool.stats()
+
+        # Assert
+        assert list(stats) == [GovernorPool.label('secret-key')]
+        assert 'secret-key' not in str(stats)
+
+
+class TestRequestGovernor:
+    """Tests for the governor in arequest()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_queued_seconds_in_meta(self, mock_env, mock_async_client, mocker):
+        """Test that a request that had to wait reports it and one that didn't does not."""
+        # Arrange
+        mocker.patch('mcp_redmine.server.GOVERNOR', Governor(rate=20, burst=1))
+        mock_async_client(lambda req: httpx.Response(200, json={}))
+
+        # Act
+        first = await arequest('/issues.json')
+        second = await arequest('/issues.json')
+
+        # Assert
+        assert 'meta' not in first
+        assert second['meta']['queued_seconds'] == pytest.approx(0.05, abs=0.02)
@@ -1,5 +1,5 @@
 """
-Unit tests for health check server in mcp_redmine.server module.
+Unit tests for health check server in mcp_redmine.sse module.
 """
 import pytest
 import socket
@@ -7,7 +7,7 @@ import time
 import json
 from unittest.mock import Mock, patch, MagicMock
 from io import BytesIO
-from mcp_redmine.server import HealthCheckHandler, start_health_server
+from mcp_redmine.sse import HealthCheckHandler, start_health_server
 
 
 class TestHealthCheckHandler:
@@ -129,9 +129,9 @@ class TestStartHealthServer:
         # Arrange
         mock_server = Mock()
         mock_server.serve_forever = Mock()
-        mock_httpserver = mocker.patch('mcp_redmine.server.HTTPServer', return_value=mock_server)
-        mock_thread = mocker.patch('mcp_redmine.server.threading.Thread')
-        mock_socket = mocker.patch('mcp_redmine.server.socket.socket')
+        mock_httpserver = mocker.patch('mcp_redmine.sse.HTTPServer', return_value=mock_server)
+        mock_thread = mocker.patch('mcp_redmine.sse.threading.Thread')
+        mock_socket = mocker.patch('mcp_redmine.sse.socket.socket')
         mock_socket_instance = Mock()
         mock_socket_instance.connect_ex.return_value = 0  # Success
         mock_socket.return_value = mock_socket_instance
@@ -150,9 +150,9 @@ class TestStartHealthServer:
         """Test that server binds to 0.0.0.0."""
         # Arrange
         mock_server = Mock()
-        mock_httpserver = mocker.patch('mcp_redmine.server.HTTPServer', return_value=mock_server)
-        mock_thread = mocker.patch('mcp_redmine.server.threading.Thread')
-        mock_socket = mocker.patch('mcp_redmine.server.socket.socket')
+        mock_httpserver = mocker.patch('mcp_redmine.sse.HTTPServer', return_value=mock_server)
+        mock_thread = mocker.patch('mcp_redmine.sse.threading.Thread')
+        mock_socket = mocker.patch('mcp_redmine.sse.socket.socket')
         mock_socket_instance = Mock()
         mock_socket_instance.connect_ex.return_value = 0
         mock_socket.return_value = mock_socket_instance
@@ -170,9 +170,9 @@ class TestStartHealthServer:
         """Test default port is 8080."""
         # Arrange
         mock_server = Mock()
-        mock_httpserver = mocker.patch('mcp_redmine.server.HTTPServer', return_value=mock_server)
-        mock_thread = mocker.patch('mcp_redmine.server.threading.Thread')
-        mock_socket = mocker.patch('mcp_redmine.server.socket.socket')
+        mock_httpserver = mocker.patch('mcp_redmine.sse.HTTPServer', return_value=mock_server)
+        mock_thread = mocker.patch('mcp_redmine.sse.threading.Thread')
+        mock_socket = mocker.patch('mcp_redmine.sse.socket.socket')
         mock_socket_instance = Mock()
         mock_socket_instance.connect_ex.return_value = 0
         mock_socket.return_value = mock_socket_instance
@@ -189,7 +189,7 @@ class TestStartHealthServer:
     def test_start_health_server_exception(self, mocker):
         """Test health server handles exceptions during startup."""
         # Arrange
-        mocker.patch('mcp_redmine.server.HTTPServer', side_effect=OSError("Port in use"))
+        mocker.patch('mcp_redmine.sse.HTTPServer', side_effect=OSError("Port in use"))
 
         # Act
         result = start_health_server(port=8080)
@@ -202,9 +202,9 @@ class TestStartHealthServer:
         """Test that server thread is daemon thread."""
         # Arrange
         mock_server = Mock()
-        mocker.patch('mcp_redmine.server.HTTPServer', return_value=mock_server)
-        mock_thread_class = mocker.patch('mcp_redmine.server.threading.Thread')
-        mock_socket = mocker.patch('mcp_redmine.server.socket.socket')
+        mocker.patch('mcp_redmine.sse.HTTPServer', return_value=mock_server)
+        mock_thread_class = mocker.patch('mcp_redmine.sse.threading.Thread')
+        mock_socket = mocker.patch('mcp_redmine.sse.socket.socket')
         mock_socket_instance = Mock()
         mock_socket_instance.connect_ex.return_value = 0
         mock_socket.return_value = mock_socket_instance
@@ -222,10 +222,10 @@ class TestStartHealthServer:
         """Test server verification with retries."""
         # Arrange
         mock_server = Mock()
-        mocker.patch('mcp_redmine.server.HTTPServer', return_value=mock_server)
-        mocker.patch('mcp_redmine.server.threading.Thread')
+        mocker.patch('mcp_redmine.sse.HTTPServer', return_value=mock_server)
+        mocker.patch('mcp_redmine.sse.threading.Thread')
 
-        mock_socket = mocker.patch('mcp_redmine.server.socket.socket')
+        mock_socket = mocker.patch('mcp_redmine.sse.socket.socket')
         mock_socket_instance = Mock()
         # First 3 attempts fail, 4th succeeds
         mock_socket_instance.connect_ex.side_effect = [1, 1, 1, 0]
@@ -246,10 +246,10 @@ class TestStartHealthServer:
         """Test server verification respects max attempts."""
         # Arrange
         mock_server = Mock()
-        mocker.patch('mcp_redmine.server.HTTPServer', return_value=mock_server)
-        mocker.patch('mcp_redmine.server.threading.Thread')
+        mocker.patch('mcp_redmine.sse.HTTPServer', return_value=mock_server)
+        mocker.patch('mcp_redmine.sse.threading.Thread')
 
-        mock_socket = mocker.patch('mcp_redmine.server.socket.socket')
+        mock_socket = mocker.patch('mcp_redmine.sse.socket.socket')
         mock_socket_instance = Mock()
         # All attempts fail
         mock_socket_instance.connect_ex.return_value = 1
@@ -271,10 +271,10 @@ class TestStartHealthServer:
         """Test that socket timeout is set for verification."""
         # Arrange
         mock_server = Mock()
-        mocker.patch('mcp_redmine.server.HTTPServer', return_value=mock_server)
-        mocker.patch('mcp_redmine.server.threading.Thread')
+        mocker.patch('mcp_redmine.sse.HTTPServer', return_value=mock_server)
+        mocker.patch('mcp_redmine.sse.threading.Thread')
 
-        mock_socket = mocker.patch('mcp_redmine.server.socket.socket')
+        mock_socket = mocker.patch('mcp_redmine.sse.socket.socket')
         mock_socket_instance = Mock()
         mock_socket_instance.connect_ex.return_value = 0
         mock_socket.return_value = mock_socket_instance
@@ -319,3 +319,34 @@ class TestHealthCheckIntegration:
             # Cleanup
             if server:
                 server.shutdown()
+
+
+class TestLazyHttpStack:
+    """Tests that the HTTP/SSE stack stays out of stdio mode."""
+
+    @pytest.mark.unit
+    def test_server_import_skips_http_stack(self, mock_env):
+        """Test that importing the server does not import the SSE module or http.server."""
+        # Arrange
+        import os
+        import subprocess
+        import sys
+        code = ("import sys, mcp_redmine.server; "
+                "print(sorted(m for m in ('mcp_redmine.sse', 'http.server') if m in sys.modules))")
+
+        # Act
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                env=dict(os.environ), check=True).stdout
+
+        # Assert
+        assert output.strip() == "[]"
+
+    @pytest.mark.unit
+    def test_server_module_still_exposes_health_check(self):
+        """Test that the old import location keeps working."""
+        # Act
+        from mcp_redmine.server import HealthCheckHandler as handler, start_health_server as start
+
+        # Assert
+        assert handler is HealthCheckHandler
+        assert start is start_health_server
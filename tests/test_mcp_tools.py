@@ -1,13 +1,17 @@
 """
 Unit tests for MCP tool functions in mcp_redmine.server module.
 """
+import json
 import pytest
+import httpx
 import yaml
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from mcp_redmine.server import (
     redmine_request,
     redmine_paths_list,
     redmine_paths_info,
+    redmine_route,
+    redmine_cursor,
 )
 
 
@@ -15,10 +19,11 @@ class TestRedmineRequestTool:
     """Tests for the redmine_request() tool."""
 
     @pytest.mark.unit
-    def test_redmine_request_success(self, mock_env, mocker):
+    @pytest.mark.asyncio
+    async def test_redmine_request_success(self, mock_env, mocker):
         """Test successful Redmine request."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 200,
             'body': {'projects': [{'id': 1, 'name': 'Test'}]},
@@ -26,7 +31,7 @@ class TestRedmineRequestTool:
         }
 
         # Act
-        result = redmine_request('/projects.json', method='get')
+        result = await redmine_request('/projects.json', method='get')
 
         # Assert
         assert isinstance(result, str)
@@ -36,10 +41,11 @@ class TestRedmineRequestTool:
         mock_request.assert_called_once_with('/projects.json', method='get', data=None, params=None)
 
     @pytest.mark.unit
-    def test_redmine_request_with_params(self, mock_env, mocker):
+    @pytest.mark.asyncio
+    async def test_redmine_request_with_params(self, mock_env, mocker):
         """Test Redmine request with query parameters."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 200,
             'body': {'issues': []},
@@ -47,7 +53,7 @@ class TestRedmineRequestTool:
         }
 
         # Act
-        result = redmine_request('/issues.json', method='get', params={'limit': 10, 'offset': 5})
+        result = await redmine_request('/issues.json', method='get', params={'limit': 10, 'offset': 5})
 
         # Assert
         mock_request.assert_called_once_with(
@@ -58,10 +64,11 @@ class TestRedmineRequestTool:
         )
 
     @pytest.mark.unit
-    def test_redmine_request_with_post_data(self, mock_env, mocker):
+    @pytest.mark.asyncio
+    async def test_redmine_request_with_post_data(self, mock_env, mocker):
         """Test Redmine POST request with data."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 201,
             'body': {'issue': {'id': 1}},
@@ -71,7 +78,7 @@ class TestRedmineRequestTool:
         post_data = {'issue': {'subject': 'Test', 'project_id': 1}}
 
         # Act
-        result = redmine_request('/issues.json', method='post', data=post_data)
+        result = await redmine_request('/issues.json', method='post', data=post_data)
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -84,10 +91,71 @@ class TestRedmineRequestTool:
         )
 
     @pytest.mark.unit
-    def test_redmine_request_error_response(self, mock_env, mocker):
+    @pytest.mark.asyncio
+    async def test_redmine_request_check_spec_rejects_locally(self, mock_env, mocker):
+        """Test that an invalid request is reported without being sent."""
+        # Arrange
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+
+        # Act
+        result = await redmine_request('/issues/12.json', method='put', data={'issue': {'status_id': 'closed'}},
+                                       check_spec=True)
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 0
+        problem = "issue.status_id: 'closed' is not of type 'integer'"
+        assert parsed['error'] == f"Request does not match the API spec: {problem}"
+        assert parsed['meta']['validation'] == {'errors': [problem], 'warnings': []}
+        mock_request.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redmine_request_check_spec_server_default(self, mock_env, mocker):
+        """Test that REDMINE_VALIDATE_REQUESTS turns checking on and that only an invalid body stops a request."""
+        # Arrange
+        mocker.patch('mcp_redmine.server.REDMINE_VALIDATE_REQUESTS', True)
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+        mock_request.return_value = {'status_code': 200, 'body': {}, 'error': ''}
+
+        # Act
+        invalid = yaml.safe_load(await redmine_request('/issues/12.json', method='put',
+                                                       data={'issue': {'status_id': 'closed'}}))
+        unchecked = yaml.safe_load(await redmine_request('/issues/12.json', method='put',
+                                                         data={'issue': {'status_id': 'closed'}}, check_spec=False))
+        await redmine_request('/issues.json', params={'limit': '25'})
+        await redmine_request('/versions/3.json', method='put', data={'version': {}})
+
+        # Assert
+        assert invalid['status_code'] == 0
+        assert unchecked['status_code'] == 200
+        assert mock_request.call_count == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redmine_request_check_spec_warns_about_parameters(self, mock_env, mocker):
+        """Test that parameters Redmine accepts in forms the spec doesn't list are sent, with a warning."""
+        # Arrange
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+        mock_request.return_value = {'status_code': 200, 'body': {'issues': []}, 'error': ''}
+
+        # Act
+        current = yaml.safe_load(await redmine_request('/users/current.json', check_spec=True))
+        warned = yaml.safe_load(await redmine_request('/issues.json', params={'limit': 'many'}, check_spec=True))
+
+        # Assert
+        assert mock_request.call_count == 2
+        assert current['status_code'] == 200
+        assert current['meta']['validation']['warnings'] == ["userId: 'current' is not of type 'integer'"]
+        assert warned['status_code'] == 200
+        assert "limit" in warned['meta']['validation']['warnings'][0]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_redmine_request_error_response(self, mock_env, mocker):
         """Test Redmine request with error response."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {
             'status_code': 404,
             'body': {'error': 'Not found'},
@@ -95,7 +163,7 @@ class TestRedmineRequestTool:
         }
 
         # Act
-        result = redmine_request('/nonexistent.json')
+        result = await redmine_request('/nonexistent.json')
 
         # Assert
         parsed = yaml.safe_load(result)
@@ -104,14 +172,15 @@ class TestRedmineRequestTool:
         assert parsed['error'] != ''
 
     @pytest.mark.unit
-    def test_redmine_request_default_method(self, mock_env, mocker):
+    @pytest.mark.asyncio
+    async def test_redmine_request_default_method(self, mock_env, mocker):
         """Test that redmine_request defaults to GET method."""
         # Arrange
-        mock_request = mocker.patch('mcp_redmine.server.request')
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
         mock_request.return_value = {'status_code': 200, 'body': {}, 'error': ''}
 
         # Act
-        redmine_request('/test.json')
+        await redmine_request('/test.json')
 
         # Assert
         call_args = mock_request.call_args
@@ -326,3 +395,247 @@ class TestRedminePathsInfoTool:
         assert 'get' in parsed['/issues.json']
         assert 'post' in parsed['/issues.json']
         assert len(parsed['/issues.json']['get']['parameters']) == 2
+
+
+    @pytest.mark.unit
+    def test_redmine_paths_info_resolve_refs(self, mock_env, mocker):
+        """Test that resolve_refs inlines the referenced schemas."""
+        # Arrange
+        mock_spec = {
+            'paths': {
+                '/issues.json': {'post': {'requestBody': {'$ref': '#/components/requestBodies/Issue'}}}
+            },
+            'components': {'requestBodies': {'Issue': {'required': True}}}
+        }
+        mocker.patch('mcp_redmine.server.SPEC', mock_spec)
+
+        # Act
+        raw = yaml.safe_load(redmine_paths_info(['/issues.json']))
+        resolved = yaml.safe_load(redmine_paths_info(['/issues.json'], resolve_refs=True))
+
+        # Assert
+        assert raw['/issues.json']['post']['requestBody'] == {'$ref': '#/components/requestBodies/Issue'}
+        assert resolved['/issues.json']['post']['requestBody'] == {'required': True}
+
+    @pytest.mark.unit
+    def test_redmine_paths_info_follows_spec_and_format(self, mock_env, mocker):
+        """Test that the index is rebuilt for a new spec and duplicates are listed once."""
+        # Arrange
+        mocker.patch('mcp_redmine.server.SPEC', {'paths': {'/issues.json': {'get': {'operationId': 'a'}}}})
+        redmine_paths_info(['/issues.json'])
+        mocker.patch('mcp_redmine.server.SPEC', {'paths': {'/issues.json': {'get': {'operationId': 'b'}}}})
+        mocker.patch('mcp_redmine.server.REDMINE_OUTPUT_FORMAT', 'json')
+
+        # Act
+        result = redmine_paths_info(['/issues.json', '/issues.json'])
+
+        # Assert
+        assert json.loads(result) == {'/issues.json': {'get': {'operationId': 'b'}}}
+
+
+class TestRedmineRouteTool:
+    """Tests for the redmine_route() tool."""
+
+    @pytest.mark.unit
+    def test_redmine_route_matched(self, mock_env):
+        """Test that a concrete path is explained with its template and operation."""
+        # Act
+        result = yaml.safe_load(redmine_route('/issues/123.json?include=journals', method='PUT'))
+
+        # Assert
+        body = result['body']
+        assert body['matched'] is True
+        assert body['template'] == '/issues/{issueId}.json'
+        assert body['path_params'] == {'issueId': '123'}
+        assert body['operation_id'] == 'updateIssue'
+        assert 'delete' in body['methods']
+        assert body['cache_ttl'] == 0
+        assert body['metrics_path'] == '/issues/{issueId}.json'
+
+    @pytest.mark.unit
+    def test_redmine_route_unmatched(self, mock_env):
+        """Test that paths the spec does not describe still get the server's treatment."""
+        # Act
+        result = yaml.safe_load(redmine_route('/projects/foo/issues.json'))
+
+        # Assert
+        body = result['body']
+        assert body['matched'] is False
+        assert 'template' not in body
+        assert body['metrics_path'] == '/projects/{id}/issues.json'
+
+class TestRedmineRequestFetchAll:
+    """Tests for redmine_request(fetch_all=True)."""
+
+    @staticmethod
+    def _pages(total, limit=100):
+        """Handler serving a collection of `total` users in pages of at most `limit`."""
+        requested = []
+
+        def handler(req):
+            offset = int(req.url.params.get('offset', 0))
+            requested.append(offset)
+            users = [{'id': i} for i in range(offset + 1, min(offset + limit, total) + 1)]
+            return httpx.Response(200, json={'users': users, 'total_count': total, 'offset': offset,
+                                             'limit': limit})
+
+        return handler, requested
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_all_merges_pages_in_order(self, mock_env, mock_async_client):
+        """Test that all pages are fetched and merged in offset order."""
+        # Arrange
+        handler, requested = self._pages(250)
+        mock_async_client(handler)
+
+        # Act
+        result = await redmine_request('/users.json', fetch_all=True)
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 200
+        assert [u['id'] for u in parsed['body']['users']] == list(range(1, 251))
+        assert parsed['body']['total_count'] == 250
+        assert parsed['meta']['pages_fetched'] == 3
+        assert parsed['meta']['truncated'] is False
+        assert sorted(requested) == [0, 100, 200]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_all_respects_item_cap(self, mock_env, mock_async_client):
+        """Test that fetching stops at the item cap and reports truncation."""
+        # Arrange
+        from mcp_redmine.server import afetch_all
+        handler, _ = self._pages(1000)
+        mock_async_client(handler)
+
+        # Act
+        result = await afetch_all('/users.json', max_items=150)
+
+        # Assert
+        assert len(result['body']['users']) == 150
+        assert result['meta']['truncated'] is True
+        assert 'max_items' in result['meta']['truncated_reason']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_all_respects_byte_cap(self, mock_env, mock_async_client):
+        """Test that fetching stops once the byte cap is exceeded."""
+        # Arrange
+        from mcp_redmine.server import afetch_all
+        handler, _ = self._pages(1000)
+        mock_async_client(handler)
+
+        # Act
+        result = await afetch_all('/users.json', max_bytes=10)
+
+        # Assert
+        assert result['meta']['truncated'] is True
+        assert result['meta']['pages_fetched'] == 1
+        assert 'max_bytes' in result['meta']['truncated_reason']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_all_reports_progress(self, mock_env, mock_async_client):
+        """Test that a progress notification is sent per page."""
+        # Arrange
+        handler, _ = self._pages(250)
+        mock_async_client(handler)
+        ctx = Mock()
+        ctx.report_progress = AsyncMock()
+
+        # Act
+        await redmine_request('/users.json', fetch_all=True, ctx=ctx)
+
+        # Assert
+        assert ctx.report_progress.await_count == 3
+        ctx.report_progress.assert_awaited_with(3, 3)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_all_non_collection_returns_single_response(self, mock_env, mock_async_client):
+        """Test that a non-collection endpoint is returned as-is."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(200, json={'issue': {'id': 1}}))
+
+        # Act
+        result = await redmine_request('/issues/1.json', fetch_all=True)
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['body'] == {'issue': {'id': 1}}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fetch_all_rejects_non_get(self, mock_env):
+        """Test that fetch_all is refused for write methods."""
+        # Act
+        result = await redmine_request('/issues.json', method='post', fetch_all=True)
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 0
+        assert 'only supported for GET' in parsed['error']
+
+
+class TestRedmineCursor:
+    """Tests for redmine_request(cursor=True) and the redmine_cursor() tool."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slices_come_from_the_snapshot(self, mock_env, mock_async_client):
+        """Test that a cursor snapshots every page and serves later slices without requests."""
+        # Arrange
+        handler, requested = TestRedmineRequestFetchAll._pages(60, limit=25)
+        mock_async_client(handler)
+
+        # Act
+        first = yaml.safe_load(await redmine_request('/users.json', params={'limit': 25}, cursor=True))
+        fetched = len(requested)
+        cursor = first['meta']['cursor']
+        second = yaml.safe_load(redmine_cursor(cursor['id'], offset=cursor['next_offset'], fields=['id']))
+        last = yaml.safe_load(redmine_cursor(cursor['id'], offset=50, limit=25))
+
+        # Assert
+        assert [u['id'] for u in first['body']['users']] == list(range(1, 26))
+        assert cursor['total'] == 60 and cursor['next_offset'] == 25
+        assert first['meta']['snapshot']['list'] == 'users'
+        assert [u['id'] for u in second['body']['users']] == list(range(26, 51))
+        assert second['body']['offset'] == 25
+        assert [u['id'] for u in last['body']['users']] == list(range(51, 61))
+        assert last['meta']['cursor']['next_offset'] is None
+        assert len(requested) == fetched == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_unknown_cursor_and_non_get(self, mock_env, mocker):
+        """Test that unknown cursors and cursors on writes are reported."""
+        # Arrange
+        from mcp_redmine.budget import ResultStore
+        store = mocker.patch('mcp_redmine.server.RESULT_STORE', ResultStore(1 << 20, 60))
+        continuation = store.put({'status_code': 200, 'body': {'issues': []}, 'error': ''}, 10)
+
+        # Act
+        unknown = yaml.safe_load(redmine_cursor('nope'))
+        not_a_cursor = yaml.safe_load(redmine_cursor(continuation))
+        write = yaml.safe_load(await redmine_request('/issues.json', method='post', cursor=True))
+
+        # Assert
+        assert 'Unknown or expired cursor' in unknown['error']
+        assert 'Unknown or expired cursor' in not_a_cursor['error']
+        assert 'only supported for GET' in write['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_have_no_cursor(self, mock_env, mock_async_client):
+        """Test that a failed read is returned as it is."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(403, json={'errors': ['Forbidden']}))
+
+        # Act
+        result = yaml.safe_load(await redmine_request('/users.json', cursor=True))
+
+        # Assert
+        assert result['status_code'] == 403
+        assert 'cursor' not in (result.get('meta') or {})
@@ -0,0 +1,236 @@
+"""
+Unit tests for the Prometheus metrics in mcp_redmine.metrics module and the /metrics endpoints.
+"""
+from io import BytesIO
+from unittest.mock import Mock
+
+import httpx
+import pytest
+import yaml
+from mcp_redmine import metrics
+from mcp_redmine.metrics import Registry, instrumented, path_template
+from mcp_redmine.server import arequest, mcp, redmine_request
+from mcp_redmine.sse import HealthCheckHandler
+
+
+class TestRegistry:
+    """Tests for rendering metrics in the text exposition format."""
+
+    @pytest.mark.unit
+    def test_counter_and_gauge(self):
+        """Test labelled counters, label escaping and gauges."""
+        # Arrange
+        registry = Registry()
+        counter = registry.counter("calls_total", "Calls.", ("tool",))
+        gauge = registry.gauge("sessions", "Sessions.")
+
+        # Act
+        counter.inc(tool='a')
+        counter.inc(2, tool='a')
+        counter.inc(tool='say "hi"\n')
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        # Assert
+        text = registry.render()
+        assert '# TYPE calls_total counter' in text
+        assert 'calls_total{tool="a"} 3' in text
+        assert 'calls_total{tool="say \\"hi\\"\\n"} 1' in text
+        assert 'sessions 1' in text.splitlines()
+
+    @pytest.mark.unit
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts, sum and count of a histogram."""
+        # Arrange
+        registry = Registry()
+        histogram = registry.histogram("latency_seconds", "Latency.", ("path",), buckets=(0.1, 1.0))
+
+        # Act
+        for value in (0.05, 0.5, 0.7, 5):
+            histogram.observe(value, path='/issues.json')
+
+        # Assert
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{path="/issues.json",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{path="/issues.json",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{path="/issues.json",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{path="/issues.json"} 6.25' in lines
+        assert 'latency_seconds_count{path="/issues.json"} 4' in lines
+
+    @pytest.mark.unit
+    def test_collectors(self):
+        """Test that collectors are read at render time."""
+        # Arrange
+        registry = Registry()
+        state = {"n": 1}
+        registry.register_collector(lambda: [("things", "gauge", "Things.", [({"kind": "x"}, state["n"])])])
+
+        # Act
+        state["n"] = 5
+
+        # Assert
+        assert 'things{kind="x"} 5' in registry.render()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("path,expected", [
+        ('/issues.json', '/issues.json'),
+        ('issues/123.json?include=journals', '/issues/{id}.json'),
+        ('/projects/my-project/issues.json', '/projects/{id}/issues.json'),
+        ('/projects/7/memberships.json', '/projects/{id}/memberships.json'),
+    ])
+    def test_path_template(self, path, expected):
+        """Test that identifiers are taken out of path labels."""
+        # Assert
+        assert path_template(path) == expected
+
+
+class TestInstrumented:
+    """Tests for the tool instrumentation decorator."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_counts_outcomes(self):
+        """Test ok, reported errors and raised errors for async and sync tools."""
+        # Arrange
+        @instrumented
+        async def metrics_test_async(fail: bool = False):
+            if fail:
+                metrics.tool_failed()
+            return "done"
+
+        @instrumented
+        def metrics_test_sync():
+            raise RuntimeError("boom")
+
+        # Act
+        await metrics_test_async()
+        await metrics_test_async(fail=True)
+        with pytest.raises(RuntimeError):
+            metrics_test_sync()
+
+        # Assert
+        assert metrics.TOOL_CALLS.value(tool='metrics_test_async', outcome='ok') == 1
+        assert metrics.TOOL_CALLS.value(tool='metrics_test_async', outcome='error') == 1
+        assert metrics.TOOL_CALLS.value(tool='metrics_test_sync', outcome='error') == 1
+        assert metrics.TOOL_DURATION.count(tool='metrics_test_async') == 2
+
+    @pytest.mark.unit
+    def test_tool_signatures_are_kept(self):
+        """Test that FastMCP still sees the parameters of instrumented tools."""
+        # Act
+        tools = {tool.name: tool for tool in mcp._tool_manager.list_tools()}
+
+        # Assert
+        assert 'fields' in tools['redmine_request'].parameters['properties']
+        assert tools['redmine_request'].context_kwarg == 'ctx'
+        assert tools['redmine_request'].is_async
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_error_result_counts_as_error(self, mock_env, mock_async_client):
+        """Test that a tool returning an error result is counted as failed."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(404, json={'errors': ['Not found']}))
+        before = metrics.TOOL_CALLS.value(tool='redmine_request', outcome='error')
+
+        # Act
+        result = yaml.safe_load(await redmine_request('/issues/999.json'))
+
+        # Assert
+        assert result['status_code'] == 404
+        assert metrics.TOOL_CALLS.value(tool='redmine_request', outcome='error') == before + 1
+
+
+class TestUpstreamMetrics:
+    """Tests for the metrics recorded by arequest()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_requests_latency_and_bytes(self, mock_env, mock_async_client):
+        """Test that every attempt is counted by path template and status, with its bytes."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(200, content=b'{"issue": {}}'))
+        labels = dict(method='put', path='/issues/{issueId}.json')
+        requests_before = metrics.UPSTREAM_REQUESTS.value(status=200, **labels)
+        sent_before, received_before = metrics.BYTES_SENT.value(), metrics.BYTES_RECEIVED.value()
+
+        # Act
+        await arequest('/issues/41.json', method='put', data={'issue': {'notes': 'x'}})
+        await arequest('/issues/42.json', method='put', data={'issue': {'notes': 'x'}})
+
+        # Assert
+        assert metrics.UPSTREAM_REQUESTS.value(status=200, **labels) == requests_before + 2
+        assert metrics.UPSTREAM_DURATION.count(status=200, **labels) >= 2
+        assert metrics.BYTES_SENT.value() - sent_before == 2 * len(b'{"issue":{"notes":"x"}}')
+        assert metrics.BYTES_RECEIVED.value() - received_before == 2 * len(b'{"issue": {}}')
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_connection_errors_have_status_0(self, mock_env, mock_async_client, retry_policy):
+        """Test that attempts without a response are counted and timed with status 0."""
+        # Arrange
+        def handler(req):
+            raise httpx.ConnectError('Connection refused')
+
+        mock_async_client(handler)
+        labels = dict(method='get', path='/trackers.json', status=0)
+        before, timed_before = metrics.UPSTREAM_REQUESTS.value(**labels), metrics.UPSTREAM_DURATION.count(**labels)
+
+        # Act
+        await arequest('/trackers.json')
+
+        # Assert
+        assert metrics.UPSTREAM_REQUESTS.value(**labels) - before == retry_policy.retries + 1
+        assert metrics.UPSTREAM_DURATION.count(**labels) - timed_before == retry_policy.retries + 1
+
+
+class TestMetricsEndpoint:
+    """Tests for /metrics on the health check server."""
+
+    @pytest.mark.unit
+    def test_health_server_serves_metrics(self):
+        """Test that the health check handler renders the registry, server collectors included."""
+        # Arrange
+        handler = HealthCheckHandler.__new__(HealthCheckHandler)
+        handler.send_response = Mock()
+        handler.send_header = Mock()
+        handler.end_headers = Mock()
+        handler.wfile = BytesIO()
+        handler.path = '/metrics'
+
+        # Act
+        handler.do_GET()
+
+        # Assert
+        handler.send_response.assert_called_once_with(200)
+        handler.send_header.assert_called_with('Content-type', metrics.CONTENT_TYPE)
+        text = handler.wfile.getvalue().decode()
+        assert '# TYPE mcp_redmine_tool_calls_total counter' in text
+        assert '# TYPE mcp_redmine_upstream_request_duration_seconds histogram' in text
+        assert 'mcp_redmine_cache_hit_ratio' in text
+        assert 'mcp_redmine_sse_sessions' in text
+        assert 'mcp_redmine_result_store_bytes' in text
+        assert 'mcp_redmine_result_store_lookups_total{result="misses"}' in text
+
+
+class TestEventLoopLag:
+    """Tests for monitor_event_loop()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_blocking_call_shows_as_lag(self):
+        """Test that a blocked event loop is reported as lag."""
+        # Arrange
+        import asyncio
+        import time
+        task = asyncio.create_task(metrics.monitor_event_loop(interval=0.01))
+        await asyncio.sleep(0)
+
+        # Act
+        time.sleep(0.05)
+        await asyncio.sleep(0.001)
+        task.cancel()
+
+        # Assert
+        assert metrics.EVENT_LOOP_LAG.value() >= 0.03
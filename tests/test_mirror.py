@@ -0,0 +1,308 @@
+"""
+Unit tests for the local Redmine mirror in mcp_redmine.mirror module, its sync engine and the
+redmine_mirror_query() tool.
+"""
+import sqlite3
+import time
+
+import httpx
+import pytest
+import yaml
+from mcp_redmine.mirror import Mirror
+from mcp_redmine.server import redmine_mirror_query, sync_mirror
+
+
+def make_issue(issue_id, status_id=1, project_id=1, updated_on="2024-01-01T00:00:00Z", assigned_to=None):
+    issue = {"id": issue_id, "project": {"id": project_id, "name": f"P{project_id}"},
+             "tracker": {"id": 1, "name": "Bug"}, "status": {"id": status_id, "name": "New"},
+             "subject": f"Issue {issue_id}", "updated_on": updated_on}
+    if assigned_to:
+        issue["assigned_to"] = {"id": assigned_to, "name": f"User {assigned_to}"}
+    return issue
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = Mirror(str(tmp_path / "mirror.sqlite"), query_timeout=1)
+    yield mirror
+    mirror.close()
+
+
+class TestMirror:
+    """Tests for the Mirror class."""
+
+    @pytest.mark.unit
+    def test_upsert_and_query(self, mirror):
+        """Test that extracted columns and the JSON data column can be queried."""
+        # Arrange
+        mirror.upsert("issues", [make_issue(1, assigned_to=3), make_issue(2, assigned_to=3), make_issue(3)])
+
+        # Act
+        result = mirror.query("SELECT assigned_to_id, COUNT(*) AS n FROM issues GROUP BY assigned_to_id "
+                              "ORDER BY n DESC")
+        subject = mirror.query("SELECT json_extract(data, '$.subject') AS subject FROM issues WHERE id = ?", [2])
+
+        # Assert
+        assert result["columns"] == ["assigned_to_id", "n"]
+        assert result["rows"][0] == {"assigned_to_id": 3, "n": 2}
+        assert subject["rows"] == [{"subject": "Issue 2"}]
+
+    @pytest.mark.unit
+    def test_query_limit(self, mirror):
+        """Test that rows beyond limit are cut off and reported."""
+        # Arrange
+        mirror.upsert("issues", [make_issue(i) for i in range(1, 11)])
+
+        # Act
+        result = mirror.query("SELECT id FROM issues", limit=3)
+
+        # Assert
+        assert len(result["rows"]) == 3
+        assert result["truncated"] is True
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("sql", [
+        "DELETE FROM issues",
+        "UPDATE issues SET subject = 'x'",
+        "DROP TABLE issues",
+        "ATTACH DATABASE ':memory:' AS other",
+        "PRAGMA journal_mode=DELETE",
+    ])
+    def test_query_is_read_only(self, mirror, sql):
+        """Test that statements other than reads are refused."""
+        # Arrange
+        mirror.upsert("issues", [make_issue(1)])
+
+        # Act / Assert
+        with pytest.raises(sqlite3.DatabaseError):
+            mirror.query(sql)
+        assert mirror.count("issues") == 1
+
+    @pytest.mark.unit
+    def test_query_timeout(self, mirror):
+        """Test that runaway queries are interrupted."""
+        # Act / Assert
+        with pytest.raises(sqlite3.OperationalError, match="interrupted"):
+            mirror.query("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT MAX(i) FROM n")
+
+    @pytest.mark.unit
+    def test_replace_deletes_missing_rows(self, mirror):
+        """Test that replace() leaves exactly the given objects."""
+        # Arrange
+        mirror.upsert("trackers", [{"id": 1, "name": "Bug"}, {"id": 2, "name": "Feature"}])
+
+        # Act
+        deleted = mirror.replace("trackers", [{"id": 2, "name": "Feature request"}])
+
+        # Assert
+        assert deleted == 1
+        assert mirror.query("SELECT id, name FROM trackers")["rows"] == [{"id": 2, "name": "Feature request"}]
+
+
+def redmine(state: dict, requests: list):
+    """MockTransport handler serving the collections the mirror syncs from `state`."""
+
+    def handler(req):
+        requests.append(req)
+        path = req.url.path
+        if path == '/users.json' and state.get('users') is None:
+            return httpx.Response(403, json={'errors': ['Forbidden']})
+        if path in ('/trackers.json', '/issue_statuses.json'):
+            key = path[1:-5]
+            return httpx.Response(200, json={key: state[key]})
+        key = path[1:-5]
+        items = state[key]
+        if key == 'issues':
+            since = req.url.params.get('updated_on', '>=')[2:]
+            items = [issue for issue in items if issue['updated_on'] >= since]
+        offset, limit = int(req.url.params.get('offset', 0)), int(req.url.params.get('limit', 25))
+        return httpx.Response(200, json={key: items[offset:offset + limit], 'total_count': len(items),
+                                         'offset': offset, 'limit': limit})
+
+    return handler
+
+
+class TestSyncMirror:
+    """Tests for sync_mirror() and redmine_mirror_query()."""
+
+    @staticmethod
+    def _state():
+        return {
+            'trackers': [{'id': 1, 'name': 'Bug'}],
+            'issue_statuses': [{'id': 1, 'name': 'New', 'is_closed': False}],
+            'projects': [{'id': 1, 'identifier': 'p1', 'name': 'P1'}],
+            'users': [{'id': 3, 'login': 'jdoe'}],
+            'issues': [make_issue(i, updated_on=f"2024-01-0{i}T00:00:00Z") for i in range(1, 5)],
+        }
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_first_sync_copies_everything(self, mock_env, mirror, mock_async_client):
+        """Test that the first sync fills every table and sets the watermark, reading the issues only once."""
+        # Arrange
+        requests = []
+        mock_async_client(redmine(self._state(), requests))
+
+        # Act
+        stats = await sync_mirror(mirror)
+
+        # Assert
+        info = mirror.info()
+        assert info["tables"] == {"issues": 4, "projects": 1, "users": 1, "trackers": 1, "issue_statuses": 1}
+        assert info["watermark"] == "2024-01-04T00:00:00Z"
+        assert stats["issues"]["reconciled"] is True
+        assert stats["errors"] == []
+        assert len([req for req in requests if req.url.path == '/issues.json']) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_delta_sync_reads_only_changes(self, mock_env, mirror, mock_async_client):
+        """Test that a later sync asks for issues updated since the watermark and skips the reconcile."""
+        # Arrange
+        state, requests = self._state(), []
+        mock_async_client(redmine(state, requests))
+        await sync_mirror(mirror)
+        state['issues'].append(make_issue(5, updated_on="2024-01-08T00:00:00Z"))
+        requests.clear()
+
+        # Act
+        stats = await sync_mirror(mirror)
+
+        # Assert
+        issue_reads = [req for req in requests if req.url.path == '/issues.json' and 'updated_on' in req.url.params]
+        assert issue_reads[0].url.params['updated_on'] == '>=2024-01-04T00:00:00Z'
+        assert stats["issues"] == {"updated": 2, "deleted": 0, "reconciled": False}
+        assert mirror.count("issues") == 5
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deletions_trigger_reconcile(self, mock_env, mirror, mock_async_client):
+        """Test that issues deleted in Redmine are removed when the counts no longer match."""
+        # Arrange
+        state, requests = self._state(), []
+        mock_async_client(redmine(state, requests))
+        await sync_mirror(mirror)
+        del state['issues'][1]
+
+        # Act
+        stats = await sync_mirror(mirror)
+
+        # Assert
+        assert stats["issues"]["reconciled"] is True
+        assert stats["issues"]["deleted"] == 1
+        assert [row["id"] for row in mirror.query("SELECT id FROM issues ORDER BY id")["rows"]] == [1, 3, 4]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_forbidden_collection_is_skipped(self, mock_env, mirror, mock_async_client):
+        """Test that a collection the API key may not read does not stop the sync."""
+        # Arrange
+        state, requests = self._state(), []
+        state['users'] = None
+        mock_async_client(redmine(state, requests))
+
+        # Act
+        stats = await sync_mirror(mirror)
+
+        # Assert
+        assert len(stats["errors"]) == 1
+        assert "/users.json" in stats["errors"][0]
+        assert mirror.count("issues") == 4
+        assert "/users.json" in mirror.info()["last_error"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_query_tool(self, mock_env, mirror, mocker):
+        """Test that the tool answers from the mirror and reports its age."""
+        # Arrange
+        mirror.upsert("issues", [make_issue(1), make_issue(2, status_id=5)])
+        mirror.set_meta(synced_at=time.time())
+        mocker.patch('mcp_redmine.server.MIRROR', mirror)
+
+        # Act
+        result = await redmine_mirror_query("SELECT id FROM issues WHERE status_id = ?", [5])
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['status_code'] == 200
+        assert parsed['body']['rows'] == [{'id': 2}]
+        assert parsed['meta']['mirror']['tables']['issues'] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_query_tool_before_first_sync(self, mock_env, mirror, mocker):
+        """Test that the tool refuses to answer from an empty mirror."""
+        # Arrange
+        mocker.patch('mcp_redmine.server.MIRROR', mirror)
+
+        # Act
+        parsed = yaml.safe_load(await redmine_mirror_query("SELECT 1"))
+
+        # Assert
+        assert parsed['status_code'] == 0
+        assert 'first sync' in parsed['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_query_tool_rejects_writes(self, mock_env, mirror, mocker):
+        """Test that write attempts come back as errors."""
+        # Arrange
+        mirror.set_meta(synced_at=time.time())
+        mocker.patch('mcp_redmine.server.MIRROR', mirror)
+
+        # Act
+        parsed = yaml.safe_load(await redmine_mirror_query("DELETE FROM issues"))
+
+        # Assert
+        assert parsed['status_code'] == 0
+        assert 'not authorized' in parsed['error']
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_background_sync_runs_with_server(self, mock_env, mirror, mocker):
+        """Test that background_tasks() starts the sync loop and cancels it on exit."""
+        # Arrange
+        import asyncio
+        from mcp_redmine.server import background_tasks
+        mocker.patch('mcp_redmine.server.MIRROR', mirror)
+        synced = asyncio.Event()
+
+        async def fake_sync(mirror):
+            synced.set()
+            return {}
+
+        mocker.patch('mcp_redmine.server.sync_mirror', fake_sync)
+
+        # Act
+        async with background_tasks() as tasks:
+            await asyncio.wait_for(synced.wait(), 1)
+
+        # Assert
+        assert len(tasks) == 1
+        assert tasks[0].cancelled()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_sync_is_recorded(self, mock_env, mirror, mocker):
+        """Test that a sync that raises is logged in the mirror's last_error and the loop carries on."""
+        # Arrange
+        import asyncio
+        from mcp_redmine.server import mirror_sync_loop
+        attempts = []
+
+        async def failing_sync(mirror):
+            attempts.append(1)
+            raise RuntimeError("Could not read issues: boom")
+
+        mocker.patch('mcp_redmine.server.sync_mirror', failing_sync)
+
+        # Act
+        task = asyncio.create_task(mirror_sync_loop(mirror, interval=0.01))
+        while len(attempts) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Assert
+        assert mirror.info()["last_error"] == "RuntimeError: Could not read issues: boom"
@@ -0,0 +1,128 @@
+"""
+Unit tests for field selection in mcp_redmine.projection module and redmine_request(fields=..., exclude=...).
+"""
+import pytest
+import yaml
+from mcp_redmine.projection import parse_selector, project
+from mcp_redmine.server import redmine_request
+
+ISSUES = {
+    "issues": [
+        {"id": 1, "subject": "Crash", "status": {"id": 1, "name": "New"}, "description": "Long text",
+         "journals": [{"id": 10, "notes": "Seen", "details": [{"name": "status_id"}]}]},
+        {"id": 2, "subject": "Typo", "status": {"id": 5, "name": "Closed"}, "description": "More text",
+         "journals": []},
+    ],
+    "total_count": 2,
+    "offset": 0,
+    "limit": 25,
+}
+
+
+class TestProject:
+    """Tests for the project() function."""
+
+    @pytest.mark.unit
+    def test_parse_selector_accepts_jsonpath(self):
+        """Test that JSONPath spellings map to dotted paths."""
+        # Assert
+        assert parse_selector("$.issues[*].status.name") == ["issues", "status", "name"]
+        assert parse_selector("issues[0].id") == ["issues", "id"]
+        assert parse_selector("subject") == ["subject"]
+
+    @pytest.mark.unit
+    def test_fields_relative_to_collection_items(self):
+        """Test that selectors apply to the collection's items and pagination values are kept."""
+        # Act
+        result = project(ISSUES, fields=["id", "status.name"])
+
+        # Assert
+        assert result == {
+            "issues": [{"id": 1, "status": {"name": "New"}}, {"id": 2, "status": {"name": "Closed"}}],
+            "total_count": 2, "offset": 0, "limit": 25,
+        }
+
+    @pytest.mark.unit
+    def test_fields_on_single_resource(self):
+        """Test that the same selectors work for a single resource response."""
+        # Act
+        result = project({"issue": ISSUES["issues"][0]}, fields=["id", "journals.notes"])
+
+        # Assert
+        assert result == {"issue": {"id": 1, "journals": [{"notes": "Seen"}]}}
+
+    @pytest.mark.unit
+    def test_absolute_and_wildcard_selectors(self):
+        """Test selectors starting at the body and '*' keys."""
+        # Act
+        result = project(ISSUES, fields=["issues.id", "issues.status.*"])
+
+        # Assert
+        assert result["issues"][0] == {"id": 1, "status": {"id": 1, "name": "New"}}
+
+    @pytest.mark.unit
+    def test_parent_selector_wins(self):
+        """Test that selecting an object keeps all of it even when a child is also selected."""
+        # Act
+        result = project(ISSUES, fields=["status.name", "status"])
+
+        # Assert
+        assert result["issues"][0]["status"] == {"id": 1, "name": "New"}
+
+    @pytest.mark.unit
+    def test_exclude(self):
+        """Test removing fields, also combined with fields."""
+        # Act
+        excluded = project(ISSUES, exclude=["description", "journals.details"])
+        combined = project(ISSUES, fields=["id", "journals"], exclude=["journals.details"])
+
+        # Assert
+        assert "description" not in excluded["issues"][0]
+        assert excluded["issues"][0]["journals"] == [{"id": 10, "notes": "Seen"}]
+        assert excluded["total_count"] == 2
+        assert combined["issues"][0] == {"id": 1, "journals": [{"id": 10, "notes": "Seen"}]}
+
+    @pytest.mark.unit
+    def test_non_object_bodies_unchanged(self):
+        """Test that error strings and raw bodies pass through."""
+        # Assert
+        assert project("Not found", fields=["id"]) == "Not found"
+        assert project(None, exclude=["id"]) is None
+        assert project(ISSUES) is ISSUES
+
+
+class TestRedmineRequestProjection:
+    """Tests for fields and exclude in redmine_request()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fields_applied_before_serialisation(self, mock_env, mocker):
+        """Test that the returned YAML only has the selected fields."""
+        # Arrange
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+        mock_request.return_value = {"status_code": 200, "body": ISSUES, "error": ""}
+
+        # Act
+        result = await redmine_request('/issues.json', fields=['id', 'subject'])
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert parsed['body']['issues'] == [{'id': 1, 'subject': 'Crash'}, {'id': 2, 'subject': 'Typo'}]
+        assert parsed['body']['total_count'] == 2
+        assert 'Long text' not in result
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fields_with_fetch_all(self, mock_env, mocker):
+        """Test that projection also applies to merged fetch_all results."""
+        # Arrange
+        mock_fetch_all = mocker.patch('mcp_redmine.server.afetch_all')
+        mock_fetch_all.return_value = {"status_code": 200, "body": ISSUES, "error": "", "meta": {"pages_fetched": 1}}
+
+        # Act
+        result = await redmine_request('/issues.json', fetch_all=True, exclude=['journals', 'description'])
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert set(parsed['body']['issues'][0]) == {'id', 'subject', 'status'}
+        assert parsed['meta'] == {'pages_fetched': 1}
@@ -0,0 +1,169 @@
+"""
+Unit tests for the retry policy in mcp_redmine.retry module and its use in request() and arequest().
+"""
+import email.utils
+import time
+
+import httpx
+import pytest
+from mcp_redmine.retry import RetryPolicy, retry_after
+from mcp_redmine.server import arequest, request
+
+
+def response(status_code, **headers):
+    return httpx.Response(status_code, headers=headers)
+
+
+class TestRetryAfter:
+    """Tests for retry_after()."""
+
+    @pytest.mark.unit
+    def test_seconds_and_dates(self):
+        """Test both forms of the header."""
+        # Arrange
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+
+        # Assert
+        assert retry_after(response(503, **{'Retry-After': '7'})) == 7.0
+        assert 25 < retry_after(response(503, **{'Retry-After': date})) <= 30
+        assert retry_after(response(503, **{'Retry-After': 'soon'})) is None
+        assert retry_after(response(503)) is None
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy.delay()."""
+
+    @pytest.mark.unit
+    def test_only_idempotent_methods_and_transient_failures(self):
+        """Test what is and isn't retried."""
+        # Arrange
+        policy = RetryPolicy(retries=2, backoff=0.5, max_delay=10, budget_ratio=0.1)
+
+        # Assert
+        assert policy.delay('get', 0, response(503)) is not None
+        assert policy.delay('put', 0, response(429)) is not None
+        assert policy.delay('delete', 0, error=httpx.ConnectError('refused')) is not None
+        assert policy.delay('post', 0, response(503)) is None
+        assert policy.delay('get', 0, response(500)) is None
+        assert policy.delay('get', 0, response(404)) is None
+        assert policy.delay('get', 0, error=httpx.ReadTimeout('slow')) is None
+        assert policy.delay('get', 0, response(503), replayable=False) is None
+        assert policy.delay('get', 2, response(503)) is None
+
+    @pytest.mark.unit
+    def test_backoff_is_capped_and_jittered(self):
+        """Test that delays stay within the exponential envelope and the cap."""
+        # Arrange
+        policy = RetryPolicy(retries=10, backoff=1.0, max_delay=3.0, budget_ratio=1.0, budget_max=1000)
+
+        # Act
+        delays = [policy.delay('get', attempt, response(503)) for attempt in (0, 1, 5, 5, 5, 5)]
+
+        # Assert
+        assert 0 <= delays[0] <= 1.0
+        assert 0 <= delays[1] <= 2.0
+        assert all(0 <= delay <= 3.0 for delay in delays[2:])
+        assert len(set(delays[2:])) > 1
+
+    @pytest.mark.unit
+    def test_retry_after_is_honoured(self):
+        """Test that Retry-After sets the minimum delay and that a longer one than max_delay gives up."""
+        # Arrange
+        policy = RetryPolicy(retries=2, backoff=0.01, max_delay=10, budget_ratio=0.1)
+
+        # Assert
+        assert policy.delay('get', 0, response(429, **{'Retry-After': '4'})) >= 4
+        assert policy.delay('get', 0, response(429, **{'Retry-After': '60'})) is None
+        assert policy.stats()['retry_after_too_long'] == 1
+
+    @pytest.mark.unit
+    def test_budget(self):
+        """Test that retries stop when the budget is spent and resume as requests refill it."""
+        # Arrange
+        policy = RetryPolicy(retries=5, backoff=0, max_delay=1, budget_ratio=0.5, budget_max=2)
+
+        # Act
+        granted = [policy.delay('get', 0, response(503)) is not None for _ in range(3)]
+        policy.record_request()
+        policy.record_request()
+
+        # Assert
+        assert granted == [True, True, False]
+        assert policy.delay('get', 0, response(503)) is not None
+        assert policy.stats()['budget_exhausted'] == 1
+
+
+class TestRequestRetries:
+    """Tests for retries in request() and arequest()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arequest_retries_get(self, mock_env, mock_async_client):
+        """Test that a GET succeeds after transient failures and reports the retries."""
+        # Arrange
+        replies = [response(502), response(503, **{'Retry-After': '0'}), httpx.Response(200, json={'ok': True})]
+        mock_async_client(lambda req: replies.pop(0))
+
+        # Act
+        result = await arequest('/issues.json')
+
+        # Assert
+        assert result['status_code'] == 200
+        assert result['body'] == {'ok': True}
+        assert result['meta']['retries'] == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arequest_does_not_retry_post(self, mock_env, mock_async_client):
+        """Test that a POST is sent only once."""
+        # Arrange
+        calls = []
+
+        def handler(req):
+            calls.append(req)
+            return response(503)
+
+        mock_async_client(handler)
+
+        # Act
+        result = await arequest('/issues.json', method='post', data={'issue': {}})
+
+        # Assert
+        assert len(calls) == 1
+        assert result['status_code'] == 503
+        assert 'meta' not in result
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_arequest_gives_up(self, mock_env, mock_async_client, retry_policy):
+        """Test that the last failure is returned once the retries are used up."""
+        # Arrange
+        def handler(req):
+            raise httpx.ConnectError('Connection refused')
+
+        mock_async_client(handler)
+
+        # Act
+        result = await arequest('/issues.json')
+
+        # Assert
+        assert result['status_code'] == 0
+        assert 'ConnectError' in result['error']
+        assert result['meta']['retries'] == retry_policy.retries
+
+    @pytest.mark.unit
+    def test_request_retries_get(self, mock_env, mocker):
+        """Test retries in the sync request()."""
+        # Arrange
+        mock_request = mocker.patch('httpx.Client.request', side_effect=[
+            httpx.ConnectError('Connection refused'),
+            httpx.Response(200, json={'ok': True}, request=httpx.Request('GET', 'https://x')),
+        ])
+
+        # Act
+        result = request('/issues.json')
+
+        # Assert
+        assert mock_request.call_count == 2
+        assert result['body'] == {'ok': True}
+        assert result['meta']['retries'] == 1
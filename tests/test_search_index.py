@@ -0,0 +1,270 @@
+"""
+Unit tests for the local issue search index in mcp_redmine.search_index module and its use by
+redmine_search_issues().
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+import yaml
+from mcp_redmine.search_index import IssueIndex, fts_query
+from mcp_redmine.server import redmine_search_issues, sync_search_index
+
+
+def make_issue(issue_id, subject, description="", status_id=1, project_id=1, updated_on="2024-01-01T00:00:00Z",
+               journals=None):
+    issue = {
+        "id": issue_id,
+        "project": {"id": project_id, "name": f"Project {project_id}"},
+        "tracker": {"id": 1, "name": "Bug"},
+        "status": {"id": status_id, "name": "Closed" if status_id == 5 else "New"},
+        "subject": subject,
+        "description": description,
+        "updated_on": updated_on,
+    }
+    if journals is not None:
+        issue["journals"] = [{"id": i, "notes": notes} for i, notes in enumerate(journals)]
+    return issue
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = IssueIndex(str(tmp_path / "index.sqlite"))
+    yield index
+    index.close()
+
+
+class TestIssueIndex:
+    """Tests for the IssueIndex class."""
+
+    @pytest.mark.unit
+    def test_fts_query_quotes_tokens(self):
+        """Test that FTS5 syntax in user input is neutralised."""
+        # Act / Assert
+        assert fts_query('login "crash" OR -export*') == '"login"* OR "crash"* OR "OR"* OR "export"*'
+        assert fts_query('  ?! ') == ''
+
+    @pytest.mark.unit
+    def test_search_ranks_subject_matches_first(self, index):
+        """Test that BM25 ranking weights subject matches above description matches."""
+        # Arrange
+        index.upsert([
+            make_issue(1, "Update documentation", "The login page crashes on Safari"),
+            make_issue(2, "Login page crashes", "Stack trace attached"),
+            *(make_issue(i, f"Unrelated {i}", "Nothing to see") for i in range(3, 20)),
+        ])
+
+        # Act
+        hits = index.search("login crash")
+
+        # Assert
+        assert [hit["id"] for hit in hits] == [2, 1]
+        assert hits[0]["score"] > hits[1]["score"]
+        assert "[" in hits[0]["snippet"]
+
+    @pytest.mark.unit
+    def test_search_covers_journals(self, index):
+        """Test that journal notes are searchable and kept when an issue is re-indexed without them."""
+        # Arrange
+        index.upsert([make_issue(1, "Export fails", journals=["Reproduced with the nightly build"])])
+        index.upsert([make_issue(1, "Export fails on CSV")])
+
+        # Act
+        hits = index.search("nightly")
+
+        # Assert
+        assert [hit["id"] for hit in hits] == [1]
+
+    @pytest.mark.unit
+    def test_search_filters(self, index):
+        """Test project and open/closed/status filters."""
+        # Arrange
+        index.upsert([
+            make_issue(1, "Crash on start", status_id=1, project_id=1),
+            make_issue(2, "Crash on exit", status_id=5, project_id=1),
+            make_issue(3, "Crash on save", status_id=1, project_id=2),
+        ], closed_status_ids={5})
+
+        # Act / Assert
+        assert {hit["id"] for hit in index.search("crash")} == {1, 3}
+        assert {hit["id"] for hit in index.search("crash", status_id="closed")} == {2}
+        assert {hit["id"] for hit in index.search("crash", status_id="*")} == {1, 2, 3}
+        assert {hit["id"] for hit in index.search("crash", status_id="5")} == {2}
+        assert {hit["id"] for hit in index.search("crash", status_id="1|5")} == {1, 2, 3}
+        assert {hit["id"] for hit in index.search("crash", project_id=2)} == {3}
+        with pytest.raises(ValueError, match="Unsupported status_id"):
+            index.search("crash", status_id="!5")
+        assert len(index.search("crash", status_id="*", limit=2)) == 2
+
+    @pytest.mark.unit
+    def test_upsert_replaces_text(self, index):
+        """Test that re-indexing an issue replaces its old text."""
+        # Arrange
+        index.upsert([make_issue(1, "Old subject")])
+
+        # Act
+        index.upsert([make_issue(1, "New subject")])
+
+        # Assert
+        assert index.search("old") == []
+        assert index.info()["issues"] == 1
+
+    @pytest.mark.unit
+    def test_delete_missing(self, index):
+        """Test that issues not in the given ids are dropped from the table and the full-text index."""
+        # Arrange
+        index.upsert([make_issue(1, "Printer jam"), make_issue(2, "Printer fire"), make_issue(3, "Scanner")])
+
+        # Act
+        deleted = index.delete_missing("issues", {1, 3})
+
+        # Assert
+        assert deleted == 1
+        assert [hit["id"] for hit in index.search("printer")] == [1]
+        assert index.count("issues") == 2
+
+    @pytest.mark.unit
+    def test_info_reports_age(self, index):
+        """Test that info() reports watermark and time since the last sync."""
+        # Arrange
+        index.set_meta(watermark="2024-01-01T00:00:00Z", synced_at=time.time() - 60)
+
+        # Act
+        info = index.info()
+
+        # Assert
+        assert info["watermark"] == "2024-01-01T00:00:00Z"
+        assert 59 <= info["age_seconds"] < 70
+
+
+def redmine_issues(issues: list, requests: list):
+    """MockTransport handler serving issue statuses, filtered /issues.json pages and single issues."""
+
+    def handler(req):
+        requests.append(req)
+        path = req.url.path
+        if path == '/issue_statuses.json':
+            return httpx.Response(200, json={'issue_statuses': [{'id': 1, 'name': 'New', 'is_closed': False},
+                                                                {'id': 5, 'name': 'Closed', 'is_closed': True}]})
+        if path == '/issues.json':
+            since = req.url.params.get('updated_on', '>=')[2:]
+            matching = [issue for issue in issues if issue['updated_on'] >= since]
+            offset, limit = int(req.url.params.get('offset', 0)), int(req.url.params.get('limit', 25))
+            return httpx.Response(200, json={'issues': matching[offset:offset + limit], 'total_count': len(matching),
+                                             'offset': offset, 'limit': limit})
+        issue_id = int(path.split('/')[-1].split('.')[0])
+        issue = dict(next(issue for issue in issues if issue['id'] == issue_id))
+        issue['journals'] = [{'id': 1, 'notes': f'comment on {issue_id}'}]
+        return httpx.Response(200, json={'issue': issue})
+
+    return handler
+
+
+class TestSearchIndexSync:
+    """Tests for sync_search_index() and the indexed path of redmine_search_issues()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sync_is_incremental(self, mock_env, index, mock_async_client):
+        """Test that the first sync reads everything and later ones only what changed since the watermark."""
+        # Arrange
+        issues = [make_issue(i, f"Issue {i}", updated_on=f"2024-01-0{i}T00:00:00Z") for i in range(1, 4)]
+        requests = []
+        mock_async_client(redmine_issues(issues, requests))
+        first = await sync_search_index(index)
+        issues.append(make_issue(4, "Brand new crash", updated_on="2024-01-09T00:00:00Z"))
+        requests.clear()
+
+        # Act
+        second = await sync_search_index(index)
+
+        # Assert
+        assert first["issues_updated"] == 3
+        assert second["issues_updated"] == 2  # the boundary issue is re-read
+        listing = next(req for req in requests if req.url.path == '/issues.json')
+        assert listing.url.params['updated_on'] == '>=2024-01-03T00:00:00Z'
+        assert listing.url.params['status_id'] == '*'
+        assert index.info()["watermark"] == "2024-01-09T00:00:00Z"
+        assert [hit["id"] for hit in index.search("comment 4", status_id="*")][0] == 4
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sync_drops_deleted_issues(self, mock_env, index, mock_async_client):
+        """Test that an issue gone from Redmine is removed once the counts differ, the first full read counting
+        as a reconcile."""
+        # Arrange
+        issues = [make_issue(i, f"Crash {i}", updated_on=f"2024-01-0{i}T00:00:00Z") for i in range(1, 4)]
+        mock_async_client(redmine_issues(issues, []))
+        first = await sync_search_index(index)
+        unchanged = await sync_search_index(index)
+        del issues[0]
+
+        # Act
+        second = await sync_search_index(index)
+
+        # Assert
+        assert (first["reconciled"], unchanged["reconciled"]) == (True, False)
+        assert second["reconciled"] is True
+        assert second["issues_deleted"] == 1
+        assert sorted(hit["id"] for hit in index.search("crash", status_id="*")) == [2, 3]
+        assert index.get_meta("reconciled_at") is not None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_search_uses_index(self, mock_env, index, mocker):
+        """Test that a synced index answers searches without contacting Redmine."""
+        # Arrange
+        index.upsert([make_issue(7, "Printer on fire")])
+        index.set_meta(synced_at=time.time())
+        mocker.patch('mcp_redmine.server.SEARCH_INDEX', index)
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+
+        # Act
+        result = await redmine_search_issues("fire")
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert [issue['id'] for issue in parsed['body']['issues']] == [7]
+        assert parsed['meta']['index']['issues'] == 1
+        assert parsed['meta']['index']['age_seconds'] < 5
+        mock_request.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_search_falls_back_when_index_cannot_answer(self, mock_env, index, mocker):
+        """Test that a status filter the index doesn't understand is sent to Redmine instead of failing."""
+        # Arrange
+        index.upsert([make_issue(7, "Printer on fire")])
+        index.set_meta(synced_at=time.time())
+        mocker.patch('mcp_redmine.server.SEARCH_INDEX', index)
+        mock_request = mocker.patch('mcp_redmine.server.arequest')
+        mock_request.return_value = {'status_code': 200, 'body': {'issues': [], 'total_count': 0}, 'error': ''}
+
+        # Act
+        result = await redmine_search_issues("fire", status_id="!5")
+
+        # Assert
+        assert yaml.safe_load(result)['status_code'] == 200
+        assert mock_request.call_args.kwargs['params']['status_id'] == '!5'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_search_falls_back_until_first_sync(self, mock_env, index, mock_async_client, mocker):
+        """Test that an empty index sends the search to Redmine and starts building in the background."""
+        # Arrange
+        mocker.patch('mcp_redmine.server.SEARCH_INDEX', index)
+        mocker.patch('mcp_redmine.server._search_index_sync', None)
+        requests = []
+        mock_async_client(redmine_issues([make_issue(1, "Crash")], requests))
+
+        # Act
+        result = await redmine_search_issues("crash")
+        from mcp_redmine import server
+        await server._search_index_sync
+
+        # Assert
+        parsed = yaml.safe_load(result)
+        assert requests[0].url.params['text_search'] == 'crash'
+        assert parsed['body']['issues'][0]['id'] == 1
+        assert index.info()['issues'] == 1
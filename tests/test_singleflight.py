@@ -0,0 +1,113 @@
+"""
+Unit tests for request coalescing in mcp_redmine.singleflight module and arequest().
+"""
+import asyncio
+
+import httpx
+import pytest
+from mcp_redmine.server import SINGLE_FLIGHT, arequest
+from mcp_redmine.singleflight import SingleFlight
+
+
+def slow_server(calls, delay=0.02):
+    """Handler counting requests by path and answering each after delay seconds."""
+    async def handler(req):
+        calls.append((req.method, req.url.path, str(req.url.params)))
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={'path': req.url.path})
+    return handler
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one(self):
+        """Test that calls for the same key run once and each caller gets its own copy."""
+        # Arrange
+        flight = SingleFlight()
+        runs = []
+
+        async def fetch():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return {"status_code": 200, "body": {"n": 1}, "error": ""}
+
+        # Act
+        results = await asyncio.gather(*(flight.do('k', fetch) for _ in range(4)))
+
+        # Assert
+        assert len(runs) == 1
+        assert 'meta' not in results[0]
+        assert all(result['meta'] == {'coalesced': True} for result in results[1:])
+        assert len({id(result) for result in results}) == 4
+        assert flight.stats() == {'calls': 1, 'collapsed': 3, 'collapse_ratio': 0.75, 'in_flight': 0}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that the call keeps running for the others when the caller that started it goes away."""
+        # Arrange
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return {"status_code": 200, "body": None, "error": ""}
+
+        first = asyncio.ensure_future(flight.do('k', fetch))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do('k', fetch))
+        await asyncio.sleep(0)
+
+        # Act
+        first.cancel()
+        result = await second
+
+        # Assert
+        assert result['status_code'] == 200
+
+
+class TestRequestCoalescing:
+    """Tests for coalescing in arequest()."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_identical_gets_are_collapsed(self, mock_env, mock_async_client):
+        """Test that identical GETs share a call while different params or writes do not."""
+        # Arrange
+        calls = []
+        mock_async_client(slow_server(calls))
+        before = SINGLE_FLIGHT.stats()['collapsed']
+
+        # Act
+        results = await asyncio.gather(
+            *(arequest('/projects.json') for _ in range(3)),
+            arequest('/projects.json', params={'offset': 25}),
+            *(arequest('/issues/1.json', method='put', data={'issue': {}}) for _ in range(2)),
+        )
+
+        # Assert
+        assert sorted(calls) == [('GET', '/projects.json', ''), ('GET', '/projects.json', 'offset=25'),
+                                 ('PUT', '/issues/1.json', ''), ('PUT', '/issues/1.json', '')]
+        assert all(result['body'] == {'path': '/projects.json'} for result in results[:4])
+        assert SINGLE_FLIGHT.stats()['collapsed'] - before == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_after_write_does_not_join(self, mock_env, mock_async_client):
+        """Test that a GET issued after a write gets a fresh upstream call."""
+        # Arrange
+        calls = []
+        mock_async_client(slow_server(calls, delay=0.05))
+
+        # Act
+        early = asyncio.ensure_future(arequest('/issues/1.json'))
+        await asyncio.sleep(0.01)
+        await arequest('/issues/2.json', method='delete')
+        late = await arequest('/issues/1.json')
+        await early
+
+        # Assert
+        assert [call[1] for call in calls].count('/issues/1.json') == 2
+        assert 'meta' not in late
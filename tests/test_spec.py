@@ -0,0 +1,298 @@
+"""
+Unit tests for OpenAPI spec loading and lookups in mcp_redmine.spec module.
+"""
+import json
+import pytest
+from mcp_redmine.formats import dump_json
+from mcp_redmine.spec import (SPEC_COMPILED, SPEC_SOURCE, Router, SpecIndex, compile_spec, load_spec, resolve_refs,
+                               source_digest)
+
+
+@pytest.fixture
+def spec_files(temp_dir):
+    """A small YAML spec and the path its compiled form would be written to."""
+    source = temp_dir / 'spec.yml'
+    source.write_text("openapi: 3.0.3\npaths:\n  /issues.json:\n    get:\n      operationId: getIssues\n")
+    return source, temp_dir / 'spec.compiled.json'
+
+
+class TestLoadSpec:
+    """Tests for load_spec() and compile_spec()."""
+
+    @pytest.mark.unit
+    def test_compile_spec_round_trip(self, spec_files):
+        """Test that the compiled form loads to the same spec as the YAML."""
+        # Arrange
+        source, compiled = spec_files
+
+        # Act
+        expected = compile_spec(source, compiled)
+        spec, info = load_spec(source, compiled)
+
+        # Assert
+        assert spec == expected
+        assert spec['paths']['/issues.json']['get']['operationId'] == 'getIssues'
+        assert info['source'] == 'compiled'
+
+    @pytest.mark.unit
+    def test_compile_spec_records_source_hash(self, spec_files):
+        """Test that the compiled file is stamped with the YAML's SHA-256."""
+        # Arrange
+        source, compiled = spec_files
+
+        # Act
+        compile_spec(source, compiled)
+
+        # Assert
+        data = json.loads(compiled.read_text())
+        assert data['source_sha256'] == source_digest(source.read_bytes())
+
+    @pytest.mark.unit
+    def test_load_spec_falls_back_when_missing(self, spec_files):
+        """Test that the YAML is parsed when no compiled file exists."""
+        # Arrange
+        source, compiled = spec_files
+
+        # Act
+        spec, info = load_spec(source, compiled)
+
+        # Assert
+        assert spec['openapi'] == '3.0.3'
+        assert info['source'] == 'yaml'
+        assert info['reason'] == 'missing'
+
+    @pytest.mark.unit
+    def test_load_spec_falls_back_when_stale(self, spec_files):
+        """Test that a compiled file built from an older YAML is ignored."""
+        # Arrange
+        source, compiled = spec_files
+        compile_spec(source, compiled)
+        source.write_text("openapi: 3.0.3\npaths:\n  /projects.json: {}\n")
+
+        # Act
+        spec, info = load_spec(source, compiled)
+
+        # Assert
+        assert list(spec['paths']) == ['/projects.json']
+        assert info['source'] == 'yaml'
+        assert info['reason'] == 'stale'
+
+    @pytest.mark.unit
+    def test_load_spec_falls_back_when_unreadable(self, spec_files):
+        """Test that a corrupt compiled file is ignored."""
+        # Arrange
+        source, compiled = spec_files
+        compiled.write_text("{not json")
+
+        # Act
+        spec, info = load_spec(source, compiled)
+
+        # Assert
+        assert info['source'] == 'yaml'
+        assert info['reason'].startswith('unreadable')
+
+    @pytest.mark.unit
+    def test_bundled_compiled_spec_is_current(self):
+        """Test that the shipped compiled spec matches the shipped YAML."""
+        # Act
+        spec, info = load_spec(SPEC_SOURCE, SPEC_COMPILED)
+
+        # Assert
+        assert info['source'] == 'compiled', "Run 'python -m mcp_redmine.convert_schema --compile'"
+        assert '/issues.json' in spec['paths']
+
+
+@pytest.fixture
+def ref_spec():
+    """A spec whose path items point at shared schemas, one of them recursive."""
+    return {
+        'paths': {
+            '/issues/{issueId}.json': {
+                'get': {'responses': {'200': {'content': {'application/json': {'schema': {
+                    'type': 'object', 'properties': {'issue': {'$ref': '#/components/schemas/Issue'}}}}}}}},
+            },
+        },
+        'components': {'schemas': {
+            'Issue': {'type': 'object', 'properties': {
+                'project': {'$ref': '#/components/schemas/Project', 'description': 'Owning project'},
+                'children': {'type': 'array', 'items': {'$ref': '#/components/schemas/Issue'}},
+            }},
+            'Project': {'type': 'object', 'properties': {'id': {'type': 'integer'}}},
+        }},
+    }
+
+
+class TestResolveRefs:
+    """Tests for resolve_refs()."""
+
+    @pytest.mark.unit
+    def test_replaces_refs_and_keeps_sibling_keys(self, ref_spec):
+        """Test that a $ref is replaced by its target merged with the keys next to it."""
+        # Arrange
+        issue = ref_spec['components']['schemas']['Issue']
+
+        # Act
+        resolved = resolve_refs(issue, ref_spec)
+
+        # Assert
+        assert resolved['properties']['project'] == {
+            'type': 'object', 'properties': {'id': {'type': 'integer'}}, 'description': 'Owning project'}
+        assert '$ref' in issue['properties']['project']  # the spec itself is left alone
+
+    @pytest.mark.unit
+    def test_leaves_recursive_refs_in_place(self, ref_spec):
+        """Test that a schema referring to itself is expanded once and then kept as a $ref."""
+        # Act
+        resolved = resolve_refs({'$ref': '#/components/schemas/Issue'}, ref_spec)
+
+        # Assert
+        assert resolved['properties']['children']['items'] == {'$ref': '#/components/schemas/Issue'}
+        assert resolved['properties']['project']['properties']['id'] == {'type': 'integer'}
+
+
+class TestSpecIndex:
+    """Tests for the SpecIndex path lookup."""
+
+    @pytest.mark.unit
+    def test_indexes_paths_raw_and_resolved(self, ref_spec):
+        """Test that path items are kept as written and with their refs resolved."""
+        # Act
+        index = SpecIndex(ref_spec)
+
+        # Assert
+        template = '/issues/{issueId}.json'
+        assert index.paths == [template]
+        assert index.items[template] is ref_spec['paths'][template]
+        schema = index.resolved[template]['get']['responses']['200']['content']['application/json']['schema']
+        assert schema['properties']['issue']['type'] == 'object'
+
+    @pytest.mark.unit
+    def test_fragment_is_serialised_once(self, ref_spec, mocker):
+        """Test that fragments are cached per path, resolution and serialiser."""
+        # Arrange
+        index = SpecIndex(ref_spec)
+        dump = mocker.Mock(side_effect=dump_json)
+
+        # Act
+        first = index.fragment('/issues/{issueId}.json', True, dump)
+        second = index.fragment('/issues/{issueId}.json', True, dump)
+        raw = index.fragment('/issues/{issueId}.json', False, dump)
+
+        # Assert
+        assert first is second
+        assert dump.call_count == 2
+        assert json.loads(first)['/issues/{issueId}.json'] == index.resolved['/issues/{issueId}.json']
+        assert '"$ref"' in raw and 'schemas/Project' not in first
+
+
+class TestRouter:
+    """Tests for matching concrete paths to path templates."""
+
+    @pytest.fixture
+    def router(self):
+        return Router(['/issues.json', '/issues/{issueId}.json', '/users/{userId}.json', '/users/current.json',
+                       '/projects/{projectId}/memberships.json', '/attachments/download/{id}/{filename}'])
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("path,expected", [
+        ('/issues.json', ('/issues.json', {})),
+        ('issues/123.json?include=journals', ('/issues/{issueId}.json', {'issueId': '123'})),
+        ('/users/current.json', ('/users/current.json', {})),
+        ('/users/5.json', ('/users/{userId}.json', {'userId': '5'})),
+        ('/projects/my%20project/memberships.json', ('/projects/{projectId}/memberships.json',
+                                                     {'projectId': 'my project'})),
+        ('/attachments/download/7/report.pdf', ('/attachments/download/{id}/{filename}',
+                                                {'id': '7', 'filename': 'report.pdf'})),
+    ])
+    def test_match(self, router, path, expected):
+        """Test static paths, parameters with suffixes and literals taking precedence over parameters."""
+        # Assert
+        assert router.match(path) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("path", ['/issues/.json', '/issues/1.xml', '/projects/1/issues.json', '/', '/nope'])
+    def test_no_match(self, router, path):
+        """Test that paths outside every template are not matched."""
+        # Assert
+        assert router.match(path) is None
+
+    @pytest.mark.unit
+    def test_backtracks_from_literal(self):
+        """Test that a literal segment that leads nowhere falls back to a parameter."""
+        # Arrange
+        router = Router(['/projects/new/issues.json', '/projects/{projectId}/memberships.json'])
+
+        # Assert
+        assert router.match('/projects/new/memberships.json') == (
+            '/projects/{projectId}/memberships.json', {'projectId': 'new'})
+
+    @pytest.mark.unit
+    def test_spec_index_route(self, ref_spec):
+        """Test that SpecIndex.route() reports the template, parameters and operation."""
+        # Arrange
+        ref_spec['paths']['/issues/{issueId}.json']['get']['operationId'] = 'getIssue'
+        index = SpecIndex(ref_spec)
+
+        # Act
+        route = index.route('/issues/9.json', 'GET')
+
+        # Assert
+        assert route == {'template': '/issues/{issueId}.json', 'path_params': {'issueId': '9'}, 'methods': ['get'],
+                         'operation_id': 'getIssue', 'summary': None}
+        assert index.route('/issues/9.json', 'put')['operation_id'] is None
+        assert index.route('/projects.json', 'get') is None
+
+
+class TestSpecIndexValidate:
+    """Tests for the compiled per-operation request validators."""
+
+    @pytest.fixture
+    def index(self, ref_spec):
+        ref_spec['paths']['/issues/{issueId}.json']['parameters'] = [
+            {'name': 'issueId', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}}]
+        ref_spec['paths']['/issues/{issueId}.json']['put'] = {
+            'parameters': [{'name': 'notify', 'in': 'query', 'schema': {'type': 'boolean'}},
+                           {'name': 'ids', 'in': 'query', 'schema': {'type': 'array', 'items': {'type': 'integer'}}}],
+            'requestBody': {'required': True, 'content': {'application/json': {'schema': {
+                'type': 'object', 'required': ['issue'],
+                'properties': {'issue': {'$ref': '#/components/schemas/Issue'}}}}}},
+        }
+        return SpecIndex(ref_spec)
+
+    @pytest.mark.unit
+    def test_parameters_are_coerced_from_strings(self, index):
+        """Test that query and path values are checked as Redmine would parse them."""
+        # Act
+        valid = index.validate('PUT', '/issues/5.json?x=1', params={'notify': 'true', 'ids': ['1', 2]},
+                               data={'issue': {}})
+        status, errors, warnings = index.validate('put', '/issues/abc.json', params={'notify': 'maybe', 'extra': 'x'},
+                                                  data={'issue': {}})
+
+        # Assert
+        assert valid == ('valid', [], [])
+        assert (status, errors) == ('valid', [])
+        assert warnings == ["issueId: 'abc' is not of type 'integer'", "notify: 'maybe' is not of type 'boolean'"]
+
+    @pytest.mark.unit
+    def test_body_errors_follow_recursive_refs(self, index):
+        """Test body errors with their location, through a schema that refers to itself."""
+        # Act
+        missing = index.validate('put', '/issues/5.json')
+        status, errors, _ = index.validate('put', '/issues/5.json', data={'issue': {'children': [{'project': 'x'}]}})
+
+        # Assert
+        assert missing == ('invalid', ['body: a request body is required'], [])
+        assert status == 'invalid'
+        assert errors == ["issue.children.0.project: 'x' is not of type 'object'"]
+
+    @pytest.mark.unit
+    def test_validators_are_compiled_once(self, index):
+        """Test that an operation's validator is built on first use and reused."""
+        # Act
+        first = index.validator('/issues/{issueId}.json', 'put')
+        second = index.validator('/issues/{issueId}.json', 'put')
+
+        # Assert
+        assert first is second
+        assert index.validator('/issues/{issueId}.json', 'delete') is None
+        assert index.validate('delete', '/issues/5.json') == ('unvalidated', [], [])
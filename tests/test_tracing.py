@@ -0,0 +1,106 @@
+"""
+Unit tests for the optional OpenTelemetry tracing in mcp_redmine.tracing module.
+"""
+import httpx
+import pytest
+import yaml
+from mcp_redmine import tracing
+from mcp_redmine.server import redmine_request
+
+
+@pytest.fixture
+def spans(mocker):
+    """Record finished spans in memory for the duration of a test."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    mocker.patch.object(tracing, '_tracer', provider.get_tracer("test"))
+    return exporter
+
+
+class TestTracingDisabled:
+    """Tests for tracing while it is off."""
+
+    @pytest.mark.unit
+    def test_spans_are_a_shared_no_op(self):
+        """Test that no span objects are created while tracing is off."""
+        # Act
+        with tracing.span("anything", {"a": 1}) as current:
+            current.set_attribute("b", 2)
+            tracing.mark_error(current, "ignored")
+
+        # Assert
+        assert not tracing.enabled()
+        assert tracing.span("other") is tracing.NO_SPAN
+
+    @pytest.mark.unit
+    def test_unknown_exporter(self):
+        """Test that a misspelled REDMINE_TRACING is reported."""
+        # Act / Assert
+        with pytest.raises(ValueError, match="console, otlp"):
+            tracing.setup_tracing("jaeger")
+
+
+class TestTracingEnabled:
+    """Tests for the spans recorded while tracing is on."""
+
+    @pytest.mark.unit
+    def test_setup_console_exporter(self, mocker):
+        """Test that setup_tracing() installs a tracer."""
+        # Arrange
+        pytest.importorskip("opentelemetry.sdk")
+        mocker.patch.object(tracing, '_tracer', None)
+
+        # Act
+        started = tracing.setup_tracing("console", version="1.0")
+
+        # Assert
+        assert started
+        assert tracing.enabled()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_tool_span_with_http_and_serialize_children(self, mock_env, mock_async_client, spans):
+        """Test the span tree of a tool call and the payload sizes on it."""
+        # Arrange
+        mock_async_client(lambda req: httpx.Response(200, content=b'{"issues": [], "total_count": 0}'))
+
+        # Act
+        await redmine_request('/issues.json', params={'project_id': 1})
+
+        # Assert
+        by_name = {span.name: span for span in spans.get_finished_spans()}
+        tool, http, serialize = by_name['tool redmine_request'], by_name['HTTP GET'], by_name['serialize']
+        assert http.parent.span_id == tool.context.span_id
+        assert serialize.parent.span_id == tool.context.span_id
+        assert http.attributes['url.template'] == '/issues.json'
+        assert http.attributes['http.response.status_code'] == 200
+        assert http.attributes['http.response.body.size'] == 32
+        assert serialize.attributes['mcp.output.size'] == tool.attributes['mcp.tool.result_size']
+        assert tool.status.is_ok
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failures_mark_spans(self, mock_env, mock_async_client, spans, retry_policy):
+        """Test that retried attempts get their own spans and failures set the error status."""
+        # Arrange
+        replies = [httpx.Response(503), httpx.Response(404, json={'errors': ['Not found']})]
+        mock_async_client(lambda req: replies.pop(0))
+
+        # Act
+        result = yaml.safe_load(await redmine_request('/issues/9.json'))
+
+        # Assert
+        finished = spans.get_finished_spans()
+        attempts = [span for span in finished if span.name == 'HTTP GET']
+        tool = next(span for span in finished if span.name == 'tool redmine_request')
+        assert result['status_code'] == 404
+        assert [span.attributes['http.request.resend_count'] for span in attempts] == [0, 1]
+        assert not attempts[0].status.is_ok
+        assert attempts[1].status.is_ok  # a 4xx is the caller's error, not a failed request
+        assert not tool.status.is_ok